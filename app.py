@@ -6,6 +6,9 @@ import asyncio
 import os
 import sys
 from pathlib import Path
+from typing import List, Optional
+
+from fastapi import HTTPException
 
 # Add project root to path
 project_root = Path(__file__).parent
@@ -15,6 +18,21 @@ from clickup_sdk.webhook import WebhookServer
 from core.logging_config import setup_logging, get_logger
 from core.dispatcher import dispatcher
 from core.webhook_manager import WebhookManager
+from core.deadline_scheduler import get_deadline_scheduler
+from core.clickup_client import (
+    get_clickup_client,
+    get_hierarchy_snapshot,
+    get_task_write_queue,
+)
+from core.jobs import get_job_runner
+from core.member_cache import get_member_cache
+from core.notification_ledger import prune_notification_ledger
+from core.task_mirror import get_task_mirror
+from core.time_rollups import DIMENSIONS, get_time_rollups
+from core.telegram_bot import get_outbound_queue, set_webhook_async
+from core.telegram_callbacks import get_callback_router
+from core.telegram_digest import get_digest_buffer
+from core.storage import close_databases
 from config.settings import get_settings
 
 # Setup logging first
@@ -24,19 +42,104 @@ logger = get_logger(__name__)
 # Import clickup module - this will automatically register all handlers
 # because handlers are imported in clickup/__init__.py
 import clickup  # noqa: F401
+from clickup.savdo.broker_deadline.broker_deadline import seed_broker_deadlines
+
+
+async def reconcile_webhooks(webhook_manager: WebhookManager) -> None:
+    """Create, update or delete ClickUp webhooks to match the registered handlers."""
+    try:
+        await webhook_manager.reconcile_webhooks(dispatcher)
+    except Exception as e:
+        logger.error(f"❌ Failed to reconcile webhooks: {e}", exc_info=True)
+        logger.warning("⚠️ Continuing with the existing webhooks...")
+
+
+async def shutdown(background_tasks: List[asyncio.Task]) -> None:
+    """
+    Stop background work and deliver or persist everything still buffered.
+
+    Args:
+        background_tasks: Tasks started by main()
+    """
+    logger.info("🛑 Shutting down...")
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
+    # Buffered digests and queued ClickUp writes go out before the queues close
+    digest_buffer = get_digest_buffer()
+    if digest_buffer is not None:
+        await digest_buffer.flush_all()
+    await get_task_write_queue().close()
+    await get_outbound_queue().close()
+    await get_clickup_client().close()
+    close_databases()
+    logger.info("✅ Shutdown complete")
+
 
 async def main():
     """Main application entry point."""
     settings = get_settings()
-    webhook_manager = WebhookManager()
 
-    # Initialize webhook
-    try:
-        logger.info("🔄 Initializing ClickUp webhook...")
-        webhook_manager.initialize_webhook()
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize webhook: {e}", exc_info=True)
-        logger.warning("⚠️ Continuing without webhook initialization...")
+    # Start local task mirror (optional)
+    background_tasks = []
+    task_mirror = get_task_mirror()
+    if task_mirror is not None:
+        logger.info("📦 Starting task mirror...")
+        task_mirror.register(dispatcher)
+        background_tasks.append(
+            asyncio.create_task(
+                task_mirror.run(settings.TASK_MIRROR_CATCHUP_INTERVAL)
+            )
+        )
+
+    # Workspace hierarchy: warm start from disk, crawl only if missing or stale.
+    # Resolves the list of an event to the space/folder scopes of handlers.
+    hierarchy = get_hierarchy_snapshot()
+    hierarchy.register(dispatcher)
+    dispatcher.set_location_resolver(hierarchy.resolve_list)
+    if not hierarchy.load(max_age=settings.HIERARCHY_SNAPSHOT_MAX_AGE):
+        logger.info("🗂️ Crawling workspace hierarchy...")
+        background_tasks.append(asyncio.create_task(hierarchy.refresh()))
+
+    # Keep workspace members (names, emails, telegram chats) in memory
+    background_tasks.append(asyncio.create_task(get_member_cache().run()))
+
+    # Deadline reminders: persisted schedule plus deadlines of mirrored tasks
+    if task_mirror is not None:
+        logger.info(f"⏰ Scheduled {seed_broker_deadlines()} broker deadline reminder(s)")
+    background_tasks.append(asyncio.create_task(get_deadline_scheduler().run()))
+
+    # Scheduled jobs (daily digests, ledger cleanup)
+    job_runner = get_job_runner()
+    if settings.NOTIFICATION_LEDGER_PRUNE_CRON:
+        job_runner.add_job(
+            "notification_ledger_prune",
+            settings.NOTIFICATION_LEDGER_PRUNE_CRON,
+            prune_notification_ledger,
+        )
+    background_tasks.append(asyncio.create_task(job_runner.run()))
+
+    # Start time tracking rollups (optional)
+    time_rollups = get_time_rollups()
+    if time_rollups is not None:
+        logger.info("⏱️ Starting time tracking rollups...")
+        time_rollups.register(dispatcher)
+        background_tasks.append(
+            asyncio.create_task(
+                time_rollups.run(settings.TIME_ROLLUPS_RECONCILE_INTERVAL)
+            )
+        )
+
+    # Reconcile ClickUp webhooks with the registered handlers while the server starts
+    webhook_manager = WebhookManager()
+    background_tasks.append(asyncio.create_task(reconcile_webhooks(webhook_manager)))
+    if settings.WEBHOOK_HEALTH_CHECK_INTERVAL > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                webhook_manager.run_health_checks(settings.WEBHOOK_HEALTH_CHECK_INTERVAL)
+            )
+        )
 
     # Create webhook server
     server = WebhookServer(
@@ -45,6 +148,44 @@ async def main():
         path=settings.WEBHOOK_PATH,
     )
 
+    @server.get_app().get("/metrics/telegram")
+    async def telegram_metrics():
+        """Telegram outbound queue metrics"""
+        return get_outbound_queue().metrics.to_dict()
+
+    @server.get_app().get("/metrics/clickup-writes")
+    async def clickup_write_metrics():
+        """ClickUp write-behind queue metrics"""
+        return get_task_write_queue().metrics.to_dict()
+
+    @server.get_app().get("/metrics/jobs")
+    async def job_metrics():
+        """Scheduled job runs (runtime and API calls per run)"""
+        return job_runner.metrics()
+
+    @server.get_app().get("/reports/time/{dimension}")
+    async def time_report(
+        dimension: str, start_day: Optional[str] = None, end_day: Optional[str] = None
+    ):
+        """Tracked time (milliseconds) per user, task, list or day"""
+        if time_rollups is None or dimension not in DIMENSIONS:
+            raise HTTPException(status_code=404, detail="Time rollups not available")
+        return time_rollups.totals(dimension, start_day, end_day)
+
+    # Telegram inline button callbacks (only with a secret: they write to ClickUp)
+    if settings.TELEGRAM_WEBHOOK_SECRET:
+        get_callback_router().mount(
+            server.get_app(),
+            settings.TELEGRAM_WEBHOOK_PATH,
+            settings.TELEGRAM_WEBHOOK_SECRET,
+        )
+        if settings.TELEGRAM_WEBHOOK_URL:
+            await set_webhook_async(
+                settings.TELEGRAM_WEBHOOK_URL, settings.TELEGRAM_WEBHOOK_SECRET
+            )
+    else:
+        logger.warning("⚠️ TELEGRAM_WEBHOOK_SECRET not set, Telegram callbacks disabled")
+
     logger.info("🚀 Starting ClickUp Webhook Server...")
     logger.info(
         f"📡 Listening on http://{settings.SERVER_HOST}:{settings.SERVER_PORT}{settings.WEBHOOK_PATH}"
@@ -76,6 +217,8 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Server error: {e}", exc_info=True)
         raise
+    finally:
+        await shutdown(background_tasks)
 
 
 if __name__ == "__main__":
@@ -2,3 +2,5 @@
 from . import when_broker_set  # noqa: F401
 from . import when_broker_set_dogovor
 from . import when_buxgalter_get_money
+from . import button_callbacks
+from . import broker_deadline
@@ -0,0 +1,220 @@
+"""
+Broker deadline reminders.
+
+The "📅 broker dedline" field is scheduled on the deadline scheduler
+(BROKER_DEADLINE_REMIND_BEFORE seconds before the deadline) whenever it is
+set or changed, and the brokers of the task get a Telegram reminder when a
+job fires.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from clickup_sdk.webhook import WebhookEvent, custom_field_changed
+
+from config.settings import get_settings
+from core.clickup_client import get_clickup_client
+from core.deadline_scheduler import ScheduledJob, get_deadline_scheduler
+from core.dispatcher import dispatcher
+from core.logging_config import get_logger
+from core.notifications import (
+    IdempotencyKey,
+    Notification,
+    Recipient,
+    fan_out,
+    log_delivery_results,
+    normalize_chat_id,
+)
+from core.task_mirror import get_task
+from core.task_query import FieldSet, get_task_query
+from core.telegram_bot import Priority
+from utils.format_dedline import format_deadline
+from utils.get_curstom_field_value import get_custom_field_value
+
+logger = get_logger(__name__)
+
+# Savdo handlers only subscribe to events of the savdo space (team-wide if unset)
+SAVDO_SPACE_ID = get_settings().SAVDO_SPACE_ID
+
+DEADLINE_FIELD = "📅 broker dedline"
+BROKER_FIELD = "Broker"
+REMINDER_KIND = "broker_deadline"
+
+scheduler = get_deadline_scheduler()
+
+
+def _job_key(task_id: str, offset: int) -> str:
+    return f"{REMINDER_KIND}:{task_id}:{offset}"
+
+
+def _broker_task_ids(value: Any) -> List[str]:
+    """
+    Extract broker task IDs from the Broker relationship field value.
+
+    Args:
+        value: Value returned by get_custom_field_value
+
+    Returns:
+        Related task IDs
+    """
+    if not value:
+        return []
+    items = value if isinstance(value, list) else [value]
+    return [
+        str(item["id"]) if isinstance(item, dict) else str(item)
+        for item in items
+        if not isinstance(item, dict) or item.get("id")
+    ]
+
+
+def schedule_broker_deadline(task: Dict[str, Any]) -> int:
+    """
+    (Re)schedule the deadline reminders of a task from its task data.
+
+    Reminders whose time has already passed are not scheduled; unchanged
+    reminders are left as they are.
+
+    Args:
+        task: ClickUp task dictionary
+
+    Returns:
+        Number of scheduled reminders
+    """
+    task_id = str(task["id"])
+    try:
+        deadline_ms = int(get_custom_field_value(task, DEADLINE_FIELD))
+    except (TypeError, ValueError):
+        deadline_ms = None
+
+    wanted: Dict[str, float] = {}
+    if deadline_ms is not None:
+        now = time.time()
+        for offset in get_settings().BROKER_DEADLINE_REMIND_BEFORE:
+            fire_at = deadline_ms / 1000 - offset
+            if fire_at > now:
+                wanted[_job_key(task_id, offset)] = fire_at
+
+    for job in scheduler.jobs_for_task(task_id):
+        if job.kind == REMINDER_KIND and wanted.get(job.key) != job.fire_at:
+            scheduler.cancel(job.key)
+    for key, fire_at in wanted.items():
+        if scheduler.get(key) is None:
+            offset = int(key.rsplit(":", 1)[1])
+            scheduler.schedule(
+                key, REMINDER_KIND, task_id, fire_at,
+                {"deadline": deadline_ms, "offset": offset},
+            )
+    return len(wanted)
+
+
+async def send_deadline_reminder(job: ScheduledJob) -> None:
+    """
+    Remind the brokers of a task that its deadline is approaching.
+
+    Args:
+        job: Fired reminder job
+    """
+    clickup_client = get_clickup_client()
+    task = await clickup_client.tasks.get_task(job.task_id)
+
+    # Skip reminders of deadlines that changed without a webhook reaching us
+    deadline = get_custom_field_value(task, DEADLINE_FIELD)
+    if str(deadline) != str(job.payload.get("deadline")):
+        logger.info("⏭️ Deadline of task %s changed, reminder skipped", job.task_id)
+        if deadline:
+            schedule_broker_deadline(task)
+        return
+    if (task.get("status") or {}).get("type") == "closed":
+        return
+
+    broker_ids = _broker_task_ids(get_custom_field_value(task, BROKER_FIELD))
+    brokers = await asyncio.gather(
+        *(get_task(broker_id) for broker_id in broker_ids), return_exceptions=True
+    )
+
+    recipients: List[Recipient] = []
+    for broker_id, broker in zip(broker_ids, brokers):
+        if isinstance(broker, Exception):
+            logger.error(f"❌ Error processing broker task {broker_id}: {broker}")
+            continue
+        telegram_id = get_custom_field_value(broker, "telegram_id")
+        if not telegram_id:
+            logger.warning(f"⚠️ No telegram_id found for broker task {broker_id}")
+            continue
+        recipients.append(
+            Recipient(chat_id=normalize_chat_id(telegram_id), name=broker.get("name", ""))
+        )
+
+    if not recipients:
+        return
+
+    message = (
+        f"⏰ <b>Broker dedline yaqinlashmoqda</b>\n\n"
+        f"📌 Ish nomi: {task.get('name', 'N/A')}\n"
+        f"📅 Broker dedline: {format_deadline(deadline)}\n"
+    )
+    if task.get("url"):
+        message += f"\n🔗 <a href='{task['url']}'>Taskni ko'rish</a>"
+
+    results = await fan_out(
+        recipients,
+        lambda recipient: Notification(message),
+        priority=Priority.HIGH,
+        idempotency_key=IdempotencyKey(
+            "send_deadline_reminder", job.task_id, f"{deadline}:{job.payload.get('offset')}"
+        ),
+    )
+    log_delivery_results(results, job.task_id)
+
+
+scheduler.register_job(REMINDER_KIND, send_deadline_reminder)
+
+
+@dispatcher.on(
+    "taskUpdated",
+    custom_field_changed(field_name=DEADLINE_FIELD),
+    space_id=SAVDO_SPACE_ID,
+)
+async def handle_broker_deadline_changed(event: WebhookEvent) -> None:
+    """
+    Reschedule reminders when the broker deadline is set, changed or removed.
+
+    Args:
+        event: Webhook event containing task update information
+    """
+    clickup_client = get_clickup_client()
+    task = await clickup_client.tasks.get_task(event.task_id)
+    scheduled = schedule_broker_deadline(task)
+    logger.info(
+        "⏰ Broker dedline o'zgardi! Task ID: %s (%s reminder(s))", event.task_id, scheduled
+    )
+
+
+@dispatcher.on("taskDeleted", space_id=SAVDO_SPACE_ID)
+async def handle_broker_deadline_task_deleted(event: WebhookEvent) -> None:
+    """
+    Drop the reminders of deleted tasks.
+
+    Args:
+        event: Webhook event of the deleted task
+    """
+    if event.task_id:
+        for job in scheduler.jobs_for_task(event.task_id):
+            if job.kind == REMINDER_KIND:
+                scheduler.cancel(job.key)
+
+
+def seed_broker_deadlines(tasks: Optional[List[Dict[str, Any]]] = None) -> int:
+    """
+    Schedule reminders for tasks with a broker deadline from task data.
+
+    Args:
+        tasks: Tasks to scan (defaults to the task mirror when enabled)
+
+    Returns:
+        Number of scheduled reminders
+    """
+    if tasks is None:
+        tasks = list(get_task_query().select(FieldSet(DEADLINE_FIELD)))
+    return sum(schedule_broker_deadline(task) for task in tasks)
@@ -0,0 +1 @@
+from . import button_callbacks
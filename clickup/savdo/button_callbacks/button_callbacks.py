@@ -0,0 +1,86 @@
+"""
+Telegram inline button handlers for savdo notifications.
+
+Each button moves the task to the status configured for it in settings.
+Updates go through the write-behind queue, so repeated presses for the same
+task become one API call.
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+from config.settings import get_settings
+from core.clickup_client import get_task_write_queue
+from core.logging_config import get_logger
+from core.message_registry import get_message_registry
+from core.telegram_callbacks import (
+    ERROR_TEXT,
+    UNKNOWN_ACTION_TEXT,
+    CallbackQuery,
+    get_callback_router,
+)
+
+logger = get_logger(__name__)
+
+router = get_callback_router()
+
+_settings = get_settings()
+
+# callback action -> ClickUp status the task is moved to (unset buttons omitted)
+CALLBACK_STATUS_MAP: Dict[str, str] = {
+    action: status
+    for action, status in (
+        # "✅ Lot qo'yildi" (broker)
+        ("lot_in", _settings.BUTTON_STATUS_LOT_IN),
+        # "✅ Documentlar tugatildi" (dogovor)
+        ("dogovor_in", _settings.BUTTON_STATUS_DOGOVOR_IN),
+        # "✅ Pul qabul qilindi" (buxgalter)
+        ("payment_received", _settings.BUTTON_STATUS_PAYMENT_RECEIVED),
+    )
+    if status
+}
+
+ACCEPTED_TEXT = "✅ Qabul qilindi"
+QUEUED_TEXT = "⏳ Navbatga qo'yildi, status tez orada yangilanadi"
+
+
+async def handle_status_button(query: CallbackQuery) -> Optional[str]:
+    """
+    Change the task status of a pressed button.
+
+    Only buttons of messages the bot sent for the task are applied. The
+    write goes through the write-behind queue; the answer waits for it up
+    to BUTTON_WRITE_WAIT seconds, so "accepted" is only shown once ClickUp
+    took the change.
+
+    Args:
+        query: Parsed callback query
+
+    Returns:
+        Text shown to the user
+    """
+    if not get_message_registry().has_button(query.task_id, query.chat_id, query.message_id):
+        logger.warning(
+            f"⚠️ Button {query.action} for task {query.task_id} is not on a message "
+            f"the bot sent (chat {query.chat_id}, message {query.message_id})"
+        )
+        return UNKNOWN_ACTION_TEXT
+
+    status = CALLBACK_STATUS_MAP[query.action]
+    logger.info("📝 Task %s → %s (button %s)", query.task_id, status, query.action)
+
+    # Write failures are logged by the queue, which also marks them retrieved
+    future = get_task_write_queue().update_task(query.task_id, status=status)
+    try:
+        # Shielded: a slow write keeps going after the answer
+        await asyncio.wait_for(asyncio.shield(future), get_settings().BUTTON_WRITE_WAIT)
+    except asyncio.TimeoutError:
+        return QUEUED_TEXT
+    except Exception as e:
+        logger.error(f"❌ Status change of task {query.task_id} to {status} failed: {e}")
+        return ERROR_TEXT
+    return ACCEPTED_TEXT
+
+
+for action in CALLBACK_STATUS_MAP:
+    router.on(action)(handle_status_button)
@@ -2,7 +2,8 @@
 Webhook handlers for broker field changes in ClickUp tasks.
 """
 
-from typing import Optional, Any
+import asyncio
+from typing import Any, List, Optional
 
 from clickup.savdo.when_broker_set.components import (
     create_broker_message,
@@ -14,15 +15,31 @@ from clickup_sdk.webhook import (
     custom_field_removed,
     WebhookEvent,
 )
+from config.settings import get_settings
 from core.dispatcher import dispatcher
 from core.clickup_client import get_clickup_client
-from core.telegram_bot import send_message
+from core.message_registry import MessageKey
+from core.notifications import (
+    IdempotencyKey,
+    Notification,
+    Recipient,
+    fan_out,
+    log_delivery_results,
+    normalize_chat_id,
+)
+from core.task_mirror import get_task
 from utils.get_curstom_field_value import get_custom_field_value
 from core.logging_config import get_logger
 
 
 logger = get_logger(__name__)
 
+# Savdo handlers only subscribe to events of the savdo space (team-wide if unset)
+SAVDO_SPACE_ID = get_settings().SAVDO_SPACE_ID
+
+# Tracked message kind, edited in place when the broker changes again
+BROKER_MESSAGE_KIND = "broker"
+
 
 def extract_relation_task_id(after: Any) -> Optional[str]:
     """
@@ -53,29 +70,26 @@ def extract_relation_task_id(after: Any) -> Optional[str]:
     return None
 
 
-# Broker ma'lumot joylanganda
-@dispatcher.on("taskUpdated", custom_field_set(field_name="Broker"))
-async def handle_broker_set(event: WebhookEvent) -> None:
-
-    print("🚀 ~ file: when_broker_set.py:59 ~ event:", event)
-
+def _collect_relation_task_ids(event: WebhookEvent) -> List[str]:
     """
-    Handle broker field being set (assigned).
+    Collect broker relation task IDs from the event history items.
 
     Args:
         event: Webhook event containing task update information
-    """
-    logger.info(f"🎯 Broker belgilandi! Task ID: {event.task_id}")
 
+    Returns:
+        Relation task IDs
+    """
     if not event.history_items:
         logger.warning(f"No history items found for task {event.task_id}")
-        return
+        return []
 
+    relation_task_ids: List[str] = []
     for item in event.history_items:
         before = item.get("before", {})
         after = item.get("after", {})
 
-        logger.info(f"  Broker: {before} → {after}")
+        logger.debug("  Broker: %s → %s", before, after)
 
         # Extract relation task ID
         relation_task_id = extract_relation_task_id(after)
@@ -83,59 +97,116 @@ async def handle_broker_set(event: WebhookEvent) -> None:
             logger.warning(f"Could not extract relation task ID from: {after}")
             continue
 
-        logger.info(f"  Relation Task ID: {relation_task_id}")
+        logger.debug("  Relation Task ID: %s", relation_task_id)
+        relation_task_ids.append(relation_task_id)
+
+    return relation_task_ids
 
-        # Get relation task (broker) and send message
-        try:
-            clickup_client = get_clickup_client()
-            relation_task = await clickup_client.tasks.get_task(relation_task_id)
-            telegram_id = get_custom_field_value(relation_task, "telegram_id")
 
-            if not telegram_id:
-                logger.warning(
-                    f"⚠️ No telegram_id found for broker task {relation_task_id}"
-                )
-                continue
+async def _notify_brokers(
+    event: WebhookEvent, relation_task_ids: List[str], handler: str
+) -> None:
+    """
+    Send (or update in place) the broker message of a task.
 
-            logger.info(f"  Telegram ID: {telegram_id}")
+    Args:
+        event: Webhook event containing task update information
+        relation_task_ids: Broker relation task IDs
+        handler: Handler name used for the idempotency key
+    """
+    try:
+        # Get main task for URL and list information
+        clickup_client = get_clickup_client()
+        main_task = await clickup_client.tasks.get_task(event.task_id)
+        task_url = main_task.get("url", "")
+
+        if not task_url:
+            logger.warning(f"⚠️ No URL found for main task {event.task_id}")
+            return
+
+        # Get list information from task
+        list_info = main_task.get("list", {})
+        list_id = list_info.get("id", "")
+        list_name = list_info.get("name", "N/A")
+
+        logger.debug("📂 Task list: %s (ID: %s)", list_name, list_id)
+
+        # Create formatted message from main task
+        message = await create_broker_message(event.task_id)
+
+        # Create inline keyboard with task_id and list_id
+        keyboard = create_broker_keyboard(event.task_id, list_id)
+    except Exception as e:
+        logger.error(
+            f"❌ Error preparing broker message for task {event.task_id}: {e}",
+            exc_info=True,
+        )
+        return
+
+    # Get relation tasks (brokers) concurrently
+    relation_tasks = await asyncio.gather(
+        *(get_task(relation_task_id) for relation_task_id in relation_task_ids),
+        return_exceptions=True,
+    )
+
+    recipients: List[Recipient] = []
+    for relation_task_id, relation_task in zip(relation_task_ids, relation_tasks):
+        if isinstance(relation_task, Exception):
+            logger.error(
+                f"❌ Error processing broker task {relation_task_id}: {relation_task}"
+            )
+            continue
 
-            # Get main task for URL and list information
-            main_task = await clickup_client.tasks.get_task(event.task_id)
-            task_url = main_task.get("url", "")
+        telegram_id = get_custom_field_value(relation_task, "telegram_id")
+        if not telegram_id:
+            logger.warning(
+                f"⚠️ No telegram_id found for broker task {relation_task_id}"
+            )
+            continue
 
-            if not task_url:
-                logger.warning(f"⚠️ No URL found for main task {event.task_id}")
-                continue
+        logger.debug("  Telegram ID: %s", telegram_id)
+        recipients.append(
+            Recipient(
+                chat_id=normalize_chat_id(telegram_id),
+                name=relation_task.get("name", ""),
+            )
+        )
 
-            # Get list information from task
-            list_info = main_task.get("list", {})
-            list_id = list_info.get("id", "")
-            list_name = list_info.get("name", "N/A")
+    # Send message to brokers with inline keyboard
+    results = await fan_out(
+        recipients,
+        lambda recipient: Notification(message, reply_markup=keyboard),
+        digest=True,
+        idempotency_key=IdempotencyKey.from_event(handler, event),
+        message_key=MessageKey(event.task_id, BROKER_MESSAGE_KIND),
+    )
+    log_delivery_results(results, event.task_id)
 
-            logger.info(f"📂 Task list: {list_name} (ID: {list_id})")
 
-            # Create formatted message from main task
-            message = await create_broker_message(event.task_id)
+# Broker ma'lumot joylanganda
+@dispatcher.on(
+    "taskUpdated", custom_field_set(field_name="Broker"), space_id=SAVDO_SPACE_ID
+)
+async def handle_broker_set(event: WebhookEvent) -> None:
+    """
+    Handle broker field being set (assigned).
 
-            # Create inline keyboard with task_id and list_id
-            keyboard = create_broker_keyboard(event.task_id, list_id)
+    Args:
+        event: Webhook event containing task update information
+    """
+    logger.info("🎯 Broker belgilandi! Task ID: %s", event.task_id)
 
-            # Send message to broker with inline keyboard
-            success = send_message(int(telegram_id), message, reply_markup=keyboard)
-            if success:
-                logger.info(f"✅ Message sent to broker (Telegram ID: {telegram_id})")
-            else:
-                logger.error(f"❌ Failed to send message to Telegram ID {telegram_id}")
+    relation_task_ids = _collect_relation_task_ids(event)
+    if not relation_task_ids:
+        return
 
-        except Exception as e:
-            logger.error(
-                f"❌ Error processing broker task {relation_task_id}: {e}",
-                exc_info=True,
-            )
+    await _notify_brokers(event, relation_task_ids, "handle_broker_set")
 
 
 # Broker ma'lumot olib tashlanganda
-@dispatcher.on("taskUpdated", custom_field_removed(field_name="Broker"))
+@dispatcher.on(
+    "taskUpdated", custom_field_removed(field_name="Broker"), space_id=SAVDO_SPACE_ID
+)
 async def handle_broker_removed(event: WebhookEvent) -> None:
     """
     Handle broker field being removed.
@@ -143,15 +214,15 @@ async def handle_broker_removed(event: WebhookEvent) -> None:
     Args:
         event: Webhook event containing task update information
     """
-    logger.info(f"🗑️ Broker olib tashlandi! Task ID: {event.task_id}")
+    logger.info("🗑️ Broker olib tashlandi! Task ID: %s", event.task_id)
 
     if event.history_items:
         for item in event.history_items:
             before = item.get("before", {})
             after = item.get("after", {})
-            logger.info(f"  Broker: {before} → {after}")
+            logger.debug("  Broker: %s → %s", before, after)
 
-    logger.info(f"✅ Broker olib tashlandi: {event.task_id}")
+    logger.info("✅ Broker olib tashlandi: %s", event.task_id)
 
 
 # Broker ma'lumot yangilanganda (optional - agar kerak bo'lsa)
@@ -160,6 +231,7 @@ async def handle_broker_removed(event: WebhookEvent) -> None:
     CustomFieldFilter(
         field_name="Broker", on_set=False, on_remove=False, on_update=True
     ),
+    space_id=SAVDO_SPACE_ID,
 )
 async def handle_broker_updated(event: WebhookEvent) -> None:
     """
@@ -168,12 +240,11 @@ async def handle_broker_updated(event: WebhookEvent) -> None:
     Args:
         event: Webhook event containing task update information
     """
-    logger.info(f"🔄 Broker yangilandi! Task ID: {event.task_id}")
+    logger.info("🔄 Broker yangilandi! Task ID: %s", event.task_id)
 
-    if event.history_items:
-        for item in event.history_items:
-            before = item.get("before", {})
-            after = item.get("after", {})
-            logger.info(f"  Broker: {before} → {after}")
+    relation_task_ids = _collect_relation_task_ids(event)
+    if relation_task_ids:
+        # Brokers that already have the message get it edited in place
+        await _notify_brokers(event, relation_task_ids, "handle_broker_updated")
 
-    logger.info(f"✅ Broker yangilandi: {event.task_id}")
+    logger.info("✅ Broker yangilandi: %s", event.task_id)
@@ -14,15 +14,27 @@ from clickup_sdk.webhook import (
     custom_field_removed,
     WebhookEvent,
 )
+from config.settings import get_settings
 from core.dispatcher import dispatcher
 from core.clickup_client import get_clickup_client
-from core.telegram_bot import send_document_from_url
+from core.task_mirror import get_task
+from core.message_registry import MessageKey, get_message_registry
+from core.telegram_bot import (
+    edit_message_caption_async,
+    send_document_or_relay_async,
+)
 from utils.get_curstom_field_value import get_custom_field_value
 from core.logging_config import get_logger
 from config.config import Config
 
 logger = get_logger(__name__)
 
+# Savdo handlers only subscribe to events of the savdo space (team-wide if unset)
+SAVDO_SPACE_ID = get_settings().SAVDO_SPACE_ID
+
+# Tracked message kind, its caption is edited in place on Dogovor updates
+DOGOVOR_MESSAGE_KIND = "dogovor"
+
 
 def extract_relation_task_id(after: Any) -> Optional[str]:
     """
@@ -54,7 +66,9 @@ def extract_relation_task_id(after: Any) -> Optional[str]:
 
 
 # Dogovor ma'lumot joylanganda
-@dispatcher.on("taskUpdated", custom_field_set(field_name="Dogovor"))
+@dispatcher.on(
+    "taskUpdated", custom_field_set(field_name="Dogovor"), space_id=SAVDO_SPACE_ID
+)
 async def handle_dogovor_set(event: WebhookEvent) -> None:
     """
     Handle Dogovor field being set (assigned).
@@ -62,7 +76,7 @@ async def handle_dogovor_set(event: WebhookEvent) -> None:
     Args:
         event: Webhook event containing task update information
     """
-    logger.info(f"🎯 Dogovor belgilandi! Task ID: {event.task_id}")
+    logger.info("🎯 Dogovor belgilandi! Task ID: %s", event.task_id)
 
     if not event.history_items:
         logger.warning(f"No history items found for task {event.task_id}")
@@ -72,7 +86,7 @@ async def handle_dogovor_set(event: WebhookEvent) -> None:
         before = item.get("before", {})
         after = item.get("after", {})
 
-        logger.info(f"  Dogovor: {before} → {after}")
+        logger.debug("  Dogovor: %s → %s", before, after)
 
         # Extract relation task ID
         dogovor_url = after
@@ -80,28 +94,28 @@ async def handle_dogovor_set(event: WebhookEvent) -> None:
             logger.warning(f"Could not extract dogovor url from: {after}")
             continue
 
-        logger.info(f"  Dogovor url: {dogovor_url}")
+        logger.debug("  Dogovor url: %s", dogovor_url)
 
         # Get relation task (Dogovor) and send message
         clickup_client = get_clickup_client()
 
         task = await clickup_client.tasks.get_task(event.task_id)
         buxgalter_relation = get_custom_field_value(task, "Bug'galter | Document")
-        buxgalter = await clickup_client.tasks.get_task(buxgalter_relation[0]["id"])
+        buxgalter = await get_task(buxgalter_relation[0]["id"])
         telegram_id = get_custom_field_value(buxgalter, "telegram_id")
 
         if not telegram_id:
             logger.warning(f"⚠️ No telegram_id found for Dogovor task {task}")
             continue
 
-        logger.info(f"  Telegram ID: {telegram_id}")
+        logger.debug("  Telegram ID: %s", telegram_id)
 
         # Get list information from task
         list_info = task.get("list", {})
         list_id = list_info.get("id", "")
         list_name = list_info.get("name", "N/A")
 
-        logger.info(f"📂 Task list: {list_name} (ID: {list_id})")
+        logger.debug("📂 Task list: %s (ID: %s)", list_name, list_id)
 
         # Create formatted message from main task
         message = await create_message(event.task_id)
@@ -109,25 +123,27 @@ async def handle_dogovor_set(event: WebhookEvent) -> None:
         # Create inline keyboard with task_id and list_id
         keyboard = create_keyboard(event.task_id, list_id)
 
-        print(
-            f"🔍 ~ handle_dogovor_set ~ clickup/savdo/when_broker_set_dogovor/when_broker_set_dogovor.py:107 ~ {event}:"
-        )
-
         # Send message to Dogovor with inline keyboard
-        success = send_document_from_url(
-            caption=message,
-            chat_id=telegram_id,
-            file_url="https://www.eta.gov.eg/sites/default/files/2020-12/pdf-test.pdf",
-            reply_markup=keyboard,
+        file_url = "https://www.eta.gov.eg/sites/default/files/2020-12/pdf-test.pdf"
+        # Uploaded from here only if Telegram cannot fetch the URL itself
+        sent_message = await send_document_or_relay_async(
+            telegram_id, file_url, caption=message, reply_markup=keyboard
         )
-        if success:
-            logger.info(f"✅ Message sent to Dogovor (Telegram ID: {telegram_id})")
+        if sent_message is not None:
+            get_message_registry().set(
+                MessageKey(event.task_id, DOGOVOR_MESSAGE_KIND),
+                telegram_id,
+                sent_message["message_id"],
+            )
+            logger.info("✅ Message sent to Dogovor (Telegram ID: %s)", telegram_id)
         else:
             logger.error(f"❌ Failed to send message to Telegram ID {telegram_id}")
 
 
 # Dogovor ma'lumot olib tashlanganda
-@dispatcher.on("taskUpdated", custom_field_removed(field_name="Dogovor"))
+@dispatcher.on(
+    "taskUpdated", custom_field_removed(field_name="Dogovor"), space_id=SAVDO_SPACE_ID
+)
 async def handle_dogovor_removed(event: WebhookEvent) -> None:
     """
     Handle Dogovor field being removed.
@@ -135,15 +151,15 @@ async def handle_dogovor_removed(event: WebhookEvent) -> None:
     Args:
         event: Webhook event containing task update information
     """
-    logger.info(f"🗑️ Dogovor olib tashlandi! Task ID: {event.task_id}")
+    logger.info("🗑️ Dogovor olib tashlandi! Task ID: %s", event.task_id)
 
     if event.history_items:
         for item in event.history_items:
             before = item.get("before", {})
             after = item.get("after", {})
-            logger.info(f"  Dogovor: {before} → {after}")
+            logger.debug("  Dogovor: %s → %s", before, after)
 
-    logger.info(f"✅ Dogovor olib tashlandi: {event.task_id}")
+    logger.info("✅ Dogovor olib tashlandi: %s", event.task_id)
 
 
 # Dogovor ma'lumot yangilanganda (optional - agar kerak bo'lsa)
@@ -152,6 +168,7 @@ async def handle_dogovor_removed(event: WebhookEvent) -> None:
     CustomFieldFilter(
         field_name="Dogovor", on_set=False, on_remove=False, on_update=True
     ),
+    space_id=SAVDO_SPACE_ID,
 )
 async def handle_dogovor_update(event: WebhookEvent) -> None:
     """
@@ -160,12 +177,36 @@ async def handle_dogovor_update(event: WebhookEvent) -> None:
     Args:
         event: Webhook event containing task update information
     """
-    logger.info(f"🔄 Dogovor yangilandi! Task ID: {event.task_id}")
+    logger.info("🔄 Dogovor yangilandi! Task ID: %s", event.task_id)
 
     if event.history_items:
         for item in event.history_items:
             before = item.get("before", {})
             after = item.get("after", {})
-            logger.info(f"  Dogovor: {before} → {after}")
+            logger.debug("  Dogovor: %s → %s", before, after)
+
+    # Refresh caption and keyboard of the already sent document
+    message_key = MessageKey(event.task_id, DOGOVOR_MESSAGE_KIND)
+    registry = get_message_registry()
+    tracked_messages = registry.get_all(message_key)
+    if not tracked_messages:
+        logger.info("ℹ️ No tracked Dogovor message for task %s", event.task_id)
+        return
+
+    clickup_client = get_clickup_client()
+    task = await clickup_client.tasks.get_task(event.task_id)
+    list_id = task.get("list", {}).get("id", "")
+    message = await create_message(event.task_id)
+    keyboard = create_keyboard(event.task_id, list_id)
+
+    for chat_id, message_id in tracked_messages.items():
+        edited = await edit_message_caption_async(
+            chat_id, message_id, message, reply_markup=keyboard
+        )
+        if edited is None:
+            registry.delete(message_key, chat_id)
+            logger.error(f"❌ Failed to update Dogovor message in chat {chat_id}")
+        else:
+            logger.info("✏️ Dogovor message updated (Telegram ID: %s)", chat_id)
 
-    logger.info(f"✅ Dogovor yangilandi: {event.task_id}")
+    logger.info("✅ Dogovor yangilandi: %s", event.task_id)
@@ -1 +1,2 @@
 from . import when_buxgalter_get_money
+from . import daily_digest
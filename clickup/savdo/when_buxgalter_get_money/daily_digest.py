@@ -0,0 +1,139 @@
+"""
+Daily accountant digest of every task waiting for payment.
+
+Complements the real-time notify_accountant_on_payment_pending pings with
+one morning summary per accountant.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List
+
+from clickup.savdo.when_buxgalter_get_money.components import (
+    create_accountant_keyboard,
+    create_accountant_message,
+)
+from clickup.savdo.when_buxgalter_get_money.when_buxgalter_get_money import (
+    ACCOUNTANT_RELATION_FIELD,
+    TELEGRAM_FIELD,
+    extract_relation_task_id,
+)
+from config.settings import get_settings
+from core.clickup_client import get_clickup_client
+from core.jobs import get_job_runner
+from core.logging_config import get_logger
+from core.notifications import (
+    Delivery,
+    IdempotencyKey,
+    Notification,
+    Recipient,
+    deliver_batch,
+    normalize_chat_id,
+)
+from core.task_mirror import get_task
+from core.telegram_digest import build_digest_messages
+from utils.get_curstom_field_value import get_custom_field_value
+
+logger = get_logger(__name__)
+
+PAYMENT_PENDING_STATUS = "pul tushishi kutilmoqda"
+DIGEST_JOB_NAME = "accountant_daily_digest"
+
+
+async def send_accountant_daily_digest() -> Dict[str, Any]:
+    """
+    Send every accountant the list of their tasks waiting for payment.
+
+    Returns:
+        Run summary (tasks, accountants, messages, failed)
+    """
+    settings = get_settings()
+    clickup_client = get_clickup_client()
+
+    # One data set for all accountants, pages requested in parallel
+    tasks = await clickup_client.tasks.fetch_all_tasks(
+        concurrency=settings.ACCOUNTANT_DIGEST_PAGE_CONCURRENCY,
+        team_id=int(settings.TEAM_ID),
+        statuses=[PAYMENT_PENDING_STATUS],
+        subtasks=True,
+    )
+
+    tasks_by_accountant: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for task in tasks:
+        relation_value = get_custom_field_value(task, ACCOUNTANT_RELATION_FIELD)
+        accountant_task_id = extract_relation_task_id(relation_value)
+        if accountant_task_id:
+            tasks_by_accountant[accountant_task_id].append(task)
+        else:
+            logger.warning(f"⚠️ No accountant relation for task {task.get('id')}")
+
+    accountant_ids = list(tasks_by_accountant)
+    accountants = await asyncio.gather(
+        *(get_task(accountant_id) for accountant_id in accountant_ids),
+        return_exceptions=True,
+    )
+
+    today = date.today().isoformat()
+    deliveries: List[Delivery] = []
+    for accountant_id, accountant_task in zip(accountant_ids, accountants):
+        if isinstance(accountant_task, Exception):
+            logger.error(
+                f"❌ Failed to fetch accountant task {accountant_id}: {accountant_task}"
+            )
+            continue
+        chat_id = normalize_chat_id(get_custom_field_value(accountant_task, TELEGRAM_FIELD))
+        if chat_id is None:
+            logger.warning(f"⚠️ No {TELEGRAM_FIELD} found for accountant task {accountant_id}")
+            continue
+
+        accountant_tasks = tasks_by_accountant[accountant_id]
+        notifications = [
+            Notification(
+                create_accountant_message(task, accountant_task),
+                reply_markup=create_accountant_keyboard(
+                    task.get("url"),
+                    accountant_task.get("url"),
+                    task["id"],
+                    task.get("list", {}).get("id", ""),
+                ),
+            )
+            for task in accountant_tasks
+        ]
+        title = f"🌅 <b>Kunlik hisobot: {len(accountant_tasks)} ta to'lov kutilmoqda</b>"
+        recipient = Recipient(chat_id=chat_id, name=accountant_task.get("name", ""))
+        for number, (text, reply_markup) in enumerate(
+            build_digest_messages(notifications, title=title)
+        ):
+            deliveries.append(
+                Delivery(
+                    recipient,
+                    Notification(text, reply_markup=reply_markup),
+                    # Restarting the app the same day does not resend the digest
+                    IdempotencyKey(DIGEST_JOB_NAME, today, str(number)),
+                )
+            )
+
+    results = await deliver_batch(deliveries)
+    failed = sum(1 for result in results if not result.success)
+    logger.info(
+        "📬 Accountant digest: %s task(s), %s accountant(s), %s message(s), %s failed",
+        len(tasks),
+        len(accountant_ids),
+        len(deliveries),
+        failed,
+    )
+    return {
+        "tasks": len(tasks),
+        "accountants": len(accountant_ids),
+        "messages": len(deliveries),
+        "failed": failed,
+    }
+
+
+if get_settings().ACCOUNTANT_DIGEST_CRON:
+    get_job_runner().add_job(
+        DIGEST_JOB_NAME,
+        get_settings().ACCOUNTANT_DIGEST_CRON,
+        send_accountant_daily_digest,
+    )
@@ -10,14 +10,26 @@ from clickup.savdo.when_buxgalter_get_money.components import (
     create_accountant_keyboard,
     create_accountant_message,
 )
+from config.settings import get_settings
 from core.dispatcher import dispatcher
 from core.clickup_client import get_clickup_client
 from core.logging_config import get_logger
-from core.telegram_bot import send_message
+from core.notifications import (
+    IdempotencyKey,
+    Notification,
+    Recipient,
+    fan_out,
+    log_delivery_results,
+    normalize_chat_id,
+)
+from core.task_mirror import get_task
 from utils.get_curstom_field_value import get_custom_field_value
 
 logger = get_logger(__name__)
 
+# Savdo handlers only subscribe to events of the savdo space (team-wide if unset)
+SAVDO_SPACE_ID = get_settings().SAVDO_SPACE_ID
+
 ACCOUNTANT_RELATION_FIELD = "Bug'galter | Summa"
 TELEGRAM_FIELD = "telegram_id"
 
@@ -50,25 +62,16 @@ def extract_relation_task_id(value: Any) -> Optional[str]:
     return None
 
 
-def normalize_chat_id(raw_chat_id: Any) -> Any:
-    """
-    Normalize chat ID to int when possible.
-    """
-    if raw_chat_id is None:
-        return None
-
-    try:
-        return int(str(raw_chat_id).strip())
-    except (ValueError, TypeError):
-        return str(raw_chat_id).strip()
-
-
-@dispatcher.on("taskStatusUpdated", status_changed(to_status="pul tushishi kutilmoqda"))
+@dispatcher.on(
+    "taskStatusUpdated",
+    status_changed(to_status="pul tushishi kutilmoqda"),
+    space_id=SAVDO_SPACE_ID,
+)
 async def notify_accountant_on_payment_pending(event: WebhookEvent) -> None:
     """
     Notify accountant when task status switches to "pul tushishi kutilmoqda".
     """
-    logger.info(f"💰 Payment pending status detected. Task ID: {event.task_id}")
+    logger.info("💰 Payment pending status detected. Task ID: %s", event.task_id)
 
     clickup_client = get_clickup_client()
 
@@ -89,7 +92,7 @@ async def notify_accountant_on_payment_pending(event: WebhookEvent) -> None:
         return
 
     try:
-        accountant_task = await clickup_client.tasks.get_task(relation_task_id)
+        accountant_task = await get_task(relation_task_id)
     except Exception as exc:
         logger.error(
             f"❌ Failed to fetch accountant task {relation_task_id}: {exc}",
@@ -109,7 +112,7 @@ async def notify_accountant_on_payment_pending(event: WebhookEvent) -> None:
     list_id = list_info.get("id", "")
     list_name = list_info.get("name", "N/A")
     
-    logger.info(f"📂 Task list: {list_name} (ID: {list_id})")
+    logger.debug("📂 Task list: %s (ID: %s)", list_name, list_id)
 
     message = create_accountant_message(task, accountant_task)
     keyboard = create_accountant_keyboard(
@@ -126,8 +129,11 @@ async def notify_accountant_on_payment_pending(event: WebhookEvent) -> None:
         )
         return
 
-    success = send_message(chat_id, message, reply_markup=keyboard)
-    if success:
-        logger.info(f"✅ Accountant notified for task {event.task_id}")
-    else:
-        logger.error(f"❌ Failed to notify accountant chat_id={chat_id}")
+    results = await fan_out(
+        [Recipient(chat_id=chat_id, name=accountant_task.get("name", ""))],
+        lambda recipient: Notification(message, reply_markup=keyboard),
+        idempotency_key=IdempotencyKey.from_event(
+            "notify_accountant_on_payment_pending", event
+        ),
+    )
+    log_delivery_results(results, event.task_id)
@@ -8,9 +8,15 @@ from clickup_sdk.webhook import WebhookEvent
 from core.dispatcher import dispatcher
 from core.clickup_client import get_clickup_client
 from core.logging_config import get_logger
-from core.telegram_bot import send_message
-from config.settings import get_settings
-from utils.get_curstom_field_value import get_custom_field_value
+from core.member_cache import get_member_cache
+from core.notifications import (
+    IdempotencyKey,
+    Notification,
+    Recipient,
+    fan_out,
+    log_delivery_results,
+)
+from clickup.utils.telegram_directory import get_directory_tasks
 
 logger = get_logger(__name__)
 
@@ -22,8 +28,11 @@ def format_assignees(assignees: List[Dict[str, Any]]) -> str:
     """
     Format assignees list into a readable string.
 
+    Names come from the member cache; partial assignee data is only used for
+    users the cache does not know.
+
     Args:
-        assignees: List of assignee dictionaries
+        assignees: List of assignee dictionaries (or user IDs)
 
     Returns:
         Formatted string with assignee names
@@ -31,9 +40,13 @@ def format_assignees(assignees: List[Dict[str, Any]]) -> str:
     if not assignees:
         return "Hech kim"
 
+    members = get_member_cache()
     names = []
     for assignee in assignees:
-        if isinstance(assignee, dict):
+        member = members.resolve(assignee)
+        if member is not None:
+            names.append(member.display_name)
+        elif isinstance(assignee, dict):
             username = assignee.get("username", "")
             name = assignee.get("display_name") or assignee.get("name") or username
             if name:
@@ -46,27 +59,19 @@ def format_assignees(assignees: List[Dict[str, Any]]) -> str:
 
 async def find_member_task_by_assignee_id() -> List[Dict[str, Any]]:
     """
-    Find all tasks from the specified list.
-    
-    Args:
-        list_name: Name of the list to search for
-        assignee_id: Assignee ID (currently not used, returns all tasks)
-        
+    Find all tasks from the staff directory list.
+
     Returns:
-        List of all tasks from the specified list
+        List of all tasks from the staff directory list
     """
-    settings = get_settings()
-    clickup_client = get_clickup_client()
-    tasks = await clickup_client.tasks.get_tasks(list_id='901413862325')
-
-    return tasks.get("tasks", [])
+    return await get_directory_tasks()
 
 @dispatcher.on("taskAssigneeUpdated")
 async def notify_admin_on_assignee_change(event: WebhookEvent) -> None:
     """
     Notify admin when task assignee changes.
     """
-    logger.info(f"👤 Assignee change detected. Task ID: {event.task_id}")
+    logger.info("👤 Assignee change detected. Task ID: %s", event.task_id)
 
     clickup_client = get_clickup_client()
 
@@ -82,7 +87,7 @@ async def notify_admin_on_assignee_change(event: WebhookEvent) -> None:
     task_assignees = task.get("assignees", [])
 
     # Debug: log task assignees directly
-    logger.info(f"📋 Task assignees from API: {task_assignees}")
+    logger.debug("📋 Task assignees from API: %s", task_assignees)
 
     # Get list information
     list_info = task.get("list", {})
@@ -98,10 +103,10 @@ async def notify_admin_on_assignee_change(event: WebhookEvent) -> None:
     old_assignees_str = "Hech kim"
 
     if event.history_items:
-        logger.debug(f"📋 History items count: {len(event.history_items)}")
+        logger.debug("📋 History items count: %s", len(event.history_items))
         for item in event.history_items:
             # Log the structure for debugging
-            logger.debug(f"📋 History item structure: {item}")
+            logger.debug("📋 History item structure: %s", item)
 
             # Try different possible structures
             before = item.get("before")
@@ -137,15 +142,13 @@ async def notify_admin_on_assignee_change(event: WebhookEvent) -> None:
             # Format for logging
             if old_assignees:
                 old_assignees_str = format_assignees(old_assignees)
-                logger.info(
-                    f"  Assignees changed: {old_assignees_str} → {new_assignees_str}"
-                )
+                logger.debug("  Assignees changed: %s → %s", old_assignees_str, new_assignees_str)
                 break
 
     # If we couldn't extract old assignees, just log current ones
     if old_assignees_str == "Hech kim":
         if new_assignees:
-            logger.info(f"  Current task assignees: {new_assignees_str}")
+            logger.debug("  Current task assignees: %s", new_assignees_str)
         else:
             logger.warning(f"⚠️ No assignees found for task {event.task_id}")
 
@@ -154,73 +157,54 @@ async def notify_admin_on_assignee_change(event: WebhookEvent) -> None:
         logger.warning(f"⚠️ Task has no assignees, skipping notification")
         return
 
-    # Process each new assignee and send message to their Telegram
+    # Resolve all assignees to Telegram chats from the member cache
+    members = get_member_cache()
+    try:
+        await members.ensure_fresh()
+    except Exception as exc:
+        # Keep using the previously loaded members
+        logger.error(f"❌ Failed to refresh member cache: {exc}", exc_info=True)
+
+    recipients: List[Recipient] = []
     for assignee in new_assignees:
         assignee_id = assignee.get("id")
-        assignee_name = assignee.get("name") or assignee.get("username") or "Noma'lum"
-
         if not assignee_id:
             logger.warning(f"⚠️ Assignee ID not found for assignee: {assignee}")
             continue
 
-        logger.info(
-            f"🔍 Searching for member with assignee_id: {assignee_id} (Name: {assignee_name})"
+        member = members.get(assignee_id)
+        assignee_name = (
+            member.display_name if member
+            else assignee.get("name") or assignee.get("username") or "Noma'lum"
         )
-
-        # Find all tasks in "stuffs-extra-datas" list
-        all_tasks = await find_member_task_by_assignee_id()
-
-        if not all_tasks:
-            logger.warning(f"⚠️ No tasks found in 'stuffs-extra-datas' list")
-            continue
-
-        # Search for matching task with assignee_id
-        telegram_id = None
-        for task in all_tasks:
-            task_assignee_id = get_custom_field_value(task, 'assignee_id')
-            
-            # Skip if assignee_id is not found or empty
-            if task_assignee_id is None:
-                continue
-            
-            if str(task_assignee_id) == str(assignee_id):
-                telegram_id = get_custom_field_value(task, 'telegram_id')
-                if telegram_id:
-                    break
-
-        # Check if telegram_id was found
+        telegram_id = await members.fetch_telegram_id(assignee_id)
         if not telegram_id:
             logger.warning(
                 f"⚠️ Telegram ID not found for assignee_id: {assignee_id} (Name: {assignee_name})"
             )
             continue
 
-        # Convert telegram_id to int if it's a string number
-        try:
-            telegram_id_int = int(telegram_id)
-        except (ValueError, TypeError):
-            logger.error(
-                f"❌ Invalid telegram_id format: {telegram_id} for assignee_id: {assignee_id}"
-            )
-            continue
-
-        # Format message for the assignee
-        message = (
-            f"👤 <b>Sizga task berildi</b>\n\n"
-            f"📋 <b>Task:</b> {task_name}\n"
-            f"📂 <b>List:</b> {list_name}\n"
-        )
+        recipients.append(Recipient(chat_id=telegram_id, name=assignee_name))
 
-        if task_url:
-            message += f"\n🔗 <a href='{task_url}'>Taskni ko'rish</a>"
+    if not recipients:
+        return
 
-        # Send message to the assignee's Telegram
-        success = send_message(telegram_id_int, message)
-        if success:
-            logger.info(
-                f"✅ Message sent to {assignee_name} (Telegram ID: {telegram_id_int}) for task {event.task_id}"
-            )
-        else:
-            logger.error(
-                f"❌ Failed to send message to Telegram ID {telegram_id_int} for assignee_id {assignee_id}"
-            )
+    # Format message for the assignees
+    message = (
+        f"👤 <b>Sizga task berildi</b>\n\n"
+        f"📋 <b>Task:</b> {task_name}\n"
+        f"📂 <b>List:</b> {list_name}\n"
+    )
+
+    if task_url:
+        message += f"\n🔗 <a href='{task_url}'>Taskni ko'rish</a>"
+
+    # Send message to all assignees concurrently
+    results = await fan_out(
+        recipients,
+        lambda recipient: Notification(message),
+        idempotency_key=IdempotencyKey.from_event(
+            "notify_admin_on_assignee_change", event
+        ),
+    )
+    log_delivery_results(results, event.task_id)
@@ -0,0 +1,63 @@
+"""
+Staff directory lookup: ClickUp assignee ID -> Telegram chat ID.
+"""
+
+from typing import Any, Dict, List
+
+from config.settings import get_settings
+from core.clickup_client import get_clickup_client
+from core.logging_config import get_logger
+from core.notifications import normalize_chat_id
+from core.task_mirror import get_task_mirror
+from utils.get_curstom_field_value import get_custom_field_value
+
+logger = get_logger(__name__)
+
+# "stuffs-extra-datas" list: one task per member with assignee_id and telegram_id
+STAFF_DIRECTORY_LIST_ID = "901413862325"
+ASSIGNEE_ID_FIELD = "assignee_id"
+TELEGRAM_ID_FIELD = "telegram_id"
+
+
+async def get_directory_tasks() -> List[Dict[str, Any]]:
+    """
+    Get all tasks of the staff directory list.
+
+    Returns:
+        Directory tasks (from the task mirror when the list is mirrored, else
+        from the configured directory view, else from the whole list)
+    """
+    mirror = get_task_mirror()
+    if mirror is not None and STAFF_DIRECTORY_LIST_ID in mirror.list_ids:
+        return list(mirror.iter_tasks(STAFF_DIRECTORY_LIST_ID))
+
+    clickup_client = get_clickup_client()
+    view_id = get_settings().STAFF_DIRECTORY_VIEW_ID
+    if view_id:
+        return [task async for task in clickup_client.views.iter_view_tasks(view_id)]
+
+    return [
+        task
+        async for task in clickup_client.tasks.iter_tasks(
+            list_id=STAFF_DIRECTORY_LIST_ID
+        )
+    ]
+
+
+async def load_telegram_directory() -> Dict[str, Any]:
+    """
+    Build assignee ID -> Telegram chat ID mapping in one pass.
+
+    Returns:
+        Mapping of ClickUp user ID (as string) to normalized chat ID
+    """
+    directory: Dict[str, Any] = {}
+    for task in await get_directory_tasks():
+        assignee_id = get_custom_field_value(task, ASSIGNEE_ID_FIELD)
+        telegram_id = get_custom_field_value(task, TELEGRAM_ID_FIELD)
+        if assignee_id is None or not telegram_id:
+            continue
+        directory.setdefault(str(assignee_id), normalize_chat_id(telegram_id))
+
+    logger.debug("Loaded %s telegram directory entries", len(directory))
+    return directory
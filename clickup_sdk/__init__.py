@@ -2,9 +2,27 @@
 ClickUp SDK - Python library for ClickUp API v2
 Similar to aiogram style for easy usage
 """
-from .client import ClickUp
+from .client import ClickUp, RequestCounter
+from .rate_limiter import RateLimiter
 from .webhook import WebhookDispatcher, WebhookServer, WebhookEvent
+from .sync import TaskSyncEngine, TaskChange, CursorStore, JsonCursorStore
+from .write_queue import TaskWriteQueue, WriteQueueMetrics
+from .hierarchy import HierarchySnapshot
 
 __version__ = "1.0.0"
-__all__ = ["ClickUp", "WebhookDispatcher", "WebhookServer", "WebhookEvent"]
+__all__ = [
+    "ClickUp",
+    "RequestCounter",
+    "RateLimiter",
+    "WebhookDispatcher",
+    "WebhookServer",
+    "WebhookEvent",
+    "TaskSyncEngine",
+    "TaskChange",
+    "CursorStore",
+    "JsonCursorStore",
+    "TaskWriteQueue",
+    "WriteQueueMetrics",
+    "HierarchySnapshot",
+]
 
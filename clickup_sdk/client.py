@@ -3,9 +3,51 @@ ClickUp API Client - Main client class similar to aiogram style
 """
 
 import aiohttp
-from typing import Optional, Dict, Any, List
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List, Tuple
 from urllib.parse import urlencode
 
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Statuses retried for every method (the request was not processed)
+RETRY_STATUSES = {429}
+# Statuses retried only for idempotent methods
+RETRY_IDEMPOTENT_STATUSES = {502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "PUT", "DELETE"}
+# Longest wait between two attempts, in seconds
+MAX_RETRY_DELAY = 60.0
+
+# Request counters active in the current context (see ClickUp.count_requests)
+_request_counters: ContextVar[Tuple["RequestCounter", ...]] = ContextVar(
+    "clickup_request_counters", default=()
+)
+
+
+class RequestCounter:
+    """
+    Counts the API requests sent inside a `with` block.
+
+    Requests of tasks started inside the block (e.g. by asyncio.gather) are
+    counted too; requests of unrelated concurrent tasks are not.
+    """
+
+    def __init__(self):
+        """Initialize request counter"""
+        self.count = 0
+        self._token = None
+
+    def __enter__(self) -> "RequestCounter":
+        self._token = _request_counters.set(_request_counters.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _request_counters.reset(self._token)
+
 
 class ClickUp:
     """
@@ -18,15 +60,35 @@ class ClickUp:
 
     BASE_URL = "https://api.clickup.com/api"
 
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        max_concurrent_requests: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        max_retries: int = 0,
+        retry_backoff: float = 1.0,
+    ):
         """
         Initialize ClickUp client.
 
         Args:
             token: ClickUp API token (Personal API Token or OAuth access token)
+            max_concurrent_requests: Maximum requests in flight (None for no limit)
+            requests_per_minute: Client-side request rate limit (None for no limit)
+            max_retries: Retries of rate limited (429) requests, and of idempotent
+                requests failing with 502/503/504
+            retry_backoff: First retry delay in seconds (doubled on every retry)
+                when the response does not say when to retry
         """
         self.token = token
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self._session: Optional[aiohttp.ClientSession] = None
+        self._rate_limiter: Optional[RateLimiter] = None
+        if max_concurrent_requests or requests_per_minute:
+            self._rate_limiter = RateLimiter(max_concurrent_requests, requests_per_minute)
+        # Number of API requests sent by this client
+        self.request_count = 0
 
         # Initialize handlers
         from .handlers import (
@@ -42,6 +104,7 @@ class ClickUp:
             WebhooksHandler,
             UsersHandler,
             TeamsHandler,
+            ViewsHandler,
         )
 
         self.tasks = TasksHandler(self)
@@ -56,6 +119,7 @@ class ClickUp:
         self.webhooks = WebhooksHandler(self)
         self.users = UsersHandler(self)
         self.teams = TeamsHandler(self)
+        self.views = ViewsHandler(self)
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
@@ -87,6 +151,20 @@ class ClickUp:
         """Async context manager exit."""
         await self.close()
 
+    def count_requests(self) -> RequestCounter:
+        """
+        Count the requests of a block of code.
+
+        Usage:
+            with clickup.count_requests() as counter:
+                await clickup.tasks.get_task("task_id")
+            print(counter.count)
+
+        Returns:
+            RequestCounter context manager
+        """
+        return RequestCounter()
+
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with authentication."""
         return {"Authorization": self.token, "Content-Type": "application/json"}
@@ -127,8 +205,72 @@ class ClickUp:
             params = {k: v for k, v in params.items() if v is not None}
             url += f"?{urlencode(params, doseq=True)}"
 
+        attempt = 0
+        while True:
+            try:
+                if self._rate_limiter is not None:
+                    async with self._rate_limiter:
+                        return await self._send(
+                            session, method, url, request_headers, json_data, data
+                        )
+                return await self._send(session, method, url, request_headers, json_data, data)
+            except aiohttp.ClientResponseError as e:
+                # Form data bodies cannot be sent twice
+                if attempt >= self.max_retries or data is not None:
+                    raise
+                if e.status not in RETRY_STATUSES and not (
+                    e.status in RETRY_IDEMPOTENT_STATUSES and method in IDEMPOTENT_METHODS
+                ):
+                    raise
+                delay = self._retry_delay(attempt, e.headers)
+                attempt += 1
+                logger.warning(
+                    f"{method} {endpoint} failed with {e.status}, "
+                    f"retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                )
+                # Sleep outside the rate limiter so other requests can proceed
+                await asyncio.sleep(delay)
+
+    def _retry_delay(self, attempt: int, headers: Optional[Any]) -> float:
+        """
+        Get the wait before the next attempt.
+
+        Uses Retry-After or ClickUp's X-RateLimit-Reset (Unix seconds) when the
+        response has them, exponential backoff otherwise.
+
+        Args:
+            attempt: Number of retries made so far
+            headers: Headers of the failed response
+
+        Returns:
+            Delay in seconds
+        """
+        delay = self.retry_backoff * 2 ** attempt
+        headers = headers or {}
+        try:
+            if headers.get("Retry-After"):
+                delay = float(headers["Retry-After"])
+            elif headers.get("X-RateLimit-Reset"):
+                delay = float(headers["X-RateLimit-Reset"]) - time.time()
+        except ValueError:
+            pass
+        return min(max(delay, 0.0), MAX_RETRY_DELAY)
+
+    async def _send(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        json_data: Optional[Dict[str, Any]],
+        data: Optional[Any],
+    ) -> Dict[str, Any]:
+        """Send one HTTP request and decode the response."""
+        self.request_count += 1
+        for counter in _request_counters.get():
+            counter.count += 1
         async with session.request(
-            method=method, url=url, headers=request_headers, json=json_data, data=data
+            method=method, url=url, headers=headers, json=json_data, data=data
         ) as response:
             response.raise_for_status()
             return await response.json()
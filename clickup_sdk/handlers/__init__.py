@@ -11,6 +11,7 @@ from .time_entries import TimeEntriesHandler
 from .webhooks import WebhooksHandler
 from .users import UsersHandler
 from .teams import TeamsHandler
+from .views import ViewsHandler
 
 __all__ = [
     "TasksHandler",
@@ -25,5 +26,6 @@ __all__ = [
     "WebhooksHandler",
     "UsersHandler",
     "TeamsHandler",
+    "ViewsHandler",
 ]
 
@@ -96,6 +96,35 @@ class ListsHandler(BaseHandler):
         
         return await self.client.get(f"/v2/folder/{folder_id}/list", params=params)
     
+    async def get_folderless_lists(self, space_id: str, archived: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Get lists of a space that are not in any folder.
+        
+        Args:
+            space_id: Space ID
+            archived: Include archived lists
+            
+        Returns:
+            Lists data
+        """
+        params = {}
+        if archived is not None:
+            params["archived"] = archived
+        
+        return await self.client.get(f"/v2/space/{space_id}/list", params=params)
+    
+    async def get_list_members(self, list_id: str) -> Dict[str, Any]:
+        """
+        Get workspace members who have access to a list.
+        
+        Args:
+            list_id: List ID
+            
+        Returns:
+            Members data
+        """
+        return await self.client.get(f"/v2/list/{list_id}/member")
+    
     async def create_list(
         self,
         folder_id: Optional[str] = None,
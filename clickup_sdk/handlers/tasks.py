@@ -1,7 +1,14 @@
 """Tasks API Handler"""
-from typing import Optional, Dict, Any, List
+import asyncio
+import json
+from typing import Optional, Dict, Any, List, AsyncIterator
 from .base import BaseHandler
 
+# ClickUp returns at most 100 tasks per page
+TASKS_PAGE_SIZE = 100
+# bulk_time_in_status accepts at most 100 task IDs per request
+BULK_TIME_IN_STATUS_MAX_IDS = 100
+
 
 class TasksHandler(BaseHandler):
     """Handler for Task-related API endpoints."""
@@ -181,7 +188,8 @@ class TasksHandler(BaseHandler):
             date_created_lt: Created date less than (Unix timestamp)
             date_updated_gt: Updated date greater than (Unix timestamp)
             date_updated_lt: Updated date less than (Unix timestamp)
-            custom_fields: Custom field filters
+            custom_fields: Custom field filters, e.g.
+                [{"field_id": "...", "operator": "IS NOT NULL"}]
             
         Returns:
             Tasks data
@@ -225,10 +233,67 @@ class TasksHandler(BaseHandler):
         if date_updated_lt is not None:
             params["date_updated_lt"] = date_updated_lt
         if custom_fields is not None:
-            params["custom_fields"] = custom_fields
+            # ClickUp expects the filter list as a JSON encoded string
+            params["custom_fields"] = json.dumps(custom_fields)
         
         return await self.client.get(endpoint, params=params)
     
+    async def iter_tasks(self, **filters: Any) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all tasks matching the filters, page by page.
+        
+        Args:
+            **filters: Any get_tasks argument except page
+            
+        Yields:
+            Task data
+        """
+        filters.pop("page", None)
+        page = 0
+        while True:
+            data = await self.get_tasks(page=page, **filters)
+            tasks = data.get("tasks", [])
+            for task in tasks:
+                yield task
+            last_page = data.get("last_page")
+            if last_page is None:
+                last_page = len(tasks) < TASKS_PAGE_SIZE
+            if not tasks or last_page:
+                break
+            page += 1
+    
+    async def fetch_all_tasks(self, concurrency: int = 4, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Fetch all tasks matching the filters, requesting pages in parallel.
+        
+        Pages are requested in waves of `concurrency` pages until a wave
+        contains the last page, so a few pages past the end may be requested.
+        
+        Args:
+            concurrency: Pages requested at the same time
+            **filters: Any get_tasks argument except page
+            
+        Returns:
+            Tasks in page order
+        """
+        filters.pop("page", None)
+        tasks: List[Dict[str, Any]] = []
+        page = 0
+        while True:
+            responses = await asyncio.gather(*(
+                self.get_tasks(page=page + offset, **filters)
+                for offset in range(concurrency)
+            ))
+            for data in responses:
+                page_tasks = data.get("tasks", [])
+                tasks.extend(page_tasks)
+                last_page = data.get("last_page")
+                if last_page is None:
+                    last_page = len(page_tasks) < TASKS_PAGE_SIZE
+                if not page_tasks or last_page:
+                    return tasks
+            page += concurrency
+    
     async def create_task(
         self,
         list_id: str,
@@ -322,6 +387,53 @@ class TasksHandler(BaseHandler):
         """Get time in status for a task."""
         return await self.client.get(f"/v2/task/{task_id}/time_in_status")
     
+    async def get_bulk_time_in_status(
+        self,
+        task_ids: List[str],
+        custom_task_ids: Optional[bool] = None,
+        team_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Get time in status for many tasks.
+        
+        IDs are split into chunks of 100 (the API maximum) which are
+        requested concurrently; the client's rate limiter paces them.
+        
+        Args:
+            task_ids: Task IDs (any number, duplicates are ignored)
+            custom_task_ids: If true, task_ids are custom task IDs
+            team_id: Team ID (required if custom_task_ids is true)
+            
+        Returns:
+            Mapping of task ID to its time in status data
+        """
+        unique_ids = list(dict.fromkeys(task_ids))
+        if not unique_ids:
+            return {}
+        
+        params: Dict[str, Any] = {}
+        if custom_task_ids is not None:
+            params["custom_task_ids"] = custom_task_ids
+        if team_id is not None:
+            params["team_id"] = team_id
+        
+        chunks = [
+            unique_ids[i:i + BULK_TIME_IN_STATUS_MAX_IDS]
+            for i in range(0, len(unique_ids), BULK_TIME_IN_STATUS_MAX_IDS)
+        ]
+        responses = await asyncio.gather(*(
+            self.client.get(
+                "/v2/task/bulk_time_in_status/task_ids",
+                params={**params, "task_ids": chunk},
+            )
+            for chunk in chunks
+        ))
+        
+        result: Dict[str, Any] = {}
+        for response in responses:
+            result.update(response)
+        return result
+    
     async def merge_tasks(
         self,
         task_id: str,
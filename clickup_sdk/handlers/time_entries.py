@@ -1,7 +1,33 @@
 """Time Entries API Handler"""
-from typing import Optional, Dict, Any, List
+import asyncio
+from collections import deque
+from typing import Optional, Dict, Any, List, AsyncIterator, Deque, Tuple
 from .base import BaseHandler
 
+HOUR_MS = 60 * 60 * 1000
+DAY_MS = 24 * HOUR_MS
+
+# Adaptive window defaults for iter_time_entries
+DEFAULT_WINDOW_MS = 7 * DAY_MS
+MIN_WINDOW_MS = HOUR_MS
+MAX_WINDOW_MS = 31 * DAY_MS
+TARGET_ENTRIES_PER_WINDOW = 500
+
+
+def _entry_start(entry: Dict[str, Any]) -> int:
+    try:
+        return int(entry.get("start") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _entry_end(entry: Dict[str, Any]) -> Optional[int]:
+    """End timestamp, or None while the timer is still running"""
+    try:
+        return int(entry["end"]) if entry.get("end") else None
+    except (TypeError, ValueError):
+        return None
+
 
 class TimeEntriesHandler(BaseHandler):
     """Handler for Time Entry-related API endpoints."""
@@ -59,6 +85,123 @@ class TimeEntriesHandler(BaseHandler):
         
         return await self.client.get(f"/v2/team/{team_id}/time_entries", params=params)
     
+    async def iter_time_entries(
+        self,
+        team_id: int,
+        start_date: int,
+        end_date: int,
+        assignees: Optional[List[str]] = None,
+        window: int = DEFAULT_WINDOW_MS,
+        min_window: int = MIN_WINDOW_MS,
+        max_window: int = MAX_WINDOW_MS,
+        target_entries: int = TARGET_ENTRIES_PER_WINDOW,
+        concurrency: int = 4,
+        **filters: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream time entries of a long date range in chronological order.
+        
+        The range is split into time windows that are fetched concurrently
+        (up to `concurrency` windows ahead). Window size adapts to entry
+        density: it halves after a window with more than `target_entries`
+        entries and doubles after a sparse one. A window that times out is
+        split in half and retried. Entries that span window boundaries are
+        yielded once.
+        
+        Args:
+            team_id: Team ID
+            start_date: Start date (Unix timestamp in milliseconds)
+            end_date: End date (Unix timestamp in milliseconds)
+            assignees: User IDs fetched as separate shards per window
+            window: Initial window size in milliseconds
+            min_window: Smallest window size in milliseconds
+            max_window: Largest window size in milliseconds
+            target_entries: Desired number of entries per window
+            concurrency: Number of windows fetched at the same time
+            **filters: Other get_time_entries filters (space_id, list_id, ...)
+            
+        Yields:
+            Time entry data, ordered by start time
+        """
+        shards: List[Optional[str]] = list(assignees) if assignees else [None]
+        pending: Deque[Tuple[int, asyncio.Task]] = deque()
+        # Entries that may still show up again in a later window: id -> end
+        open_entries: Dict[str, Optional[int]] = {}
+        cursor = start_date
+        size = window
+        
+        def schedule():
+            nonlocal cursor
+            window_end = min(cursor + size, end_date)
+            fetch = asyncio.ensure_future(
+                self._fetch_window(team_id, cursor, window_end, shards, min_window, filters)
+            )
+            pending.append((window_end, fetch))
+            cursor = window_end
+        
+        try:
+            while cursor < end_date or pending:
+                while cursor < end_date and len(pending) < concurrency:
+                    schedule()
+                
+                window_end, fetch = pending.popleft()
+                entries = await fetch
+                
+                if len(entries) > target_entries:
+                    size = max(min_window, size // 2)
+                elif len(entries) < target_entries // 4:
+                    size = min(max_window, size * 2)
+                
+                for entry in sorted(entries, key=_entry_start):
+                    entry_id = str(entry.get("id"))
+                    if entry_id in open_entries:
+                        continue
+                    open_entries[entry_id] = _entry_end(entry)
+                    yield entry
+                
+                # Entries that ended before this window's end cannot repeat
+                open_entries = {
+                    entry_id: end
+                    for entry_id, end in open_entries.items()
+                    if end is None or end >= window_end
+                }
+        finally:
+            for _, fetch in pending:
+                fetch.cancel()
+    
+    async def _fetch_window(
+        self,
+        team_id: int,
+        start_date: int,
+        end_date: int,
+        shards: List[Optional[str]],
+        min_window: int,
+        filters: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Fetch all shards of one window, splitting it in half on timeout"""
+        try:
+            responses = await asyncio.gather(*(
+                self.get_time_entries(
+                    team_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    assignee=shard,
+                    **filters
+                )
+                for shard in shards
+            ))
+        except asyncio.TimeoutError:
+            if end_date - start_date <= min_window:
+                raise
+            middle = (start_date + end_date) // 2
+            halves = await asyncio.gather(
+                self._fetch_window(team_id, start_date, middle, shards, min_window, filters),
+                self._fetch_window(team_id, middle, end_date, shards, min_window, filters),
+            )
+            return halves[0] + halves[1]
+        
+        return [entry for response in responses for entry in response.get("data", [])]
+    
     async def create_time_entry(
         self,
         team_id: int,
@@ -0,0 +1,145 @@
+"""Views API Handler"""
+import asyncio
+from collections import deque
+from typing import Dict, Any, AsyncIterator, Deque
+from .base import BaseHandler
+
+# ClickUp returns at most 30 tasks per view page
+VIEW_TASKS_PAGE_SIZE = 30
+
+
+class ViewsHandler(BaseHandler):
+    """Handler for View-related API endpoints."""
+
+    async def get_team_views(self, team_id: int) -> Dict[str, Any]:
+        """
+        Get Workspace (Everything level) views.
+
+        Args:
+            team_id: Team ID (Workspace ID)
+
+        Returns:
+            Views data
+        """
+        return await self.client.get(f"/v2/team/{team_id}/view")
+
+    async def get_space_views(self, space_id: str) -> Dict[str, Any]:
+        """
+        Get views of a space.
+
+        Args:
+            space_id: Space ID
+
+        Returns:
+            Views data
+        """
+        return await self.client.get(f"/v2/space/{space_id}/view")
+
+    async def get_folder_views(self, folder_id: str) -> Dict[str, Any]:
+        """
+        Get views of a folder.
+
+        Args:
+            folder_id: Folder ID
+
+        Returns:
+            Views data
+        """
+        return await self.client.get(f"/v2/folder/{folder_id}/view")
+
+    async def get_list_views(self, list_id: str) -> Dict[str, Any]:
+        """
+        Get views of a list.
+
+        Args:
+            list_id: List ID
+
+        Returns:
+            Views data
+        """
+        return await self.client.get(f"/v2/list/{list_id}/view")
+
+    async def get_view(self, view_id: str) -> Dict[str, Any]:
+        """
+        Get a view.
+
+        Args:
+            view_id: View ID
+
+        Returns:
+            View data
+        """
+        return await self.client.get(f"/v2/view/{view_id}")
+
+    async def delete_view(self, view_id: str) -> Dict[str, Any]:
+        """
+        Delete a view.
+
+        Args:
+            view_id: View ID
+
+        Returns:
+            Deletion response
+        """
+        return await self.client.delete(f"/v2/view/{view_id}")
+
+    async def get_view_tasks(self, view_id: str, page: int = 0) -> Dict[str, Any]:
+        """
+        Get one page of tasks of a view (filtered by the view on ClickUp's side).
+
+        Args:
+            view_id: View ID
+            page: Page number (starts at 0)
+
+        Returns:
+            Tasks data with "tasks" and "last_page"
+        """
+        return await self.client.get(f"/v2/view/{view_id}/task", params={"page": page})
+
+    async def iter_view_tasks(
+        self,
+        view_id: str,
+        prefetch: int = 1
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all tasks of a view, page by page.
+
+        While the caller consumes a page, the next `prefetch` pages are
+        already being requested.
+
+        Args:
+            view_id: View ID
+            prefetch: Number of pages requested ahead (0 to fetch on demand)
+
+        Yields:
+            Task data
+        """
+        fetches: Deque[asyncio.Task] = deque()
+        next_page = 0
+
+        def schedule():
+            nonlocal next_page
+            fetches.append(asyncio.ensure_future(self.get_view_tasks(view_id, next_page)))
+            next_page += 1
+
+        try:
+            schedule()
+            while fetches:
+                response = await fetches.popleft()
+                tasks = response.get("tasks", [])
+                last_page = response.get("last_page", len(tasks) < VIEW_TASKS_PAGE_SIZE)
+                if not last_page:
+                    while len(fetches) < prefetch:
+                        schedule()
+
+                for task in tasks:
+                    yield task
+
+                if last_page:
+                    break
+                if not fetches:
+                    schedule()
+        finally:
+            # Pages requested past the last one are not needed
+            for fetch in fetches:
+                fetch.cancel()
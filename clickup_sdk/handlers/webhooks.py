@@ -27,7 +27,7 @@ class WebhooksHandler(BaseHandler):
         self,
         team_id: int,
         endpoint: str,
-        client_id: str,
+        client_id: Optional[str],
         events: List[str],
         space_id: Optional[str] = None,
         list_id: Optional[str] = None,
@@ -40,7 +40,7 @@ class WebhooksHandler(BaseHandler):
         Args:
             team_id: Team ID
             endpoint: Webhook endpoint URL
-            client_id: OAuth client ID
+            client_id: OAuth client ID (None for personal API tokens)
             events: List of event types to subscribe to
             space_id: Filter by space ID (optional)
             list_id: Filter by list ID (optional)
@@ -52,9 +52,10 @@ class WebhooksHandler(BaseHandler):
         """
         data = {
             "endpoint": endpoint,
-            "client_id": client_id,
             "events": events
         }
+        if client_id is not None:
+            data["client_id"] = client_id
         if space_id is not None:
             data["space_id"] = space_id
         if list_id is not None:
@@ -66,6 +67,35 @@ class WebhooksHandler(BaseHandler):
         
         return await self.client.post(f"/v2/team/{team_id}/webhook", json_data=data)
     
+    async def update_webhook(
+        self,
+        webhook_id: str,
+        endpoint: Optional[str] = None,
+        events: Optional[List[str]] = None,
+        status: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Update a webhook in place.
+        
+        Args:
+            webhook_id: Webhook ID
+            endpoint: New endpoint URL (optional)
+            events: New list of event types (optional)
+            status: New status, "active" or "inactive" (optional)
+            
+        Returns:
+            Updated webhook data
+        """
+        data: Dict[str, Any] = {}
+        if endpoint is not None:
+            data["endpoint"] = endpoint
+        if events is not None:
+            data["events"] = events
+        if status is not None:
+            data["status"] = status
+        
+        return await self.client.put(f"/v2/webhook/{webhook_id}", json_data=data)
+    
     async def delete_webhook(self, webhook_id: str) -> Dict[str, Any]:
         """
         Delete a webhook.
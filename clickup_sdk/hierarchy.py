@@ -0,0 +1,315 @@
+"""Workspace hierarchy snapshot: spaces, folders and lists with parent indexes"""
+from typing import Optional, Dict, Any, List, Awaitable
+from pathlib import Path
+import asyncio
+import json
+import logging
+import time
+
+from .client import ClickUp
+from .webhook.dispatcher import WebhookDispatcher
+from .webhook.events import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+SPACE_EVENTS = ("spaceCreated", "spaceUpdated", "spaceDeleted")
+FOLDER_EVENTS = ("folderCreated", "folderUpdated", "folderDeleted")
+LIST_EVENTS = ("listCreated", "listUpdated", "listDeleted")
+
+
+def _node(data: Dict[str, Any], **parents: Optional[str]) -> Dict[str, Any]:
+    """Keep the fields of a space, folder or list the snapshot needs"""
+    return {
+        "id": str(data["id"]),
+        "name": data.get("name"),
+        "archived": bool(data.get("archived", False)),
+        **parents,
+    }
+
+
+def _parent_id(data: Dict[str, Any], key: str) -> Optional[str]:
+    """ID of an embedded parent object (e.g. list["folder"]["id"])"""
+    parent = data.get(key) or {}
+    return str(parent["id"]) if parent.get("id") is not None else None
+
+
+class HierarchySnapshot:
+    """
+    In-memory tree of the spaces, folders and lists of a team.
+
+    The tree is crawled concurrently (spaces, then their folders and
+    folderless lists) under a request limit, can be saved to a JSON file
+    for warm starts, and patches itself on space/folder/list webhook events.
+
+    Usage:
+        snapshot = HierarchySnapshot(clickup, team_id, path="data/hierarchy.json")
+        if not snapshot.load(max_age=3600):
+            await snapshot.refresh()
+        snapshot.register(dispatcher)
+
+        space_id, folder_id = snapshot.resolve_list("901413862325")
+    """
+
+    def __init__(
+        self,
+        client: ClickUp,
+        team_id: Any,
+        concurrency: int = 4,
+        path: Optional[str] = None
+    ):
+        """
+        Initialize hierarchy snapshot.
+
+        Args:
+            client: ClickUp client
+            team_id: Team ID (Workspace ID)
+            concurrency: Maximum crawl requests in flight
+            path: JSON file the snapshot is saved to (None to keep it in memory)
+        """
+        self.client = client
+        self.team_id = str(team_id)
+        self.concurrency = concurrency
+        self.path = Path(path) if path else None
+        self.crawled_at: Optional[float] = None
+        self._spaces: Dict[str, Dict[str, Any]] = {}
+        self._folders: Dict[str, Dict[str, Any]] = {}
+        self._lists: Dict[str, Dict[str, Any]] = {}
+
+    # Queries
+
+    def get_space(self, space_id: str) -> Optional[Dict[str, Any]]:
+        """Space node ({"id", "name", "archived"})"""
+        return self._spaces.get(str(space_id))
+
+    def get_folder(self, folder_id: str) -> Optional[Dict[str, Any]]:
+        """Folder node ({"id", "name", "archived", "space_id"})"""
+        return self._folders.get(str(folder_id))
+
+    def get_list(self, list_id: str) -> Optional[Dict[str, Any]]:
+        """List node ({"id", "name", "archived", "space_id", "folder_id"})"""
+        return self._lists.get(str(list_id))
+
+    def resolve_list(self, list_id: str) -> tuple:
+        """
+        Resolve a list to its parents.
+
+        Args:
+            list_id: List ID
+
+        Returns:
+            (space_id, folder_id); folder_id is None for folderless lists and
+            both are None for unknown lists
+        """
+        node = self.get_list(list_id)
+        if node is None:
+            return None, None
+        return node["space_id"], node["folder_id"]
+
+    def space_ids(self) -> List[str]:
+        """IDs of all spaces"""
+        return list(self._spaces)
+
+    def folder_ids(self, space_id: Optional[str] = None) -> List[str]:
+        """
+        IDs of folders, optionally of one space.
+
+        Args:
+            space_id: Space ID (None for all folders)
+        """
+        return [
+            folder_id for folder_id, node in self._folders.items()
+            if space_id is None or node["space_id"] == str(space_id)
+        ]
+
+    def list_ids(
+        self,
+        space_id: Optional[str] = None,
+        folder_id: Optional[str] = None
+    ) -> List[str]:
+        """
+        IDs of lists, optionally of one space or folder.
+
+        Args:
+            space_id: Space ID (includes lists of its folders)
+            folder_id: Folder ID
+
+        Returns:
+            List IDs
+        """
+        return [
+            list_id for list_id, node in self._lists.items()
+            if (space_id is None or node["space_id"] == str(space_id))
+            and (folder_id is None or node["folder_id"] == str(folder_id))
+        ]
+
+    # Crawl
+
+    async def refresh(self) -> None:
+        """Crawl the whole hierarchy and replace the snapshot"""
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def limited(call: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await call
+
+        spaces: Dict[str, Dict[str, Any]] = {}
+        folders: Dict[str, Dict[str, Any]] = {}
+        lists: Dict[str, Dict[str, Any]] = {}
+
+        async def crawl_folder(folder: Dict[str, Any], space_id: str):
+            folder_id = str(folder["id"])
+            folders[folder_id] = _node(folder, space_id=space_id)
+            # Folders usually come with their lists embedded
+            folder_lists = folder.get("lists")
+            if folder_lists is None:
+                response = await limited(self.client.lists.get_lists(folder_id))
+                folder_lists = response.get("lists", [])
+            for item in folder_lists:
+                lists[str(item["id"])] = _node(item, space_id=space_id, folder_id=folder_id)
+
+        async def crawl_space(space: Dict[str, Any]):
+            space_id = str(space["id"])
+            spaces[space_id] = _node(space)
+            folders_response, lists_response = await asyncio.gather(
+                limited(self.client.folders.get_folders(space_id)),
+                limited(self.client.lists.get_folderless_lists(space_id)),
+            )
+            for item in lists_response.get("lists", []):
+                lists[str(item["id"])] = _node(item, space_id=space_id, folder_id=None)
+            await asyncio.gather(*(
+                crawl_folder(folder, space_id)
+                for folder in folders_response.get("folders", [])
+            ))
+
+        response = await limited(self.client.spaces.get_spaces(int(self.team_id)))
+        await asyncio.gather(*(crawl_space(space) for space in response.get("spaces", [])))
+
+        self._spaces, self._folders, self._lists = spaces, folders, lists
+        self.crawled_at = time.time()
+        logger.info(
+            f"Crawled {len(spaces)} space(s), {len(folders)} folder(s) and "
+            f"{len(lists)} list(s) in {time.monotonic() - started:.1f}s"
+        )
+        self.save()
+
+    # Persistence
+
+    def save(self) -> None:
+        """Write the snapshot to its JSON file (no-op without a path)"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            "team_id": self.team_id,
+            "crawled_at": self.crawled_at,
+            "spaces": list(self._spaces.values()),
+            "folders": list(self._folders.values()),
+            "lists": list(self._lists.values()),
+        }))
+        tmp_path.replace(self.path)
+
+    def load(self, max_age: Optional[float] = None) -> bool:
+        """
+        Load the snapshot from its JSON file.
+
+        Args:
+            max_age: Ignore snapshots crawled more than this many seconds ago
+
+        Returns:
+            True if a usable snapshot was loaded
+        """
+        if self.path is None or not self.path.exists():
+            return False
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable hierarchy snapshot {self.path}: {e}")
+            return False
+
+        crawled_at = data.get("crawled_at")
+        if data.get("team_id") != self.team_id or crawled_at is None:
+            return False
+        if max_age is not None and time.time() - crawled_at > max_age:
+            return False
+
+        self._spaces = {node["id"]: node for node in data.get("spaces", [])}
+        self._folders = {node["id"]: node for node in data.get("folders", [])}
+        self._lists = {node["id"]: node for node in data.get("lists", [])}
+        self.crawled_at = crawled_at
+        logger.info(f"Loaded hierarchy snapshot with {len(self._lists)} list(s) from {self.path}")
+        return True
+
+    # Webhook patches
+
+    def _remove_folder(self, folder_id: str):
+        self._folders.pop(folder_id, None)
+        for list_id in self.list_ids(folder_id=folder_id):
+            del self._lists[list_id]
+
+    def _remove_space(self, space_id: str):
+        self._spaces.pop(space_id, None)
+        for folder_id in self.folder_ids(space_id):
+            del self._folders[folder_id]
+        for list_id in self.list_ids(space_id=space_id):
+            del self._lists[list_id]
+
+    async def handle_space_event(self, event: WebhookEvent) -> None:
+        """Patch the snapshot on spaceCreated/Updated/Deleted"""
+        space_id = str((event.raw or {}).get("space_id") or "")
+        if not space_id:
+            return
+        if event.event == "spaceDeleted":
+            self._remove_space(space_id)
+        else:
+            space = await self.client.spaces.get_space(space_id)
+            self._spaces[space_id] = _node(space)
+        self.save()
+
+    async def handle_folder_event(self, event: WebhookEvent) -> None:
+        """Patch the snapshot on folderCreated/Updated/Deleted"""
+        folder_id = str((event.raw or {}).get("folder_id") or "")
+        if not folder_id:
+            return
+        if event.event == "folderDeleted":
+            self._remove_folder(folder_id)
+        else:
+            folder = await self.client.folders.get_folder(folder_id)
+            space_id = _parent_id(folder, "space")
+            self._folders[folder_id] = _node(folder, space_id=space_id)
+            for item in folder.get("lists", []):
+                self._lists[str(item["id"])] = _node(item, space_id=space_id, folder_id=folder_id)
+        self.save()
+
+    async def handle_list_event(self, event: WebhookEvent) -> None:
+        """Patch the snapshot on listCreated/Updated/Deleted"""
+        list_id = str((event.raw or {}).get("list_id") or "")
+        if not list_id:
+            return
+        if event.event == "listDeleted":
+            self._lists.pop(list_id, None)
+        else:
+            # Also picks up lists moved to another folder
+            data = await self.client.lists.get_list(list_id)
+            folder = data.get("folder") or {}
+            # Folderless lists report a hidden folder
+            folder_id = None if folder.get("hidden") else _parent_id(data, "folder")
+            self._lists[list_id] = _node(
+                data, space_id=_parent_id(data, "space"), folder_id=folder_id
+            )
+        self.save()
+
+    def register(self, dispatcher: WebhookDispatcher) -> None:
+        """
+        Register webhook handlers that keep the snapshot current.
+
+        Args:
+            dispatcher: Webhook dispatcher
+        """
+        for event_type in SPACE_EVENTS:
+            dispatcher.register_handler(event_type, self.handle_space_event)
+        for event_type in FOLDER_EVENTS:
+            dispatcher.register_handler(event_type, self.handle_folder_event)
+        for event_type in LIST_EVENTS:
+            dispatcher.register_handler(event_type, self.handle_list_event)
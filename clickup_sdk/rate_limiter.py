@@ -0,0 +1,75 @@
+"""Client-side rate limiter for ClickUp API requests"""
+from typing import Optional
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Limits concurrent requests and requests per minute.
+
+    The per-minute limit is a token bucket refilled continuously, so bursts
+    up to the limit are allowed and the long-run rate never exceeds it.
+
+    Usage:
+        limiter = RateLimiter(max_concurrent=10, requests_per_minute=100)
+        async with limiter:
+            await session.get(...)
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        requests_per_minute: Optional[int] = None
+    ):
+        """
+        Initialize rate limiter.
+
+        Args:
+            max_concurrent: Maximum requests in flight (None for no limit)
+            requests_per_minute: Maximum request rate (None for no limit)
+        """
+        self.max_concurrent = max_concurrent
+        self.requests_per_minute = requests_per_minute
+        self._semaphore = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+        self._capacity = float(requests_per_minute or 0)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        rate = self._capacity / 60
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        """Wait for a free slot and a rate token"""
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        if not self._capacity:
+            return
+
+        try:
+            # Waiters take tokens one at a time, in arrival order
+            async with self._lock:
+                while True:
+                    self._refill(time.monotonic())
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    await asyncio.sleep((1 - self._tokens) * 60 / self._capacity)
+        except BaseException:
+            self.release()
+            raise
+
+    def release(self):
+        """Free the concurrency slot"""
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
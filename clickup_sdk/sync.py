@@ -0,0 +1,213 @@
+"""Incremental task sync engine based on date_updated_gt cursors"""
+from typing import Optional, Dict, Any, List, Callable
+from dataclasses import dataclass
+from pathlib import Path
+import asyncio
+import json
+import logging
+
+from .client import ClickUp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TaskChange:
+    """Change record emitted for every task fetched by a sync pass"""
+    scope: str
+    task_id: str
+    task: Dict[str, Any]
+    created: bool = False
+
+
+class CursorStore:
+    """In-memory cursor store. Subclass to persist cursors."""
+
+    def __init__(self):
+        """Initialize cursor store"""
+        self._cursors: Dict[str, int] = {}
+
+    def get(self, scope: str) -> Optional[int]:
+        """Get the high-water mark for a scope"""
+        return self._cursors.get(scope)
+
+    def set(self, scope: str, cursor: int):
+        """Store the high-water mark for a scope"""
+        self._cursors[scope] = cursor
+
+
+class JsonCursorStore(CursorStore):
+    """Cursor store persisted to a JSON file"""
+
+    def __init__(self, path: str):
+        """
+        Initialize JSON cursor store.
+
+        Args:
+            path: JSON file path
+        """
+        super().__init__()
+        self.path = Path(path)
+        if self.path.exists():
+            self._cursors = {k: int(v) for k, v in json.loads(self.path.read_text()).items()}
+
+    def set(self, scope: str, cursor: int):
+        """Store the high-water mark and write the file"""
+        super().set(scope, cursor)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._cursors))
+        tmp_path.replace(self.path)
+
+
+def _to_int(value: Any) -> int:
+    """Convert ClickUp millisecond timestamps (often strings) to int"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class TaskSyncEngine:
+    """
+    Fetches only tasks changed since the last pass of each list or team.
+
+    Usage:
+        engine = TaskSyncEngine(clickup, cursor_store=JsonCursorStore("cursors.json"))
+        engine.add_list("901413862325")
+
+        @engine.subscribe
+        async def on_change(change: TaskChange):
+            print(change.task_id)
+
+        await engine.sync()
+    """
+
+    def __init__(self, client: ClickUp, cursor_store: Optional[CursorStore] = None):
+        """
+        Initialize sync engine.
+
+        Args:
+            client: ClickUp client
+            cursor_store: Cursor store (in-memory if not provided)
+        """
+        self.client = client
+        self.cursor_store = cursor_store or CursorStore()
+        self._scopes: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: List[Callable] = []
+
+    def add_list(self, list_id: str, **filters: Any) -> str:
+        """
+        Track tasks of a list.
+
+        Args:
+            list_id: List ID
+            **filters: Extra get_tasks filters
+
+        Returns:
+            Scope key
+        """
+        scope = f"list:{list_id}"
+        self._scopes[scope] = {"list_id": list_id, **filters}
+        return scope
+
+    def add_team(self, team_id: Any, **filters: Any) -> str:
+        """
+        Track tasks of a whole team (workspace).
+
+        Args:
+            team_id: Team ID
+            **filters: Extra get_tasks filters
+
+        Returns:
+            Scope key
+        """
+        scope = f"team:{team_id}"
+        self._scopes[scope] = {"team_id": team_id, **filters}
+        return scope
+
+    @property
+    def scopes(self) -> List[str]:
+        """Tracked scope keys"""
+        return list(self._scopes.keys())
+
+    def subscribe(self, callback: Callable) -> Callable:
+        """
+        Register a change subscriber (sync or async). Can be used as decorator.
+
+        Args:
+            callback: Function called with each TaskChange
+        """
+        self._subscribers.append(callback)
+        return callback
+
+    async def _emit(self, change: TaskChange):
+        """Deliver a change to all subscribers"""
+        for callback in self._subscribers:
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(change)
+                else:
+                    callback(change)
+            except Exception as e:
+                logger.error(f"Sync subscriber failed for task {change.task_id}: {e}", exc_info=True)
+
+    async def sync_scope(self, scope: str) -> int:
+        """
+        Fetch tasks of one scope changed since its cursor.
+
+        Args:
+            scope: Scope key returned by add_list/add_team
+
+        Returns:
+            Number of changed tasks
+        """
+        filters = self._scopes[scope]
+        cursor = self.cursor_store.get(scope)
+        high_water_mark = cursor or 0
+        count = 0
+
+        async for task in self.client.tasks.iter_tasks(
+            include_closed=True,
+            subtasks=True,
+            date_updated_gt=cursor,
+            **filters
+        ):
+            task_id = task.get("id")
+            if not task_id:
+                continue
+            created = cursor is not None and _to_int(task.get("date_created")) > cursor
+            await self._emit(TaskChange(scope=scope, task_id=task_id, task=task, created=created))
+            high_water_mark = max(high_water_mark, _to_int(task.get("date_updated")))
+            count += 1
+
+        if count or cursor is None:
+            self.cursor_store.set(scope, high_water_mark)
+        logger.debug(f"Synced {count} changed task(s) for {scope}")
+        return count
+
+    async def sync(self) -> int:
+        """
+        Run one sync pass over all scopes.
+
+        Returns:
+            Total number of changed tasks
+        """
+        total = 0
+        for scope in self.scopes:
+            try:
+                total += await self.sync_scope(scope)
+            except Exception as e:
+                logger.error(f"Sync failed for {scope}: {e}", exc_info=True)
+        return total
+
+    async def run(self, interval: float):
+        """
+        Run sync passes forever.
+
+        Args:
+            interval: Seconds between passes
+        """
+        while True:
+            await self.sync()
+            await asyncio.sleep(interval)
@@ -2,6 +2,7 @@
 from .dispatcher import WebhookDispatcher
 from .server import WebhookServer
 from .events import WebhookEvent, WebhookEventType
+from .scopes import WebhookScope, plan_webhooks
 from .filters import (
     Filter,
     CustomFieldFilter,
@@ -22,6 +23,8 @@ __all__ = [
     "WebhookServer",
     "WebhookEvent",
     "WebhookEventType",
+    "WebhookScope",
+    "plan_webhooks",
     "Filter",
     "CustomFieldFilter",
     "TaskStatusFilter",
@@ -6,6 +6,7 @@ import logging
 
 from .events import WebhookEvent, WebhookEventType
 from .filters import Filter
+from .scopes import WebhookScope, TEAM_SCOPE, plan_webhooks
 
 logger = logging.getLogger(__name__)
 
@@ -26,20 +27,35 @@ class WebhookDispatcher:
     
     def __init__(self):
         """Initialize webhook dispatcher"""
-        self._handlers: Dict[str, List[Tuple[Callable, Optional[Filter]]]] = defaultdict(list)
+        self._handlers: Dict[str, List[Tuple[Callable, Optional[Filter], WebhookScope]]] = defaultdict(list)
         self._middlewares: List[Callable] = []
+        # webhook_id -> scope of the webhooks created from plan_webhooks()
+        self._webhook_scopes: Dict[str, WebhookScope] = {}
+        # list_id -> (space_id, folder_id), e.g. HierarchySnapshot.resolve_list
+        self._location_resolver: Optional[Callable[[str], Tuple[Optional[str], Optional[str]]]] = None
+        # plan_webhooks() result, rebuilt when handlers change
+        self._plan: Optional[Dict[WebhookScope, List[str]]] = None
     
     def on(
         self,
         event_type: str,
-        *filters: Filter
+        *filters: Filter,
+        space_id: Optional[str] = None,
+        folder_id: Optional[str] = None,
+        list_id: Optional[str] = None
     ) -> Callable:
         """
         Decorator to register event handler with optional filters.
         
+        A location (space, folder or list) limits the webhook subscription
+        planned for the handler (see plan_webhooks).
+        
         Args:
             event_type: Event type (e.g., "taskCreated", "taskUpdated", "*" for all)
             *filters: Optional filters to apply
+            space_id: Only receive events of this space
+            folder_id: Only receive events of this folder
+            list_id: Only receive events of this list
         
         Usage:
             @dispatcher.on("taskCreated")
@@ -49,7 +65,12 @@ class WebhookDispatcher:
             @dispatcher.on("taskUpdated", CustomFieldFilter(field_id="custom_field_123"))
             async def handle_custom_field_change(event: WebhookEvent):
                 pass
+            
+            @dispatcher.on("taskStatusUpdated", list_id="901413862325")
+            async def handle_list_status(event: WebhookEvent):
+                pass
         """
+        scope = WebhookScope.create(space_id=space_id, folder_id=folder_id, list_id=list_id)
         def decorator(func: Callable) -> Callable:
             # Combine filters if multiple provided
             if filters:
@@ -61,7 +82,7 @@ class WebhookDispatcher:
             else:
                 filter_obj = None
             
-            self.register_handler(event_type, func, filter_obj)
+            self.register_handler(event_type, func, filter_obj, scope)
             return func
         return decorator
     
@@ -69,7 +90,8 @@ class WebhookDispatcher:
         self,
         event_type: str,
         handler: Callable,
-        filter_obj: Optional[Filter] = None
+        filter_obj: Optional[Filter] = None,
+        scope: WebhookScope = TEAM_SCOPE
     ):
         """
         Register an event handler with optional filter.
@@ -78,13 +100,16 @@ class WebhookDispatcher:
             event_type: Event type
             handler: Handler function (async or sync)
             filter_obj: Optional filter to apply
+            scope: Location the handler subscribes to (team-wide by default)
         """
         if not callable(handler):
             raise ValueError("Handler must be callable")
         
-        self._handlers[event_type].append((handler, filter_obj))
+        self._handlers[event_type].append((handler, filter_obj, scope))
+        self._plan = None
         filter_info = f" with filter {filter_obj.__class__.__name__}" if filter_obj else ""
-        logger.debug(f"Registered handler for event: {event_type}{filter_info}")
+        scope_info = f" in {scope}" if not scope.is_team else ""
+        logger.debug(f"Registered handler for event: {event_type}{filter_info}{scope_info}")
     
     def middleware(self, func: Callable) -> Callable:
         """
@@ -122,8 +147,29 @@ class WebhookDispatcher:
             logger.warning(f"No handlers registered for event: {event_type}")
             return []
         
+        # Events of a scoped webhook go only to the handlers of its scope.
+        # Events of the team-wide (or an unknown) webhook go to the handlers
+        # whose scope contains the event's location - or to every handler if
+        # it cannot be resolved - unless their own webhook delivers the event.
+        webhook_scope = self._webhook_scopes.get(str(event.webhook_id))
+        if webhook_scope is not None and not webhook_scope.is_team:
+            handler_tuples = [
+                handler_tuple for handler_tuple in handler_tuples
+                if handler_tuple[2] == webhook_scope
+            ]
+        else:
+            location = self._event_location(event)
+            plan = self._planned() if webhook_scope is not None else {}
+            handler_tuples = [
+                handler_tuple for handler_tuple in handler_tuples
+                if handler_tuple[2].is_team or (
+                    not _delivers(plan.get(handler_tuple[2]), event_type)
+                    and (location is None or handler_tuple[2].contains(*location))
+                )
+            ]
+        
         results = []
-        for handler, filter_obj in handler_tuples:
+        for handler, filter_obj, _ in handler_tuples:
             try:
                 # Check filter if present
                 if filter_obj:
@@ -165,8 +211,71 @@ class WebhookDispatcher:
         """Get list of registered event types"""
         return list(self._handlers.keys())
     
+    def plan_webhooks(self) -> Dict[WebhookScope, List[str]]:
+        """
+        Plan the webhooks needed by the registered handlers.
+        
+        Returns:
+            Scope -> event types to subscribe to, with one webhook per scope
+        """
+        return {scope: list(events) for scope, events in self._planned().items()}
+    
+    def _planned(self) -> Dict[WebhookScope, List[str]]:
+        """Cached plan_webhooks() result"""
+        if self._plan is None:
+            self._plan = plan_webhooks(
+                (event_type, scope)
+                for event_type, handlers in self._handlers.items()
+                for _, _, scope in handlers
+            )
+        return self._plan
+    
+    def set_webhook_scope(self, webhook_id: str, scope: WebhookScope):
+        """
+        Record the scope of a webhook created from plan_webhooks().
+        
+        Args:
+            webhook_id: ClickUp webhook ID
+            scope: Scope the webhook was created for
+        """
+        self._webhook_scopes[str(webhook_id)] = scope
+    
+    def set_location_resolver(
+        self,
+        resolver: Optional[Callable[[str], Tuple[Optional[str], Optional[str]]]]
+    ):
+        """
+        Set how list IDs are resolved to their space and folder.
+        
+        Used to match events of webhooks without a recorded scope against
+        the scopes of the handlers.
+        
+        Args:
+            resolver: list_id -> (space_id, folder_id), e.g.
+                HierarchySnapshot.resolve_list (None to stop resolving)
+        """
+        self._location_resolver = resolver
+    
+    def _event_location(
+        self, event: WebhookEvent
+    ) -> Optional[Tuple[Optional[str], Optional[str], str]]:
+        """(space_id, folder_id, list_id) of an event, None if it cannot be resolved"""
+        list_id = event.list_id
+        if list_id is None or self._location_resolver is None:
+            return None
+        space_id, folder_id = self._location_resolver(list_id)
+        if space_id is None:
+            return None
+        return space_id, folder_id, list_id
+    
     def clear_handlers(self):
         """Clear all registered handlers"""
         self._handlers.clear()
+        self._webhook_scopes.clear()
+        self._plan = None
         logger.info("All handlers cleared")
 
+
+def _delivers(events: Optional[List[str]], event_type: str) -> bool:
+    """True if a planned webhook with these events delivers event_type"""
+    return bool(events) and ("*" in events or event_type in events)
@@ -1,6 +1,6 @@
 """Webhook Event Types and Models"""
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -57,6 +57,10 @@ class WebhookEvent:
     history_items: Optional[list] = None
     task_id: Optional[str] = None
     webhook_id: Optional[str] = None
+    # Event specific payload (e.g. interval_id of time tracking events)
+    data: Optional[Dict[str, Any]] = None
+    # Complete webhook payload as received
+    raw: Optional[Dict[str, Any]] = field(default=None, repr=False)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "WebhookEvent":
@@ -65,16 +69,38 @@ class WebhookEvent:
             event=data.get("event", ""),
             history_items=data.get("history_items", []),
             task_id=data.get("task_id"),
-            webhook_id=data.get("webhook_id")
+            webhook_id=data.get("webhook_id"),
+            data=data.get("data"),
+            raw=data
         )
     
+    @property
+    def event_id(self) -> Optional[str]:
+        """ID of the first history item (ClickUp sends no separate event ID)"""
+        for item in self.history_items or []:
+            if isinstance(item, dict) and item.get("id"):
+                return str(item["id"])
+        return None
+    
+    @property
+    def list_id(self) -> Optional[str]:
+        """List the event happened in (list events and the parent_id of task history items)"""
+        raw = self.raw or {}
+        if raw.get("list_id"):
+            return str(raw["list_id"])
+        for item in self.history_items or []:
+            if isinstance(item, dict) and item.get("parent_id"):
+                return str(item["parent_id"])
+        return None
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return {
             "event": self.event,
             "history_items": self.history_items or [],
             "task_id": self.task_id,
-            "webhook_id": self.webhook_id
+            "webhook_id": self.webhook_id,
+            "data": self.data
         }
 
 
@@ -92,6 +118,8 @@ class TaskEvent(WebhookEvent):
             history_items=event.history_items,
             task_id=event.task_id,
             webhook_id=event.webhook_id,
+            data=event.data,
+            raw=event.raw,
             task=data.get("task")
         )
 
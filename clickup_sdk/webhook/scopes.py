@@ -0,0 +1,112 @@
+"""Webhook location scopes and subscription planning"""
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class WebhookScope:
+    """
+    Location a webhook is limited to.
+
+    ClickUp accepts one location per webhook; the most specific one set here
+    is used (list, then folder, then space). An empty scope is team-wide.
+    """
+    space_id: Optional[str] = None
+    folder_id: Optional[str] = None
+    list_id: Optional[str] = None
+
+    @classmethod
+    def create(
+        cls,
+        space_id: Optional[Any] = None,
+        folder_id: Optional[Any] = None,
+        list_id: Optional[Any] = None
+    ) -> "WebhookScope":
+        """Create scope keeping only its most specific location (IDs as strings)"""
+        if list_id:
+            return cls(list_id=str(list_id))
+        if folder_id:
+            return cls(folder_id=str(folder_id))
+        if space_id:
+            return cls(space_id=str(space_id))
+        return TEAM_SCOPE
+
+    @classmethod
+    def from_webhook(cls, webhook: Dict[str, Any]) -> "WebhookScope":
+        """Scope of a webhook returned by the ClickUp API"""
+        return cls.create(
+            space_id=webhook.get("space_id"),
+            folder_id=webhook.get("folder_id"),
+            list_id=webhook.get("list_id"),
+        )
+
+    @property
+    def is_team(self) -> bool:
+        """True for the team-wide scope"""
+        return self == TEAM_SCOPE
+
+    def contains(
+        self,
+        space_id: Optional[str] = None,
+        folder_id: Optional[str] = None,
+        list_id: Optional[str] = None
+    ) -> bool:
+        """True if the given location lies within this scope"""
+        if self.list_id is not None:
+            return self.list_id == list_id
+        if self.folder_id is not None:
+            return self.folder_id == folder_id
+        if self.space_id is not None:
+            return self.space_id == space_id
+        return True
+
+    def to_params(self) -> Dict[str, str]:
+        """Location parameters of the create webhook request"""
+        return {key: value for key, value in (
+            ("space_id", self.space_id),
+            ("folder_id", self.folder_id),
+            ("list_id", self.list_id),
+        ) if value is not None}
+
+    def __str__(self) -> str:
+        params = self.to_params()
+        return ", ".join(f"{key}={value}" for key, value in params.items()) or "team"
+
+
+TEAM_SCOPE = WebhookScope()
+
+
+def plan_webhooks(
+    subscriptions: Iterable[Tuple[str, WebhookScope]]
+) -> Dict[WebhookScope, List[str]]:
+    """
+    Group (event, scope) subscriptions into the webhooks that deliver them.
+
+    Each scope gets one webhook with the events its handlers need; a
+    wildcard ("*") subscription collapses the scope's events to ["*"].
+    Events the team-wide webhook already delivers are left out of the
+    scoped webhooks (the dispatcher routes them by location instead), and
+    scopes left without events get no webhook.
+
+    Args:
+        subscriptions: (event type, scope) pairs
+
+    Returns:
+        Scope -> sorted event list, team scope first
+    """
+    events_by_scope: Dict[WebhookScope, Set[str]] = {}
+    for event_type, scope in subscriptions:
+        events_by_scope.setdefault(scope, set()).add(event_type)
+
+    team_events = events_by_scope.get(TEAM_SCOPE, set())
+    plan: Dict[WebhookScope, List[str]] = {}
+    for scope in sorted(events_by_scope, key=lambda scope: (not scope.is_team, str(scope))):
+        events = events_by_scope[scope]
+        if not scope.is_team:
+            if "*" in team_events:
+                continue
+            events = events - team_events
+            if not events:
+                continue
+        plan[scope] = ["*"] if "*" in events else sorted(events)
+    return plan
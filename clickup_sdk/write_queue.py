@@ -0,0 +1,235 @@
+"""Write-behind queue that coalesces task and custom field updates"""
+from typing import Optional, Dict, Any, List, Tuple
+from dataclasses import dataclass, field, asdict
+import asyncio
+import logging
+import time
+
+from .client import ClickUp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WriteQueueMetrics:
+    """Counters of the write queue (totals plus the last flush)"""
+    flushes: int = 0
+    submitted: int = 0
+    api_calls: int = 0
+    errors: int = 0
+    pending: int = 0
+    last_flush_tasks: int = 0
+    last_flush_requests: int = 0
+    last_flush_api_calls: int = 0
+    last_flush_seconds: float = 0.0
+
+    @property
+    def merged(self) -> int:
+        """Submitted updates that did not need their own API call"""
+        return self.submitted - self.pending - self.api_calls
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Metrics as a JSON-serializable dict"""
+        return {**asdict(self), "merged": self.merged}
+
+
+@dataclass
+class _PendingTask:
+    """Merged, not yet written updates of one task"""
+    fields: Dict[str, Any] = field(default_factory=dict)
+    field_waiters: List[asyncio.Future] = field(default_factory=list)
+    custom_fields: Dict[str, Tuple[Any, List[asyncio.Future]]] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.field_waiters) + sum(
+            len(waiters) for _, waiters in self.custom_fields.values()
+        )
+
+
+class TaskWriteQueue:
+    """
+    Coalesces task updates and writes them in the background.
+
+    Updates of the same task are merged until the queue is flushed: task
+    fields (status, name, ...) are combined into one update_task call and
+    each custom field is written once with its latest value (last writer
+    wins). The queue flushes `delay` seconds after the first pending update
+    or as soon as `max_pending` updates are waiting. Flushes may overlap, but
+    the writes of one task start only after its previous writes finished, so
+    the latest value is also the last one written.
+
+    Usage:
+        queue = TaskWriteQueue(clickup, delay=0.5)
+
+        # Both resolve with the result of the same API call
+        await asyncio.gather(
+            queue.update_task(task_id, status="in progress"),
+            queue.update_task(task_id, priority=2),
+        )
+    """
+
+    def __init__(self, client: ClickUp, delay: float = 0.5, max_pending: int = 100):
+        """
+        Initialize write queue.
+
+        Args:
+            client: ClickUp client instance
+            delay: Seconds to collect updates before writing them
+            max_pending: Flush immediately when this many updates are waiting
+        """
+        self.client = client
+        self.delay = delay
+        self.max_pending = max_pending
+        self._pending: Dict[str, _PendingTask] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: set = set()
+        # task_id -> future resolved when the task's latest write finished
+        self._writing: Dict[str, asyncio.Future] = {}
+        self._metrics = WriteQueueMetrics()
+
+    @property
+    def metrics(self) -> WriteQueueMetrics:
+        """Write queue metrics"""
+        return self._metrics
+
+    def update_task(self, task_id: str, **fields: Any) -> "asyncio.Future[Dict[str, Any]]":
+        """
+        Queue an update of task fields (same arguments as TasksHandler.update_task).
+
+        Args:
+            task_id: Task ID
+            **fields: Task fields to update
+
+        Returns:
+            Future resolved with the updated task data
+        """
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(task_id, _PendingTask())
+        pending.fields.update(fields)
+        pending.field_waiters.append(future)
+        self._submitted()
+        return future
+
+    def set_task_field(
+        self,
+        task_id: str,
+        field_id: str,
+        value: Any
+    ) -> "asyncio.Future[Dict[str, Any]]":
+        """
+        Queue a custom field value update.
+
+        Args:
+            task_id: Task ID
+            field_id: Custom field ID
+            value: Field value
+
+        Returns:
+            Future resolved with the field update response
+        """
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(task_id, _PendingTask())
+        _, waiters = pending.custom_fields.get(field_id, (None, []))
+        pending.custom_fields[field_id] = (value, waiters + [future])
+        self._submitted()
+        return future
+
+    def _submitted(self):
+        """Count a new update and arm the flush timer or threshold"""
+        self._metrics.submitted += 1
+        self._metrics.pending += 1
+        if self._metrics.pending >= self.max_pending:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.delay, self._schedule_flush
+            )
+
+    def _schedule_flush(self):
+        task = asyncio.create_task(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self):
+        """Write every pending update now"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        requests = sum(task.size for task in pending.values())
+        self._metrics.pending -= requests
+        self._metrics.flushes += 1
+        started = time.monotonic()
+
+        api_calls = await asyncio.gather(
+            *(self._write_task(task_id, task) for task_id, task in pending.items())
+        )
+
+        metrics = self._metrics
+        metrics.last_flush_tasks = len(pending)
+        metrics.last_flush_requests = requests
+        metrics.last_flush_api_calls = sum(api_calls)
+        metrics.last_flush_seconds = time.monotonic() - started
+        logger.debug(
+            f"Write queue flushed {requests} update(s) of {len(pending)} task(s) "
+            f"with {sum(api_calls)} API call(s)"
+        )
+
+    async def _write_task(self, task_id: str, task: _PendingTask) -> int:
+        """Write the merged updates of one task after its earlier writes"""
+        previous = self._writing.get(task_id)
+        done = asyncio.get_running_loop().create_future()
+        self._writing[task_id] = done
+        try:
+            if previous is not None:
+                # Shielded: a cancelled write must not cancel its predecessor's marker
+                await asyncio.shield(previous)
+            return await self._write_merged(task_id, task)
+        finally:
+            done.set_result(None)
+            if self._writing.get(task_id) is done:
+                del self._writing[task_id]
+
+    async def _write_merged(self, task_id: str, task: _PendingTask) -> int:
+        """Write the merged updates of one task and resolve its waiters"""
+        writes = []
+        if task.fields:
+            writes.append((
+                self.client.tasks.update_task(task_id, **task.fields),
+                task.field_waiters,
+            ))
+        for field_id, (value, waiters) in task.custom_fields.items():
+            writes.append((
+                self.client.custom_fields.set_task_field(task_id, field_id, value),
+                waiters,
+            ))
+
+        results = await asyncio.gather(
+            *(call for call, _ in writes), return_exceptions=True
+        )
+        self._metrics.api_calls += len(writes)
+        for (_, waiters), result in zip(writes, results):
+            if isinstance(result, Exception):
+                self._metrics.errors += 1
+                logger.error(f"Failed to write update of task {task_id}: {result}")
+            for waiter in waiters:
+                if waiter.done():
+                    continue
+                if isinstance(result, Exception):
+                    waiter.set_exception(result)
+                    # Logged above; callers that never await the future
+                    # must not trigger "exception was never retrieved"
+                    waiter.exception()
+                else:
+                    waiter.set_result(result)
+        return len(writes)
+
+    async def close(self):
+        """Flush pending updates and wait for running flushes"""
+        await self.flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
@@ -2,7 +2,7 @@
 Application settings and configuration management.
 """
 import os
-from typing import Optional
+from typing import List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -15,10 +15,36 @@ class Settings:
     # ClickUp API Configuration
     CLICKUP_API_TOKEN: str = os.getenv("CLICKUP_API_TOKEN", "")
     TEAM_ID: str = os.getenv("TEAM_ID", "")
+    # Client-side limits (ClickUp allows 100 requests per minute on most plans)
+    CLICKUP_MAX_CONCURRENT_REQUESTS: int = int(os.getenv("CLICKUP_MAX_CONCURRENT_REQUESTS", "10"))
+    CLICKUP_REQUESTS_PER_MINUTE: int = int(os.getenv("CLICKUP_REQUESTS_PER_MINUTE", "100"))
+    # Retries of rate limited (429) and temporarily failing requests
+    CLICKUP_MAX_RETRIES: int = int(os.getenv("CLICKUP_MAX_RETRIES", "3"))
+    CLICKUP_RETRY_BACKOFF: float = float(os.getenv("CLICKUP_RETRY_BACKOFF", "1"))
     
     # Telegram Bot Configuration
     BOT_TOKEN: str = os.getenv("BOT_TOKEN", "")
     
+    # Telegram Delivery Configuration
+    TELEGRAM_GLOBAL_RATE_LIMIT: float = float(os.getenv("TELEGRAM_GLOBAL_RATE_LIMIT", "30"))
+    TELEGRAM_PER_CHAT_RATE_LIMIT: float = float(os.getenv("TELEGRAM_PER_CHAT_RATE_LIMIT", "1"))
+    TELEGRAM_MAX_RETRIES: int = int(os.getenv("TELEGRAM_MAX_RETRIES", "5"))
+    TELEGRAM_DIGEST_ENABLED: bool = os.getenv("TELEGRAM_DIGEST_ENABLED", "False").lower() == "true"
+    TELEGRAM_DIGEST_WINDOW: float = float(os.getenv("TELEGRAM_DIGEST_WINDOW", "60"))
+    TELEGRAM_DIGEST_MAX_ITEMS: int = int(os.getenv("TELEGRAM_DIGEST_MAX_ITEMS", "10"))
+    TELEGRAM_RELAY_CONCURRENCY: int = int(os.getenv("TELEGRAM_RELAY_CONCURRENCY", "3"))
+    TELEGRAM_FILE_CACHE_DB: str = os.getenv("TELEGRAM_FILE_CACHE_DB", "data/telegram_files.db")
+    TELEGRAM_MESSAGE_REGISTRY_DB: str = os.getenv("TELEGRAM_MESSAGE_REGISTRY_DB", "data/telegram_messages.db")
+    NOTIFICATION_LEDGER_DB: str = os.getenv("NOTIFICATION_LEDGER_DB", "data/notification_ledger.db")
+    NOTIFICATION_LEDGER_CACHE_SIZE: int = int(os.getenv("NOTIFICATION_LEDGER_CACHE_SIZE", "10000"))
+    # Seconds after which an unsettled delivery claim expires
+    NOTIFICATION_CLAIM_TIMEOUT: float = float(os.getenv("NOTIFICATION_CLAIM_TIMEOUT", "300"))
+    # Seconds ledger rows are kept, and when they are pruned (cron, empty to disable)
+    NOTIFICATION_LEDGER_RETENTION: float = float(
+        os.getenv("NOTIFICATION_LEDGER_RETENTION", str(30 * 86400))
+    )
+    NOTIFICATION_LEDGER_PRUNE_CRON: str = os.getenv("NOTIFICATION_LEDGER_PRUNE_CRON", "30 3 * * *")
+    
     # Webhook Configuration
     WEBHOOK_SECRET: Optional[str] = os.getenv("WEBHOOK_SECRET", None)
     WEBHOOK_ENDPOINT: str = os.getenv(
@@ -26,6 +52,26 @@ class Settings:
         "https://clickup.venu.uz/clickup-webhook"
     )
     WEBHOOK_PATH: str = os.getenv("WEBHOOK_PATH", "/clickup-webhook")
+    # Seconds between webhook health checks (0 to disable)
+    WEBHOOK_HEALTH_CHECK_INTERVAL: float = float(os.getenv("WEBHOOK_HEALTH_CHECK_INTERVAL", "300"))
+    
+    # Telegram Webhook Configuration (inline button callbacks)
+    TELEGRAM_WEBHOOK_PATH: str = os.getenv("TELEGRAM_WEBHOOK_PATH", "/telegram-webhook")
+    # Public URL registered with setWebhook on startup; empty to skip
+    TELEGRAM_WEBHOOK_URL: str = os.getenv("TELEGRAM_WEBHOOK_URL", "")
+    TELEGRAM_WEBHOOK_SECRET: Optional[str] = os.getenv("TELEGRAM_WEBHOOK_SECRET", None)
+    # Seconds to collect ClickUp updates for the same task before writing them
+    CLICKUP_WRITE_FLUSH_DELAY: float = float(os.getenv("CLICKUP_WRITE_FLUSH_DELAY", "2"))
+    # Flush queued ClickUp updates early once this many are waiting
+    CLICKUP_WRITE_MAX_PENDING: int = int(os.getenv("CLICKUP_WRITE_MAX_PENDING", "100"))
+    
+    # ClickUp statuses set by the notification buttons; a button stays
+    # unregistered while its status is empty
+    BUTTON_STATUS_LOT_IN: str = os.getenv("BUTTON_STATUS_LOT_IN", "")
+    BUTTON_STATUS_DOGOVOR_IN: str = os.getenv("BUTTON_STATUS_DOGOVOR_IN", "")
+    BUTTON_STATUS_PAYMENT_RECEIVED: str = os.getenv("BUTTON_STATUS_PAYMENT_RECEIVED", "")
+    # Seconds a button press waits for its status write before answering "queued"
+    BUTTON_WRITE_WAIT: float = float(os.getenv("BUTTON_WRITE_WAIT", "5"))
     
     # Server Configuration
     SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
@@ -36,6 +82,78 @@ class Settings:
     LOG_DIR: str = os.getenv("LOG_DIR", "logs")
     LOG_FILE_MAX_BYTES: int = int(os.getenv("LOG_FILE_MAX_BYTES", "10485760"))  # 10MB
     LOG_FILE_BACKUP_COUNT: int = int(os.getenv("LOG_FILE_BACKUP_COUNT", "5"))
+    # Records buffered for the background log writer; excess records are dropped
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Records written between two log file flushes
+    LOG_BATCH_SIZE: int = int(os.getenv("LOG_BATCH_SIZE", "256"))
+    # "text" or "json" (one JSON object per line with event/task/handler fields)
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()
+    # Share of webhook events whose records below WARNING are logged (0.0-1.0)
+    LOG_EVENT_SAMPLE_RATE: float = float(os.getenv("LOG_EVENT_SAMPLE_RATE", "1"))
+    
+    # Local State Configuration
+    DATA_DIR: str = os.getenv("DATA_DIR", "data")
+    
+    # Task Mirror Configuration
+    TASK_MIRROR_ENABLED: bool = os.getenv("TASK_MIRROR_ENABLED", "False").lower() == "true"
+    TASK_MIRROR_DB: str = os.getenv("TASK_MIRROR_DB", "data/task_mirror.db")
+    # Comma separated list IDs; if empty the whole team is mirrored
+    TASK_MIRROR_LIST_IDS: List[str] = [
+        list_id.strip()
+        for list_id in os.getenv("TASK_MIRROR_LIST_IDS", "").split(",")
+        if list_id.strip()
+    ]
+    TASK_MIRROR_CATCHUP_INTERVAL: int = int(os.getenv("TASK_MIRROR_CATCHUP_INTERVAL", "300"))
+    # Comma separated custom field names indexed by the task query layer
+    TASK_INDEX_FIELDS: List[str] = [
+        name.strip()
+        for name in os.getenv("TASK_INDEX_FIELDS", "Broker,Dogovor").split(",")
+        if name.strip()
+    ]
+    
+    # Time Tracking Rollups Configuration
+    TIME_ROLLUPS_ENABLED: bool = os.getenv("TIME_ROLLUPS_ENABLED", "False").lower() == "true"
+    TIME_ROLLUPS_DB: str = os.getenv("TIME_ROLLUPS_DB", "data/time_rollups.db")
+    TIME_ROLLUPS_RECONCILE_INTERVAL: int = int(os.getenv("TIME_ROLLUPS_RECONCILE_INTERVAL", "600"))
+    
+    # Workspace Hierarchy Snapshot Configuration
+    HIERARCHY_SNAPSHOT_PATH: str = os.getenv("HIERARCHY_SNAPSHOT_PATH", "data/hierarchy.json")
+    # Snapshots older than this (seconds) are crawled again on startup
+    HIERARCHY_SNAPSHOT_MAX_AGE: int = int(os.getenv("HIERARCHY_SNAPSHOT_MAX_AGE", "86400"))
+    HIERARCHY_CRAWL_CONCURRENCY: int = int(os.getenv("HIERARCHY_CRAWL_CONCURRENCY", "4"))
+    
+    # Member Cache Configuration
+    MEMBER_CACHE_TTL: int = int(os.getenv("MEMBER_CACHE_TTL", "600"))
+    # Comma separated list IDs whose members (e.g. guests) are cached as well
+    MEMBER_CACHE_LIST_IDS: List[str] = [
+        list_id.strip()
+        for list_id in os.getenv("MEMBER_CACHE_LIST_IDS", "").split(",")
+        if list_id.strip()
+    ]
+    # Minimum seconds between telegram directory reloads on a lookup miss
+    MEMBER_CACHE_TELEGRAM_MISS_INTERVAL: int = int(
+        os.getenv("MEMBER_CACHE_TELEGRAM_MISS_INTERVAL", "60")
+    )
+    
+    # Deadline Reminder Configuration
+    DEADLINE_SCHEDULER_DB: str = os.getenv("DEADLINE_SCHEDULER_DB", "data/deadlines.db")
+    # Comma separated seconds before the broker deadline to send reminders at
+    BROKER_DEADLINE_REMIND_BEFORE: List[int] = [
+        int(offset.strip())
+        for offset in os.getenv("BROKER_DEADLINE_REMIND_BEFORE", "86400,3600").split(",")
+        if offset.strip()
+    ]
+    
+    # Scheduled Jobs Configuration
+    # Cron expression (minute hour day month weekday) of the accountant digest; empty disables it
+    ACCOUNTANT_DIGEST_CRON: str = os.getenv("ACCOUNTANT_DIGEST_CRON", "0 9 * * *")
+    ACCOUNTANT_DIGEST_PAGE_CONCURRENCY: int = int(os.getenv("ACCOUNTANT_DIGEST_PAGE_CONCURRENCY", "4"))
+    
+    # Savdo space; when set, savdo handlers get a webhook scoped to it
+    SAVDO_SPACE_ID: str = os.getenv("SAVDO_SPACE_ID", "")
+    
+    # Staff directory view (pre-filtered members with a telegram_id); empty reads the whole list
+    STAFF_DIRECTORY_VIEW_ID: str = os.getenv("STAFF_DIRECTORY_VIEW_ID", "")
     
     # Application Configuration
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
@@ -60,6 +178,17 @@ class Settings:
                 f"Missing required environment variables: {', '.join(missing)}"
             )
 
+        # Buttons write to ClickUp; unauthenticated callbacks must not reach them
+        button_statuses = (
+            self.BUTTON_STATUS_LOT_IN,
+            self.BUTTON_STATUS_DOGOVOR_IN,
+            self.BUTTON_STATUS_PAYMENT_RECEIVED,
+        )
+        if any(button_statuses) and not self.TELEGRAM_WEBHOOK_SECRET:
+            raise ValueError(
+                "TELEGRAM_WEBHOOK_SECRET is required when BUTTON_STATUS_* is set"
+            )
+
 
 # Global settings instance
 _settings: Optional[Settings] = None
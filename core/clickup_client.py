@@ -3,7 +3,7 @@ ClickUp Client - Global client instance with proper initialization.
 """
 
 import logging
-from clickup_sdk import ClickUp
+from clickup_sdk import ClickUp, HierarchySnapshot, TaskWriteQueue
 
 from config.settings import get_settings
 
@@ -12,6 +12,12 @@ logger = logging.getLogger(__name__)
 # Global ClickUp client instance
 _clickup_client: ClickUp | None = None
 
+# Global write-behind queue instance
+_task_write_queue: TaskWriteQueue | None = None
+
+# Global workspace hierarchy snapshot
+_hierarchy_snapshot: HierarchySnapshot | None = None
+
 
 def get_clickup_client() -> ClickUp:
     """
@@ -23,11 +29,56 @@ def get_clickup_client() -> ClickUp:
     global _clickup_client
     if _clickup_client is None:
         settings = get_settings()
-        _clickup_client = ClickUp(token=settings.CLICKUP_API_TOKEN)
+        _clickup_client = ClickUp(
+            token=settings.CLICKUP_API_TOKEN,
+            max_concurrent_requests=settings.CLICKUP_MAX_CONCURRENT_REQUESTS,
+            requests_per_minute=settings.CLICKUP_REQUESTS_PER_MINUTE,
+            max_retries=settings.CLICKUP_MAX_RETRIES,
+            retry_backoff=settings.CLICKUP_RETRY_BACKOFF,
+        )
         logger.info("✅ ClickUp client initialized")
     return _clickup_client
 
 
+def get_task_write_queue() -> TaskWriteQueue:
+    """
+    Get or create global write-behind queue for task updates.
+
+    Returns:
+        TaskWriteQueue instance
+    """
+    global _task_write_queue
+    if _task_write_queue is None:
+        settings = get_settings()
+        _task_write_queue = TaskWriteQueue(
+            get_clickup_client(),
+            delay=settings.CLICKUP_WRITE_FLUSH_DELAY,
+            max_pending=settings.CLICKUP_WRITE_MAX_PENDING,
+        )
+    return _task_write_queue
+
+
+def get_hierarchy_snapshot() -> HierarchySnapshot:
+    """
+    Get or create global workspace hierarchy snapshot.
+
+    The snapshot starts empty; call load() or refresh() to fill it.
+
+    Returns:
+        HierarchySnapshot instance
+    """
+    global _hierarchy_snapshot
+    if _hierarchy_snapshot is None:
+        settings = get_settings()
+        _hierarchy_snapshot = HierarchySnapshot(
+            get_clickup_client(),
+            settings.TEAM_ID,
+            concurrency=settings.HIERARCHY_CRAWL_CONCURRENCY,
+            path=settings.HIERARCHY_SNAPSHOT_PATH,
+        )
+    return _hierarchy_snapshot
+
+
 # For backward compatibility, create a module-level function
 def get_clickup() -> ClickUp:
     """Get ClickUp client (alias for get_clickup_client)."""
@@ -0,0 +1,298 @@
+"""
+Deadline Scheduler - in-process timer heap for reminder jobs.
+
+Jobs are kept in a min-heap ordered by fire time and persisted to SQLite, so
+the schedule survives restarts. Rescheduling pushes a new heap entry in
+O(log n); the old entry is left in place and skipped when it reaches the top
+(lazy deletion), and the heap is rebuilt when stale entries pile up.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from config.settings import get_settings
+from core.logging_config import get_logger
+from core.storage import open_database
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+    job_key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    fire_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+# Rebuild the heap when it holds this many more entries than live jobs
+COMPACT_SLACK = 1024
+
+
+@dataclass
+class ScheduledJob:
+    """Reminder job fired at fire_at (Unix seconds)."""
+
+    key: str
+    kind: str
+    task_id: str
+    fire_at: float
+    payload: Dict[str, Any] = field(default_factory=dict)
+    seq: int = 0
+
+
+JobCallback = Callable[[ScheduledJob], Awaitable[None]]
+
+
+class DeadlineScheduler:
+    """
+    Fires reminder jobs at their scheduled time.
+
+    Usage:
+        scheduler = get_deadline_scheduler()
+        scheduler.register_job("broker_deadline", send_reminder)
+        scheduler.schedule("task123:3600", "broker_deadline", "task123", fire_at)
+        asyncio.create_task(scheduler.run())
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize DeadlineScheduler and load the persisted schedule.
+
+        Args:
+            db_path: SQLite database path
+        """
+        self._db = open_database(db_path)
+        self._db.executescript(SCHEMA)
+        self._callbacks: Dict[str, JobCallback] = {}
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._by_task: Dict[str, Set[str]] = defaultdict(set)
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._running: Set[asyncio.Task] = set()
+        self._load()
+
+    def _load(self) -> None:
+        rows = self._db.execute(
+            "SELECT job_key, kind, task_id, fire_at, payload FROM scheduled_jobs"
+        ).fetchall()
+        for row in rows:
+            job = ScheduledJob(
+                key=row["job_key"],
+                kind=row["kind"],
+                task_id=row["task_id"],
+                fire_at=row["fire_at"],
+                payload=json.loads(row["payload"]),
+                seq=next(self._seq),
+            )
+            self._jobs[job.key] = job
+            self._by_task[job.task_id].add(job.key)
+            self._heap.append((job.fire_at, job.seq, job.key))
+        heapq.heapify(self._heap)
+        if rows:
+            logger.info(f"⏰ Loaded {len(rows)} scheduled job(s)")
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def register_job(self, kind: str, callback: JobCallback) -> None:
+        """
+        Register the coroutine function that runs jobs of a kind.
+
+        Args:
+            kind: Job kind
+            callback: Called with the ScheduledJob when it fires
+        """
+        self._callbacks[kind] = callback
+
+    def get(self, key: str) -> Optional[ScheduledJob]:
+        """Get a pending job by key."""
+        return self._jobs.get(key)
+
+    def jobs_for_task(self, task_id: str) -> List[ScheduledJob]:
+        """Get the pending jobs of a task."""
+        return [self._jobs[key] for key in self._by_task.get(str(task_id), ())]
+
+    def next_fire_at(self) -> Optional[float]:
+        """Fire time of the earliest pending job."""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def schedule(
+        self,
+        key: str,
+        kind: str,
+        task_id: str,
+        fire_at: float,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> ScheduledJob:
+        """
+        Schedule a job, replacing a pending job with the same key.
+
+        Args:
+            key: Job key (unique per pending job)
+            kind: Job kind (selects the callback)
+            task_id: ClickUp task ID
+            fire_at: Unix timestamp in seconds
+            payload: JSON-serializable job data
+
+        Returns:
+            Scheduled job
+        """
+        job = ScheduledJob(key, kind, str(task_id), float(fire_at), payload or {}, next(self._seq))
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO scheduled_jobs "
+                "(job_key, kind, task_id, fire_at, payload) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, job.task_id, job.fire_at, json.dumps(job.payload)),
+            )
+
+        previous = self._jobs.get(key)
+        if previous is not None and previous.task_id != job.task_id:
+            self._by_task[previous.task_id].discard(key)
+        self._jobs[key] = job
+        self._by_task[job.task_id].add(key)
+        heapq.heappush(self._heap, (job.fire_at, job.seq, key))
+        self._maybe_compact()
+
+        if self._heap[0][1] == job.seq:
+            # New earliest job - the run loop must sleep less
+            self._wakeup.set()
+        return job
+
+    def cancel(self, key: str) -> bool:
+        """
+        Cancel a pending job.
+
+        Args:
+            key: Job key
+
+        Returns:
+            True if a job was pending
+        """
+        job = self._jobs.pop(key, None)
+        if job is None:
+            return False
+        self._forget(job)
+        with self._db:
+            self._db.execute("DELETE FROM scheduled_jobs WHERE job_key = ?", (key,))
+        self._maybe_compact()
+        return True
+
+    def cancel_task(self, task_id: str) -> int:
+        """
+        Cancel every pending job of a task.
+
+        Args:
+            task_id: ClickUp task ID
+
+        Returns:
+            Number of cancelled jobs
+        """
+        keys = list(self._by_task.get(str(task_id), ()))
+        for key in keys:
+            self.cancel(key)
+        return len(keys)
+
+    def _forget(self, job: ScheduledJob) -> None:
+        keys = self._by_task.get(job.task_id)
+        if keys is not None:
+            keys.discard(job.key)
+            if not keys:
+                del self._by_task[job.task_id]
+
+    def _is_live(self, entry: Tuple[float, int, str]) -> bool:
+        job = self._jobs.get(entry[2])
+        return job is not None and job.seq == entry[1]
+
+    def _discard_stale(self) -> None:
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > 2 * len(self._jobs) + COMPACT_SLACK:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+
+    def pop_due(self, now: Optional[float] = None) -> List[ScheduledJob]:
+        """
+        Remove and return the jobs due at `now`.
+
+        Args:
+            now: Unix timestamp in seconds (defaults to the current time)
+
+        Returns:
+            Due jobs, earliest first
+        """
+        now = time.time() if now is None else now
+        due: List[ScheduledJob] = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, _, key = heapq.heappop(self._heap)
+            job = self._jobs.pop(key)
+            self._forget(job)
+            due.append(job)
+
+    async def _fire(self, job: ScheduledJob) -> None:
+        callback = self._callbacks.get(job.kind)
+        try:
+            if callback is None:
+                logger.warning(f"⚠️ No callback registered for job kind {job.kind}")
+            else:
+                await callback(job)
+        except Exception as e:
+            logger.error(f"❌ Scheduled job {job.key} failed: {e}", exc_info=True)
+        finally:
+            # Delete after running, unless the job was rescheduled meanwhile
+            with self._db:
+                self._db.execute(
+                    "DELETE FROM scheduled_jobs WHERE job_key = ? AND fire_at = ?",
+                    (job.key, job.fire_at),
+                )
+
+    async def run(self) -> None:
+        """Fire jobs as they become due, forever."""
+        while True:
+            for job in self.pop_due():
+                task = asyncio.create_task(self._fire(job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            next_fire_at = self.next_fire_at()
+            timeout = None if next_fire_at is None else max(0.0, next_fire_at - time.time())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+
+# Global scheduler instance
+_deadline_scheduler: Optional[DeadlineScheduler] = None
+
+
+def get_deadline_scheduler() -> DeadlineScheduler:
+    """
+    Get or create global DeadlineScheduler instance.
+
+    Returns:
+        DeadlineScheduler instance
+    """
+    global _deadline_scheduler
+    if _deadline_scheduler is None:
+        _deadline_scheduler = DeadlineScheduler(get_settings().DEADLINE_SCHEDULER_DB)
+    return _deadline_scheduler
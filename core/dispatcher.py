@@ -1,8 +1,32 @@
 """
 Webhook Dispatcher - Global dispatcher instance.
 """
-from clickup_sdk.webhook import WebhookDispatcher
+import inspect
+from typing import Any, Callable, Dict, List
+
+from clickup_sdk.webhook import WebhookDispatcher, WebhookEvent
+
+from core.logging_config import log_context
+
+
+class AppDispatcher(WebhookDispatcher):
+    """WebhookDispatcher that logs every event inside its log context."""
+
+    async def process_event(self, event_data: Dict[str, Any]) -> List[Any]:
+        event = WebhookEvent.from_dict(event_data)
+        with log_context(event_id=event.event_id, task_id=event.task_id):
+            return await super().process_event(event_data)
+
 
 # Global dispatcher instance
-dispatcher = WebhookDispatcher()
+dispatcher = AppDispatcher()
+
 
+@dispatcher.middleware
+async def handler_log_context(event: WebhookEvent, handler: Callable) -> Any:
+    """Name the running handler in the records it logs."""
+    with log_context(handler=getattr(handler, "__name__", str(handler))):
+        result = handler(event)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
@@ -0,0 +1,322 @@
+"""
+Jobs - cron-like runner for periodic jobs inside the app process.
+
+Usage:
+    runner = get_job_runner()
+
+    @runner.job("accountant_daily_digest", "0 9 * * 1-6")
+    async def send_digest():
+        ...
+        return {"messages": 3}
+
+Every run records its runtime, the ClickUp API calls it made and the value it
+returned (see /metrics/jobs).
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from clickup_sdk import ClickUp
+
+from core.clickup_client import get_clickup_client
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Runs kept per job for metrics
+RUN_HISTORY_SIZE = 20
+
+# (min, max) of the five cron fields
+CRON_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_cron_field(value: str, low: int, high: int) -> Set[int]:
+    """
+    Parse one cron field ("*", "5", "1-5", "*/15", "1,15,30", "9-17/2").
+
+    Args:
+        value: Field expression
+        low: Minimum allowed value
+        high: Maximum allowed value
+
+    Returns:
+        Matching values
+    """
+    values: Set[int] = set()
+    for part in value.split(","):
+        part_range, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if part_range == "*":
+            start, end = low, high
+        elif "-" in part_range:
+            start_text, end_text = part_range.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(part_range)
+            end = high if step_text else start
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"Invalid cron field: {value}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Five-field cron expression: minute hour day-of-month month day-of-week."""
+
+    def __init__(self, expression: str):
+        """
+        Parse cron expression.
+
+        Day of week is 0-6 with 0 = Sunday (7 is accepted as Sunday too).
+        As in cron, when both day fields are restricted a day matching
+        either of them matches.
+
+        Args:
+            expression: Cron expression, e.g. "0 9 * * 1-5"
+
+        Raises:
+            ValueError: If the expression is invalid
+        """
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_cron_field(value, low, high)
+            for value, (low, high) in zip(fields, CRON_FIELD_RANGES)
+        )
+        self.weekdays = {weekday % 7 for weekday in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        # Python weekday(): Monday = 0; cron: Sunday = 0
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day:
+            return weekday_match
+        if self._any_weekday:
+            return day_match
+        return day_match or weekday_match
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Get the first matching minute after `moment`.
+
+        Args:
+            moment: Start time (naive local time)
+
+        Returns:
+            Next run time
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Cron expressions repeat at least every few years (Feb 29)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                month_start = candidate.replace(day=1, hour=0, minute=0)
+                candidate = (month_start + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+@dataclass
+class JobRun:
+    """Outcome of one job run."""
+
+    started_at: float
+    duration: float = 0.0
+    api_calls: int = 0
+    success: bool = True
+    error: Optional[str] = None
+    result: Any = None
+
+
+@dataclass
+class Job:
+    """Registered periodic job."""
+
+    name: str
+    schedule: CronSchedule
+    func: Callable[[], Awaitable[Any]]
+    next_run: Optional[datetime] = None
+    runs: Deque[JobRun] = field(default_factory=lambda: deque(maxlen=RUN_HISTORY_SIZE))
+
+
+class JobRunner:
+    """Runs registered jobs on their cron schedules."""
+
+    def __init__(self, client: Optional[ClickUp] = None):
+        """
+        Initialize JobRunner.
+
+        Args:
+            client: ClickUp client whose API calls are counted per run.
+                If None, uses the global client.
+        """
+        self._client = client
+        self._jobs: Dict[str, Job] = {}
+        self._running: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._started = False
+
+    @property
+    def client(self) -> ClickUp:
+        if self._client is None:
+            self._client = get_clickup_client()
+        return self._client
+
+    @property
+    def jobs(self) -> List[Job]:
+        """Registered jobs."""
+        return list(self._jobs.values())
+
+    def add_job(self, name: str, cron: str, func: Callable[[], Awaitable[Any]]) -> Job:
+        """
+        Register a job.
+
+        Jobs added while the runner is running are scheduled right away.
+
+        Args:
+            name: Unique job name
+            cron: Cron expression
+            func: Coroutine function run without arguments
+
+        Returns:
+            Registered job
+        """
+        job = Job(name, CronSchedule(cron), func)
+        self._jobs[name] = job
+        logger.debug(f"Registered job {name} ({cron})")
+        if self._started:
+            self._schedule(job, datetime.now())
+        return job
+
+    def job(self, name: str, cron: str) -> Callable:
+        """
+        Decorator to register a job.
+
+        Args:
+            name: Unique job name
+            cron: Cron expression
+        """
+        def decorator(func: Callable[[], Awaitable[Any]]) -> Callable:
+            self.add_job(name, cron, func)
+            return func
+        return decorator
+
+    async def run_job(self, name: str) -> JobRun:
+        """
+        Run a job now and record the run.
+
+        Args:
+            name: Job name
+
+        Returns:
+            Recorded run
+        """
+        job = self._jobs[name]
+        run = JobRun(started_at=time.time())
+        started = time.monotonic()
+        logger.info(f"🕘 Running job {name}...")
+        counter = self.client.count_requests()
+        self._running.add(name)
+        try:
+            with counter:
+                run.result = await job.func()
+        except Exception as e:
+            run.success = False
+            run.error = str(e)
+            logger.error(f"❌ Job {name} failed: {e}", exc_info=True)
+        finally:
+            self._running.discard(name)
+            run.duration = time.monotonic() - started
+            run.api_calls = counter.count
+            job.runs.append(run)
+
+        if run.success:
+            logger.info(
+                f"✅ Job {name} finished in {run.duration:.1f}s with {run.api_calls} API call(s)"
+            )
+        return run
+
+    def _start(self, job: Job) -> None:
+        if job.name in self._running:
+            logger.warning(f"⚠️ Job {job.name} is still running, skipping this run")
+            return
+        task = asyncio.create_task(self.run_job(job.name))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _schedule(self, job: Job, now: datetime) -> None:
+        job.next_run = job.schedule.next_after(now)
+        logger.info(f"🕘 Job {job.name} next runs at {job.next_run:%Y-%m-%d %H:%M}")
+
+    async def run(self) -> None:
+        """Run jobs on their schedules forever."""
+        self._started = True
+        now = datetime.now()
+        for job in self._jobs.values():
+            self._schedule(job, now)
+
+        while True:
+            scheduled = [job for job in self._jobs.values() if job.next_run is not None]
+            if not scheduled:
+                await asyncio.sleep(60)
+                continue
+            next_job = min(scheduled, key=lambda job: job.next_run)
+            delay = (next_job.next_run - datetime.now()).total_seconds()
+            if delay > 0:
+                # Re-check at least every minute (clock changes, new jobs)
+                await asyncio.sleep(min(delay, 60))
+                continue
+            self._start(next_job)
+            # Runs missed while the process was busy or asleep are not repeated
+            next_job.next_run = next_job.schedule.next_after(
+                max(next_job.next_run, datetime.now())
+            )
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Per-job schedule and recent runs.
+
+        Returns:
+            JSON-serializable metrics
+        """
+        return {
+            job.name: {
+                "cron": job.schedule.expression,
+                "next_run": job.next_run.isoformat() if job.next_run else None,
+                "running": job.name in self._running,
+                "runs": [asdict(run) for run in job.runs],
+            }
+            for job in self._jobs.values()
+        }
+
+
+# Global job runner instance
+_job_runner: Optional[JobRunner] = None
+
+
+def get_job_runner() -> JobRunner:
+    """
+    Get or create global JobRunner instance.
+
+    Returns:
+        JobRunner instance
+    """
+    global _job_runner
+    if _job_runner is None:
+        _job_runner = JobRunner()
+    return _job_runner
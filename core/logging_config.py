@@ -1,28 +1,326 @@
 """
 Logging configuration and setup.
+
+Log calls only put the record on a bounded in-memory queue; a background
+listener thread formats the records and writes them to the console and log
+files, flushing the files once per batch.
+
+Records logged while handling a webhook event carry its event ID, task ID
+and handler name (see log_context), written as fields with LOG_FORMAT=json.
+Records below WARNING are kept only for a sample of events
+(LOG_EVENT_SAMPLE_RATE); warnings and errors are always kept.
 """
+import atexit
+import copy
+import json
 import logging
-import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional
 
 from config.settings import get_settings
 
+# Records below this level are dropped when the queue is full; records at or
+# above it evict the oldest queued record instead
+DROP_PROTECTED_LEVEL = logging.WARNING
+
+# Seconds between two "dropped records" warnings
+DROP_REPORT_INTERVAL = 10.0
+
+# Renders tracebacks on the calling thread, while exc_info is still valid
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+# Argument types safe to format later on the listener thread
+_IMMUTABLE_ARG_TYPES = (str, int, float, bool, type(None))
+
+# Context fields copied onto every record
+CONTEXT_FIELDS = ("event_id", "task_id", "handler")
+
+
+@dataclass(frozen=True)
+class LogContext:
+    """Webhook event being handled by the current task."""
+
+    event_id: Optional[str] = None
+    task_id: Optional[str] = None
+    handler: Optional[str] = None
+    # False when the event's records below WARNING are sampled out
+    sampled: bool = True
+
+
+_log_context: ContextVar[LogContext] = ContextVar("log_context", default=LogContext())
+
+
+def is_sampled(event_id: Optional[str], rate: float) -> bool:
+    """
+    Decide whether the verbose records of an event are kept.
+
+    The decision is a hash of the event ID, so every record (and every
+    process) makes the same choice for an event.
+
+    Args:
+        event_id: Event ID (random decision if None)
+        rate: Share of events kept, 0.0-1.0
+
+    Returns:
+        True if the event's records are kept
+    """
+    if rate >= 1:
+        return True
+    if rate <= 0:
+        return False
+    if event_id is None:
+        return time.perf_counter_ns() % 10000 < rate * 10000
+    return zlib.crc32(event_id.encode()) % 10000 < rate * 10000
+
+
+@contextmanager
+def log_context(**fields) -> Iterator[LogContext]:
+    """
+    Attach fields to the records logged inside the block.
+
+    Nested blocks add to (and override) the outer fields. A new event_id
+    also decides the sampling of the event.
+
+    Usage:
+        with log_context(event_id=event.event_id, task_id=event.task_id):
+            logger.debug("History item: %s", item)
+
+    Args:
+        **fields: LogContext fields (event_id, task_id, handler, sampled)
+    """
+    context = replace(_log_context.get(), **fields)
+    if "event_id" in fields and "sampled" not in fields:
+        context = replace(
+            context, sampled=is_sampled(context.event_id, get_settings().LOG_EVENT_SAMPLE_RATE)
+        )
+    token = _log_context.set(context)
+    try:
+        yield context
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Adds the log context to records and drops sampled-out verbose records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        if not context.sampled and record.levelno < logging.WARNING:
+            return False
+        record.event_id = context.event_id
+        record.task_id = context.task_id
+        record.handler = context.handler
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in CONTEXT_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        """
+        Initialize DroppingQueueHandler.
+
+        Args:
+            log_queue: Bounded queue read by the listener thread
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Make the record safe to format on the listener thread.
+
+        Messages with only immutable arguments are formatted later by the
+        listener; others are merged now, before the arguments can change.
+        Traceback text is kept in exc_text.
+        """
+        record = copy.copy(record)
+        args = record.args
+        if args and not (
+            isinstance(args, tuple) and all(isinstance(arg, _IMMUTABLE_ARG_TYPES) for arg in args)
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if record.levelno >= DROP_PROTECTED_LEVEL:
+            # Make room for warnings and errors at the expense of the oldest record
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        with self._dropped_lock:
+            self.dropped += 1
+
+    def take_dropped(self) -> int:
+        """Get and reset the number of dropped records."""
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class BatchFlushRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that flushes once per listener batch, not per record."""
+
+    def flush(self) -> None:
+        # Called by StreamHandler.emit after every record; see flush_batch
+        pass
+
+    def flush_batch(self) -> None:
+        """Flush the records written since the last batch."""
+        super().flush()
+
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener that handles queued records in batches."""
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        *handlers: logging.Handler,
+        queue_handler: Optional[DroppingQueueHandler] = None,
+        batch_size: int = 256
+    ):
+        """
+        Initialize BatchingQueueListener.
+
+        Args:
+            log_queue: Queue filled by the queue handler
+            *handlers: Handlers that format and write the records
+            queue_handler: Handler whose dropped records are reported
+            batch_size: Maximum records handled between two flushes
+        """
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.batch_size = batch_size
+        self._last_drop_report = 0.0
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for room instead of failing when the queue is full
+        self.queue.put(self._sentinel)
+
+    def _monitor(self) -> None:
+        q = self.queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+                q.task_done()
+
+            self._report_dropped(force=stop)
+            for handler in self.handlers:
+                getattr(handler, "flush_batch", handler.flush)()
+            if stop:
+                break
+
+    def _report_dropped(self, force: bool = False) -> None:
+        if self.queue_handler is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_drop_report < DROP_REPORT_INTERVAL:
+            return
+        dropped = self.queue_handler.take_dropped()
+        if dropped:
+            self._last_drop_report = now
+            self.handle(logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"⚠️ Log queue full, dropped {dropped} record(s)",
+            }))
+
+
+# Listener of the current logging setup
+_queue_listener: Optional[BatchingQueueListener] = None
+
+
+def _rotating_file_handler(
+    path: Path, level: int, formatter: logging.Formatter
+) -> BatchFlushRotatingFileHandler:
+    settings = get_settings()
+    handler = BatchFlushRotatingFileHandler(
+        path,
+        maxBytes=settings.LOG_FILE_MAX_BYTES,
+        backupCount=settings.LOG_FILE_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    handler.setLevel(level)
+    handler.setFormatter(formatter)
+    return handler
+
 
 def setup_logging(log_dir: Optional[str] = None) -> None:
     """
     Setup application-wide logging configuration.
     
+    The root logger gets a single non-blocking queue handler; console and
+    file output happen on the listener thread.
+    
     Args:
         log_dir: Directory for log files. If None, uses settings LOG_DIR.
     """
+    global _queue_listener
     settings = get_settings()
     log_directory = Path(log_dir or settings.LOG_DIR)
     
     # Create logs directory if it doesn't exist
     log_directory.mkdir(parents=True, exist_ok=True)
     
+    # Stop the previous pipeline (setup_logging called again)
+    shutdown_logging()
+    
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
@@ -30,7 +328,13 @@ def setup_logging(log_dir: Optional[str] = None) -> None:
     # Clear existing handlers
     root_logger.handlers.clear()
     
-    # Console handler with colored output
+    file_format = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    handlers: List[logging.Handler] = []
+    
+    # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_format = logging.Formatter(
@@ -38,69 +342,56 @@ def setup_logging(log_dir: Optional[str] = None) -> None:
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     console_handler.setFormatter(console_format)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
-    # File handler with rotation for general logs
-    general_log_file = log_directory / "app.log"
-    file_handler = RotatingFileHandler(
-        general_log_file,
-        maxBytes=settings.LOG_FILE_MAX_BYTES,
-        backupCount=settings.LOG_FILE_BACKUP_COUNT,
-        encoding='utf-8'
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_format = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(file_format)
-    root_logger.addHandler(file_handler)
+    # General and error log files
+    handlers.append(_rotating_file_handler(log_directory / "app.log", logging.DEBUG, file_format))
+    handlers.append(_rotating_file_handler(log_directory / "errors.log", logging.ERROR, file_format))
     
-    # Error log file handler
-    error_log_file = log_directory / "errors.log"
-    error_handler = RotatingFileHandler(
-        error_log_file,
-        maxBytes=settings.LOG_FILE_MAX_BYTES,
-        backupCount=settings.LOG_FILE_BACKUP_COUNT,
-        encoding='utf-8'
-    )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(file_format)
-    root_logger.addHandler(error_handler)
+    # Webhook and Telegram logs (records of the "webhook" / "telegram" loggers)
+    for name in ("webhook", "telegram"):
+        handler = _rotating_file_handler(log_directory / f"{name}.log", logging.DEBUG, file_format)
+        handler.addFilter(logging.Filter(name))
+        handlers.append(handler)
+        # Inherit the root level instead of always producing DEBUG records
+        named_logger = logging.getLogger(name)
+        named_logger.handlers.clear()
+        named_logger.setLevel(logging.NOTSET)
     
-    # Webhook-specific logger
-    webhook_logger = logging.getLogger("webhook")
-    webhook_log_file = log_directory / "webhook.log"
-    webhook_handler = RotatingFileHandler(
-        webhook_log_file,
-        maxBytes=settings.LOG_FILE_MAX_BYTES,
-        backupCount=settings.LOG_FILE_BACKUP_COUNT,
-        encoding='utf-8'
-    )
-    webhook_handler.setLevel(logging.DEBUG)
-    webhook_handler.setFormatter(file_format)
-    webhook_logger.addHandler(webhook_handler)
-    webhook_logger.addHandler(console_handler)
-    webhook_logger.setLevel(logging.DEBUG)
+    if settings.LOG_FORMAT == "json":
+        json_format = JsonFormatter()
+        for handler in handlers:
+            handler.setFormatter(json_format)
     
-    # Telegram-specific logger
-    telegram_logger = logging.getLogger("telegram")
-    telegram_log_file = log_directory / "telegram.log"
-    telegram_handler = RotatingFileHandler(
-        telegram_log_file,
-        maxBytes=settings.LOG_FILE_MAX_BYTES,
-        backupCount=settings.LOG_FILE_BACKUP_COUNT,
-        encoding='utf-8'
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    root_logger.addHandler(queue_handler)
+    
+    _queue_listener = BatchingQueueListener(
+        log_queue,
+        *handlers,
+        queue_handler=queue_handler,
+        batch_size=settings.LOG_BATCH_SIZE,
     )
-    telegram_handler.setLevel(logging.DEBUG)
-    telegram_handler.setFormatter(file_format)
-    telegram_logger.addHandler(telegram_handler)
-    telegram_logger.addHandler(console_handler)
-    telegram_logger.setLevel(logging.DEBUG)
+    _queue_listener.start()
     
     logging.info(f"✅ Logging configured. Logs directory: {log_directory.absolute()}")
 
 
+def shutdown_logging() -> None:
+    """Write the queued records and stop the listener thread."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a specific module.
@@ -0,0 +1,310 @@
+"""
+Member Cache - workspace users indexed in memory for name and chat resolution.
+
+Loaded from the team users endpoint and list member endpoints, refreshed in
+the background on a TTL, so notifications resolve assignee names, emails and
+Telegram chats without per-user API calls.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from clickup_sdk import ClickUp
+
+from config.settings import get_settings
+from core.clickup_client import get_clickup_client
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Member:
+    """Workspace user."""
+
+    id: str
+    username: Optional[str] = None
+    email: Optional[str] = None
+    initials: Optional[str] = None
+
+    @property
+    def display_name(self) -> str:
+        """Name shown in notifications."""
+        return self.username or self.email or self.id
+
+
+def _iter_users(response: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """
+    Yield user dicts of a users or members response.
+
+    Team endpoints wrap users as {"members": [{"user": {...}}]} (or
+    {"team": {"members": ...}}), list members are plain user dicts.
+    """
+    members = response.get("members")
+    if members is None:
+        members = (response.get("team") or {}).get("members", [])
+    for item in members or []:
+        user = item.get("user", item) if isinstance(item, dict) else None
+        if user and user.get("id") is not None:
+            yield user
+
+
+class MemberCache:
+    """Workspace members indexed by ID, email and username."""
+
+    def __init__(
+        self,
+        client: ClickUp,
+        team_id: Any,
+        ttl: float = 600,
+        list_ids: Optional[List[str]] = None,
+        telegram_loader: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
+        telegram_miss_interval: float = 60,
+    ):
+        """
+        Initialize MemberCache.
+
+        Args:
+            client: ClickUp client
+            team_id: Team ID (Workspace ID)
+            ttl: Seconds before the members are loaded again
+            list_ids: Lists whose members are loaded as well (e.g. guests)
+            telegram_loader: Coroutine function returning user ID -> chat ID
+            telegram_miss_interval: Minimum seconds between telegram reloads
+                triggered by lookup misses
+        """
+        self.client = client
+        self.team_id = team_id
+        self.ttl = ttl
+        self.list_ids = list(list_ids or [])
+        self.telegram_loader = telegram_loader
+        self.telegram_miss_interval = telegram_miss_interval
+        self.loaded_at: Optional[float] = None
+        self._by_id: Dict[str, Member] = {}
+        self._by_email: Dict[str, Member] = {}
+        self._by_username: Dict[str, Member] = {}
+        # User ID -> chat ID, kept apart from the members so directory
+        # entries of users the cache does not know are not lost
+        self._telegram: Dict[str, Any] = {}
+        self._telegram_loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._telegram_lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the members were never loaded or are older than the TTL."""
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    def get(self, user_id: Any) -> Optional[Member]:
+        """
+        Get a member by ClickUp user ID.
+
+        Args:
+            user_id: ClickUp user ID
+
+        Returns:
+            Member or None if unknown
+        """
+        return self._by_id.get(str(user_id))
+
+    def get_by_email(self, email: str) -> Optional[Member]:
+        """Get a member by email (case-insensitive)."""
+        return self._by_email.get(email.strip().lower())
+
+    def get_by_username(self, username: str) -> Optional[Member]:
+        """Get a member by username (case-insensitive)."""
+        return self._by_username.get(username.strip().lower())
+
+    def telegram_id(self, user_id: Any) -> Any:
+        """
+        Get the Telegram chat ID of a user.
+
+        Args:
+            user_id: ClickUp user ID
+
+        Returns:
+            Chat ID or None if the user has no Telegram mapping
+        """
+        return self._telegram.get(str(user_id))
+
+    async def fetch_telegram_id(self, user_id: Any) -> Any:
+        """
+        Get the Telegram chat ID of a user, reloading the directory on a miss.
+
+        Reloads triggered by misses run at most once per telegram_miss_interval,
+        so users without a mapping do not reload the directory on every lookup.
+
+        Args:
+            user_id: ClickUp user ID
+
+        Returns:
+            Chat ID or None if the user has no Telegram mapping
+        """
+        telegram_id = self.telegram_id(user_id)
+        if telegram_id or self.telegram_loader is None:
+            return telegram_id
+
+        async with self._telegram_lock:
+            # Another lookup may have reloaded while this one waited
+            telegram_id = self.telegram_id(user_id)
+            if telegram_id or not self._telegram_reload_due():
+                return telegram_id
+            logger.debug(f"Telegram ID of user {user_id} not cached, reloading directory")
+            try:
+                self._set_telegram(await self.telegram_loader())
+            except Exception as e:
+                # Retry only after the interval, keep the previous mapping
+                self._telegram_loaded_at = time.monotonic()
+                logger.error(f"❌ Failed to load telegram directory: {e}")
+        return self.telegram_id(user_id)
+
+    def _telegram_reload_due(self) -> bool:
+        return (
+            self._telegram_loaded_at is None
+            or time.monotonic() - self._telegram_loaded_at >= self.telegram_miss_interval
+        )
+
+    def _set_telegram(self, telegram: Dict[str, Any]) -> None:
+        self._telegram = {str(user_id): chat_id for user_id, chat_id in telegram.items()}
+        self._telegram_loaded_at = time.monotonic()
+
+    def resolve(self, user: Any) -> Optional[Member]:
+        """
+        Find the member behind a (possibly partial) user reference.
+
+        Args:
+            user: User dict from a task or history item, user ID, email or username
+
+        Returns:
+            Member or None if unknown
+        """
+        if isinstance(user, dict):
+            member = self.get(user["id"]) if user.get("id") is not None else None
+            if member is None and user.get("email"):
+                member = self.get_by_email(user["email"])
+            if member is None and user.get("username"):
+                member = self.get_by_username(user["username"])
+            return member
+
+        if user is None:
+            return None
+        key = str(user)
+        return self.get(key) or self.get_by_email(key) or self.get_by_username(key)
+
+    async def refresh(self) -> int:
+        """
+        Load all members and replace the indexes.
+
+        The telegram mapping is replaced only when the directory loads, so a
+        failed load keeps the previous chats.
+
+        Returns:
+            Number of members
+        """
+        calls = [self.client.users.get_team_users(self.team_id)]
+        calls += [self.client.lists.get_list_members(list_id) for list_id in self.list_ids]
+        if self.telegram_loader is not None:
+            calls.append(self.telegram_loader())
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        team_response = results[0]
+        if isinstance(team_response, Exception):
+            # Fall back to the members embedded in the authorized workspaces
+            logger.warning(f"⚠️ Team users request failed, using workspaces: {team_response}")
+            teams = await self.client.get_teams()
+            team_response = next(
+                (
+                    team for team in teams.get("teams", [])
+                    if str(team.get("id")) == str(self.team_id)
+                ),
+                {},
+            )
+
+        if self.telegram_loader is not None:
+            telegram_result = results.pop()
+            if isinstance(telegram_result, Exception):
+                logger.error(
+                    f"❌ Failed to load telegram directory, keeping "
+                    f"{len(self._telegram)} previous entries: {telegram_result}"
+                )
+            else:
+                self._set_telegram(telegram_result)
+
+        users: Dict[str, Dict[str, Any]] = {}
+        for list_id, response in zip(self.list_ids, results[1:]):
+            if isinstance(response, Exception):
+                logger.error(f"❌ Failed to load members of list {list_id}: {response}")
+                continue
+            for user in _iter_users(response):
+                users.setdefault(str(user["id"]), user)
+        # Team users win over list members
+        for user in _iter_users(team_response):
+            users[str(user["id"])] = user
+
+        by_id: Dict[str, Member] = {}
+        by_email: Dict[str, Member] = {}
+        by_username: Dict[str, Member] = {}
+        for user_id, user in users.items():
+            member = Member(
+                id=user_id,
+                username=user.get("username"),
+                email=user.get("email"),
+                initials=user.get("initials"),
+            )
+            by_id[user_id] = member
+            if member.email:
+                by_email[member.email.lower()] = member
+            if member.username:
+                by_username.setdefault(member.username.lower(), member)
+
+        self._by_id, self._by_email, self._by_username = by_id, by_email, by_username
+        self.loaded_at = time.monotonic()
+        logger.info(f"👥 Loaded {len(by_id)} workspace member(s)")
+        return len(by_id)
+
+    async def ensure_fresh(self) -> None:
+        """Refresh the members if they are stale (concurrent callers share one load)."""
+        if not self.is_stale:
+            return
+        async with self._lock:
+            if self.is_stale:
+                await self.refresh()
+
+    async def run(self) -> None:
+        """Refresh the members forever, every TTL seconds."""
+        while True:
+            try:
+                await self.ensure_fresh()
+            except Exception as e:
+                logger.error(f"❌ Member cache refresh failed: {e}", exc_info=True)
+            await asyncio.sleep(self.ttl)
+
+
+# Global member cache instance
+_member_cache: Optional[MemberCache] = None
+
+
+def get_member_cache() -> MemberCache:
+    """
+    Get or create global MemberCache instance.
+
+    Returns:
+        MemberCache instance
+    """
+    global _member_cache
+    if _member_cache is None:
+        # Imported here: the directory module builds on core modules
+        from clickup.utils.telegram_directory import load_telegram_directory
+
+        settings = get_settings()
+        _member_cache = MemberCache(
+            get_clickup_client(),
+            settings.TEAM_ID,
+            ttl=settings.MEMBER_CACHE_TTL,
+            list_ids=settings.MEMBER_CACHE_LIST_IDS,
+            telegram_loader=load_telegram_directory,
+            telegram_miss_interval=settings.MEMBER_CACHE_TELEGRAM_MISS_INTERVAL,
+        )
+    return _member_cache
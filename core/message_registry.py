@@ -0,0 +1,209 @@
+"""
+Registry of Telegram messages sent per task.
+
+Maps (task_id, chat_id, kind) to the message_id returned by Telegram, so a
+later change of the same task can edit the message instead of sending a
+new one. Also records which sent messages carry inline buttons for which
+task, so button callbacks can be checked against messages the bot sent.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Set
+from urllib.parse import parse_qsl
+
+from config.settings import get_settings
+from core.logging_config import get_logger
+from core.storage import open_database
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_messages (
+    task_id TEXT NOT NULL,
+    chat_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY (task_id, chat_id, kind)
+);
+CREATE TABLE IF NOT EXISTS button_messages (
+    chat_id TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    task_id TEXT NOT NULL,
+    sent_at INTEGER NOT NULL,
+    PRIMARY KEY (chat_id, message_id, task_id)
+);
+"""
+
+
+def button_task_ids(reply_markup: Optional[Dict[str, Any]]) -> Set[str]:
+    """
+    Get the task IDs of the callback buttons of an inline keyboard.
+
+    Args:
+        reply_markup: Inline keyboard markup
+
+    Returns:
+        Task IDs named in callback_data ("<action>=<task_id>&...")
+    """
+    task_ids: Set[str] = set()
+    rows: Iterable = (reply_markup or {}).get("inline_keyboard") or []
+    for row in rows:
+        for button in row:
+            pairs = parse_qsl(button.get("callback_data") or "", keep_blank_values=True)
+            if pairs and pairs[0][1]:
+                task_ids.add(pairs[0][1])
+    return task_ids
+
+
+@dataclass(frozen=True)
+class MessageKey:
+    """Identifies the tracked message of a task (e.g. the "broker" message)."""
+
+    task_id: str
+    kind: str
+
+
+class MessageRegistry:
+    """SQLite backed (task_id, chat_id, kind) -> message_id mapping."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize MessageRegistry.
+
+        Args:
+            db_path: SQLite database path
+        """
+        self._db = open_database(db_path)
+        self._db.executescript(SCHEMA)
+
+    def get(self, key: MessageKey, chat_id: Any) -> Optional[int]:
+        """
+        Get tracked message ID.
+
+        Args:
+            key: Task and notification kind
+            chat_id: Telegram chat ID
+
+        Returns:
+            Telegram message ID, or None if no message is tracked
+        """
+        row = self._db.execute(
+            "SELECT message_id FROM task_messages "
+            "WHERE task_id = ? AND chat_id = ? AND kind = ?",
+            (key.task_id, str(chat_id), key.kind),
+        ).fetchone()
+        return row["message_id"] if row else None
+
+    def get_all(self, key: MessageKey) -> Dict[str, int]:
+        """
+        Get every tracked message of a task and kind.
+
+        Args:
+            key: Task and notification kind
+
+        Returns:
+            Mapping of chat ID (as string) to message ID
+        """
+        rows = self._db.execute(
+            "SELECT chat_id, message_id FROM task_messages WHERE task_id = ? AND kind = ?",
+            (key.task_id, key.kind),
+        ).fetchall()
+        return {row["chat_id"]: row["message_id"] for row in rows}
+
+    def set(self, key: MessageKey, chat_id: Any, message_id: int) -> None:
+        """
+        Track a sent message.
+
+        Args:
+            key: Task and notification kind
+            chat_id: Telegram chat ID
+            message_id: Telegram message ID
+        """
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO task_messages "
+                "(task_id, chat_id, kind, message_id, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (key.task_id, str(chat_id), key.kind, message_id, int(time.time())),
+            )
+        logger.debug(
+            f"Tracking message {message_id} in chat {chat_id} for {key.kind} of task {key.task_id}"
+        )
+
+    def delete(self, key: MessageKey, chat_id: Any) -> None:
+        """
+        Stop tracking a message (e.g. after it was deleted in Telegram).
+
+        Args:
+            key: Task and notification kind
+            chat_id: Telegram chat ID
+        """
+        with self._db:
+            self._db.execute(
+                "DELETE FROM task_messages WHERE task_id = ? AND chat_id = ? AND kind = ?",
+                (key.task_id, str(chat_id), key.kind),
+            )
+
+    def track_buttons(
+        self, chat_id: Any, message_id: Optional[int], reply_markup: Optional[Dict[str, Any]]
+    ) -> None:
+        """
+        Record the task buttons of a sent or edited message.
+
+        Args:
+            chat_id: Telegram chat ID
+            message_id: Telegram message ID
+            reply_markup: Inline keyboard markup of the message
+        """
+        task_ids = button_task_ids(reply_markup)
+        if message_id is None or not task_ids:
+            return
+        now = int(time.time())
+        with self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO button_messages "
+                "(chat_id, message_id, task_id, sent_at) VALUES (?, ?, ?, ?)",
+                [(str(chat_id), message_id, task_id, now) for task_id in task_ids],
+            )
+
+    def has_button(self, task_id: str, chat_id: Any, message_id: Optional[int]) -> bool:
+        """
+        Check that a message the bot sent carries a button for the task.
+
+        Args:
+            task_id: ClickUp task ID of the button
+            chat_id: Telegram chat ID of the message
+            message_id: Telegram message ID
+
+        Returns:
+            True if the message was recorded with buttons for the task, or is
+            a tracked task message (sent before buttons were recorded)
+        """
+        if chat_id is None or message_id is None:
+            return False
+        row = self._db.execute(
+            "SELECT 1 FROM button_messages "
+            "WHERE chat_id = ? AND message_id = ? AND task_id = ? "
+            "UNION ALL SELECT 1 FROM task_messages "
+            "WHERE chat_id = ? AND message_id = ? AND task_id = ? LIMIT 1",
+            (str(chat_id), message_id, task_id) * 2,
+        ).fetchone()
+        return row is not None
+
+
+# Global registry instance
+_message_registry: Optional[MessageRegistry] = None
+
+
+def get_message_registry() -> MessageRegistry:
+    """
+    Get or create global MessageRegistry instance.
+
+    Returns:
+        MessageRegistry instance
+    """
+    global _message_registry
+    if _message_registry is None:
+        _message_registry = MessageRegistry(get_settings().TELEGRAM_MESSAGE_REGISTRY_DB)
+    return _message_registry
@@ -0,0 +1,236 @@
+"""
+Idempotent notification ledger.
+
+Records which logical notifications were already delivered, so webhook
+redeliveries, handler retries and restarts do not send the same Telegram
+message twice. A notification is identified by
+(handler, task_id, recipient, change id).
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from config.settings import get_settings
+from core.logging_config import get_logger
+from core.storage import open_database
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sent_notifications (
+    notification_key TEXT PRIMARY KEY,
+    message_id INTEGER,
+    sent_at INTEGER NOT NULL
+);
+"""
+
+@dataclass(frozen=True)
+class IdempotencyKey:
+    """Identifies a logical notification independently of its recipients."""
+
+    handler: str
+    task_id: str
+    change_id: str
+
+    @classmethod
+    def from_event(cls, handler: str, event: Any) -> Optional["IdempotencyKey"]:
+        """
+        Build key from a webhook event.
+
+        The change ID is taken from the event's history item IDs, which stay
+        the same when ClickUp redelivers the webhook.
+
+        Args:
+            handler: Handler name
+            event: WebhookEvent
+
+        Returns:
+            IdempotencyKey, or None if the event carries no history item IDs
+        """
+        history_ids = [
+            str(item["id"])
+            for item in event.history_items or []
+            if isinstance(item, dict) and item.get("id")
+        ]
+        if not event.task_id or not history_ids:
+            return None
+        return cls(handler, str(event.task_id), ",".join(history_ids))
+
+    def for_recipient(self, chat_id: Any) -> str:
+        """
+        Get ledger key for one recipient.
+
+        Args:
+            chat_id: Telegram chat ID
+
+        Returns:
+            Ledger key string
+        """
+        return f"{self.handler}:{self.task_id}:{chat_id}:{self.change_id}"
+
+
+class NotificationLedger:
+    """
+    Two-phase ledger of delivered notifications.
+
+    Usage:
+        if ledger.claim(key):
+            message = await send(...)
+            if message:
+                ledger.commit(key, message["message_id"])
+            else:
+                ledger.release(key)
+    """
+
+    def __init__(self, db_path: str, cache_size: int, claim_timeout: float = 300):
+        """
+        Initialize NotificationLedger.
+
+        Args:
+            db_path: SQLite database path
+            cache_size: Number of recently sent keys kept in memory
+            claim_timeout: Seconds after which an unsettled claim expires and
+                the notification may be delivered again
+        """
+        self.cache_size = cache_size
+        self.claim_timeout = claim_timeout
+        # Recently sent keys (LRU) and in-flight claims with their claim time
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._pending: Dict[str, float] = {}
+        self._last_expiry = time.monotonic()
+        self._db = open_database(db_path)
+        self._db.executescript(SCHEMA)
+
+    def _remember_sent(self, key: str) -> None:
+        self._recent[key] = None
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+
+    def _expire_claims(self, now: float) -> None:
+        """Drop claims whose send never settled (checked once per claim_timeout)."""
+        if now - self._last_expiry < self.claim_timeout:
+            return
+        self._last_expiry = now
+        expired = [
+            key for key, claimed_at in self._pending.items()
+            if now - claimed_at >= self.claim_timeout
+        ]
+        for key in expired:
+            del self._pending[key]
+        if expired:
+            logger.warning(f"⚠️ Expired {len(expired)} unsettled notification claim(s)")
+
+    def claim(self, key: str) -> bool:
+        """
+        Reserve a notification before sending it.
+
+        Runs without awaiting, so it is atomic within the event loop.
+
+        Args:
+            key: Ledger key
+
+        Returns:
+            True if the caller should send, False if it was already sent or
+            another send is in flight
+        """
+        now = time.monotonic()
+        self._expire_claims(now)
+        claimed_at = self._pending.get(key)
+        if claimed_at is not None:
+            if now - claimed_at < self.claim_timeout:
+                return False
+            logger.warning(f"⚠️ Claim {key} was never settled, allowing redelivery")
+
+        if key in self._recent:
+            self._recent.move_to_end(key)
+            return False
+
+        row = self._db.execute(
+            "SELECT 1 FROM sent_notifications WHERE notification_key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self._remember_sent(key)
+            return False
+
+        self._pending[key] = now
+        return True
+
+    def commit(self, key: str, message_id: Optional[int] = None) -> None:
+        """
+        Record a notification as delivered after Telegram confirmed it.
+
+        Args:
+            key: Ledger key
+            message_id: Telegram message ID
+        """
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sent_notifications "
+                "(notification_key, message_id, sent_at) VALUES (?, ?, ?)",
+                (key, message_id, int(time.time())),
+            )
+        self._pending.pop(key, None)
+        self._remember_sent(key)
+
+    def release(self, key: str) -> None:
+        """
+        Drop a claim after a failed send so a retry can deliver it.
+
+        Args:
+            key: Ledger key
+        """
+        self._pending.pop(key, None)
+
+    def prune(self, max_age: float) -> int:
+        """
+        Delete ledger rows older than max_age seconds.
+
+        Args:
+            max_age: Retention in seconds
+
+        Returns:
+            Number of deleted rows
+        """
+        with self._db:
+            cursor = self._db.execute(
+                "DELETE FROM sent_notifications WHERE sent_at < ?",
+                (int(time.time() - max_age),),
+            )
+        logger.debug(f"🧹 Pruned {cursor.rowcount} notification ledger entries")
+        return cursor.rowcount
+
+
+# Global ledger instance
+_ledger: Optional[NotificationLedger] = None
+
+
+def get_notification_ledger() -> NotificationLedger:
+    """
+    Get or create global NotificationLedger instance.
+
+    Returns:
+        NotificationLedger instance
+    """
+    global _ledger
+    if _ledger is None:
+        settings = get_settings()
+        _ledger = NotificationLedger(
+            settings.NOTIFICATION_LEDGER_DB,
+            settings.NOTIFICATION_LEDGER_CACHE_SIZE,
+            claim_timeout=settings.NOTIFICATION_CLAIM_TIMEOUT,
+        )
+    return _ledger
+
+
+async def prune_notification_ledger() -> Dict[str, int]:
+    """
+    Job: delete ledger rows older than NOTIFICATION_LEDGER_RETENTION.
+
+    Returns:
+        Run summary (deleted rows)
+    """
+    deleted = get_notification_ledger().prune(get_settings().NOTIFICATION_LEDGER_RETENTION)
+    return {"deleted": deleted}
@@ -0,0 +1,277 @@
+"""
+Notification fan-out - deliver one notification to many Telegram recipients.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from core.logging_config import get_logger
+from core.message_registry import MessageKey, get_message_registry
+from core.notification_ledger import IdempotencyKey, get_notification_ledger
+from core.telegram_bot import Priority, edit_message_text_async, send_message_async
+from core.telegram_digest import get_digest_buffer
+
+logger = get_logger(__name__)
+
+# Maximum number of Telegram sends running at the same time
+DEFAULT_CONCURRENCY = 8
+
+
+@dataclass
+class Recipient:
+    """Notification recipient."""
+
+    chat_id: Union[int, str]
+    name: str = ""
+    context: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Notification:
+    """Rendered notification for a single recipient."""
+
+    text: str
+    reply_markup: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of delivering a notification to a recipient."""
+
+    recipient: Recipient
+    success: bool
+    error: Optional[str] = None
+    message: Optional[Dict[str, Any]] = None
+    queued: bool = False
+    duplicate: bool = False
+    edited: bool = False
+
+
+def normalize_chat_id(raw_chat_id: Any) -> Any:
+    """
+    Normalize chat ID to int when possible.
+    """
+    if raw_chat_id is None:
+        return None
+
+    try:
+        return int(str(raw_chat_id).strip())
+    except (ValueError, TypeError):
+        return str(raw_chat_id).strip()
+
+
+def _settle(ledger_key: str, message: Optional[Dict[str, Any]]) -> None:
+    """Commit a delivered notification to the ledger, or release a failed one."""
+    ledger = get_notification_ledger()
+    if message is None:
+        ledger.release(ledger_key)
+    else:
+        ledger.commit(ledger_key, message.get("message_id"))
+
+
+async def _deliver(
+    recipient: Recipient,
+    render: Callable[[Recipient], Notification],
+    semaphore: asyncio.Semaphore,
+    priority: Priority,
+    digest: bool,
+    idempotency_key: Optional[IdempotencyKey],
+    message_key: Optional[MessageKey],
+) -> DeliveryResult:
+    """Render and send a notification to one recipient."""
+    ledger = get_notification_ledger() if idempotency_key else None
+    ledger_key = idempotency_key.for_recipient(recipient.chat_id) if ledger else None
+    if ledger is not None and not ledger.claim(ledger_key):
+        return DeliveryResult(recipient, True, duplicate=True)
+
+    try:
+        notification = render(recipient)
+    except Exception as e:
+        logger.error(
+            f"❌ Failed to render notification for chat {recipient.chat_id}: {e}",
+            exc_info=True,
+        )
+        if ledger is not None:
+            ledger.release(ledger_key)
+        return DeliveryResult(recipient, False, f"render failed: {e}")
+
+    registry = get_message_registry() if message_key else None
+    message_id = registry.get(message_key, recipient.chat_id) if registry else None
+    if message_id is not None:
+        async with semaphore:
+            message = await edit_message_text_async(
+                recipient.chat_id,
+                message_id,
+                notification.text,
+                reply_markup=notification.reply_markup,
+                priority=priority,
+            )
+        if message is not None:
+            if ledger is not None:
+                _settle(ledger_key, message)
+            return DeliveryResult(recipient, True, message=message, edited=True)
+        # Message was deleted or can no longer be edited - send a new one
+        registry.delete(message_key, recipient.chat_id)
+
+    digest_buffer = get_digest_buffer() if digest else None
+    if digest_buffer is not None:
+        future = digest_buffer.add(
+            recipient.chat_id, notification.text, reply_markup=notification.reply_markup
+        )
+        if ledger is not None:
+            future.add_done_callback(
+                lambda done: _settle(
+                    ledger_key, None if done.cancelled() else done.result()
+                )
+            )
+        return DeliveryResult(recipient, True, queued=True)
+
+    async with semaphore:
+        message = await send_message_async(
+            recipient.chat_id,
+            notification.text,
+            reply_markup=notification.reply_markup,
+            priority=priority,
+        )
+    if ledger is not None:
+        _settle(ledger_key, message)
+    if message is None:
+        return DeliveryResult(recipient, False, "send failed")
+    if registry is not None:
+        registry.set(message_key, recipient.chat_id, message["message_id"])
+    return DeliveryResult(recipient, True, message=message)
+
+
+async def fan_out(
+    recipients: Sequence[Recipient],
+    render: Callable[[Recipient], Notification],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    priority: Priority = Priority.NORMAL,
+    digest: bool = False,
+    idempotency_key: Optional[IdempotencyKey] = None,
+    message_key: Optional[MessageKey] = None,
+) -> List[DeliveryResult]:
+    """
+    Deliver a notification to all recipients concurrently.
+
+    Duplicate chat IDs are delivered once. With an idempotency key, recipients
+    that already received this notification (per the notification ledger)
+    are skipped. With a message key, a recipient that already has a tracked
+    message for the task gets it edited in place instead of a new message;
+    new messages sent directly (not via digest) are tracked.
+
+    Args:
+        recipients: Resolved recipients
+        render: Builds the notification for a recipient
+        concurrency: Maximum number of sends in flight
+        priority: Outbound queue priority class
+        digest: Buffer into per-chat digests when digest mode is enabled
+        idempotency_key: Identifies the logical notification for the ledger
+        message_key: Task and kind of the tracked message to edit in place
+
+    Returns:
+        Delivery result for every unique recipient, in input order
+    """
+    unique: Dict[Any, Recipient] = {}
+    for recipient in recipients:
+        unique.setdefault(recipient.chat_id, recipient)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    return list(
+        await asyncio.gather(
+            *(
+                _deliver(
+                    recipient,
+                    render,
+                    semaphore,
+                    priority,
+                    digest,
+                    idempotency_key,
+                    message_key,
+                )
+                for recipient in unique.values()
+            )
+        )
+    )
+
+
+@dataclass
+class Delivery:
+    """One message of a batch: a rendered notification for a recipient."""
+
+    recipient: Recipient
+    notification: Notification
+    idempotency_key: Optional[IdempotencyKey] = None
+
+
+async def deliver_batch(
+    deliveries: Sequence[Delivery],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    priority: Priority = Priority.LOW,
+) -> List[DeliveryResult]:
+    """
+    Deliver prepared notifications (several per chat allowed) concurrently.
+
+    Args:
+        deliveries: Notifications with their recipients
+        concurrency: Maximum number of sends in flight
+        priority: Outbound queue priority class
+
+    Returns:
+        Delivery result for every delivery, in input order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    return list(
+        await asyncio.gather(
+            *(
+                _deliver(
+                    delivery.recipient,
+                    lambda recipient, notification=delivery.notification: notification,
+                    semaphore,
+                    priority,
+                    False,
+                    delivery.idempotency_key,
+                    None,
+                )
+                for delivery in deliveries
+            )
+        )
+    )
+
+
+def log_delivery_results(results: Sequence[DeliveryResult], task_id: Optional[str]) -> None:
+    """
+    Log per-recipient delivery outcomes.
+
+    Args:
+        results: Results returned by fan_out
+        task_id: Task the notification is about
+    """
+    for result in results:
+        recipient = result.recipient
+        if result.duplicate:
+            logger.info(
+                f"⏭️ Skipping duplicate notification to {recipient.name or recipient.chat_id} "
+                f"(Telegram ID: {recipient.chat_id}) for task {task_id}"
+            )
+        elif result.edited:
+            logger.info(
+                f"✏️ Message updated for {recipient.name or recipient.chat_id} "
+                f"(Telegram ID: {recipient.chat_id}) for task {task_id}"
+            )
+        elif result.queued:
+            logger.info(
+                f"📥 Message queued for digest to {recipient.name or recipient.chat_id} "
+                f"(Telegram ID: {recipient.chat_id}) for task {task_id}"
+            )
+        elif result.success:
+            logger.info(
+                f"✅ Message sent to {recipient.name or recipient.chat_id} "
+                f"(Telegram ID: {recipient.chat_id}) for task {task_id}"
+            )
+        else:
+            logger.error(
+                f"❌ Failed to send message to Telegram ID {recipient.chat_id} "
+                f"for task {task_id}: {result.error}"
+            )
@@ -0,0 +1,36 @@
+"""
+SQLite storage helpers shared by local state components.
+"""
+import sqlite3
+from pathlib import Path
+from typing import List
+
+# Connections opened by open_database, closed by close_databases on shutdown
+_connections: List[sqlite3.Connection] = []
+
+
+def open_database(path: str) -> sqlite3.Connection:
+    """
+    Open (and create if needed) a SQLite database for local state.
+
+    Args:
+        path: Database file path. Parent directories are created automatically.
+
+    Returns:
+        SQLite connection with WAL journaling enabled
+    """
+    if path != ":memory:":
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    _connections.append(connection)
+    return connection
+
+
+def close_databases() -> None:
+    """Close every connection opened by open_database."""
+    while _connections:
+        _connections.pop().close()
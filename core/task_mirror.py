@@ -0,0 +1,474 @@
+"""
+Task Mirror - local SQLite replica of ClickUp tasks kept current by webhooks.
+"""
+
+import asyncio
+import json
+import sqlite3
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from clickup_sdk import (
+    ClickUp,
+    CursorStore,
+    TaskChange,
+    TaskSyncEngine,
+    WebhookDispatcher,
+    WebhookEvent,
+)
+
+from config.settings import get_settings
+from core.clickup_client import get_clickup_client
+from core.logging_config import get_logger
+from core.storage import open_database
+from utils.get_curstom_field_value import get_custom_field_value
+
+logger = get_logger(__name__)
+
+# Events that change task data and trigger a refresh of the mirrored task
+REFRESH_EVENTS: List[str] = [
+    "taskCreated",
+    "taskUpdated",
+    "taskStatusUpdated",
+    "taskAssigneeUpdated",
+    "taskMoved",
+]
+DELETE_EVENTS: List[str] = ["taskDeleted"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    list_id TEXT,
+    status TEXT,
+    date_updated INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_list ON tasks(list_id);
+CREATE TABLE IF NOT EXISTS custom_fields (
+    task_id TEXT NOT NULL,
+    field_id TEXT NOT NULL,
+    name TEXT,
+    type TEXT,
+    value TEXT,
+    PRIMARY KEY (task_id, field_id)
+);
+CREATE TABLE IF NOT EXISTS relations (
+    task_id TEXT NOT NULL,
+    field_id TEXT NOT NULL,
+    related_task_id TEXT NOT NULL,
+    PRIMARY KEY (task_id, field_id, related_task_id)
+);
+CREATE INDEX IF NOT EXISTS idx_relations_related ON relations(related_task_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    cursor INTEGER NOT NULL
+);
+"""
+
+
+def _to_int(value: Any) -> int:
+    """Convert ClickUp millisecond timestamps (often strings) to int."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _extract_related_ids(value: Any) -> List[str]:
+    """Extract related task IDs from a relationship custom field value."""
+    if not isinstance(value, list):
+        return []
+    return [
+        str(item["id"]) for item in value if isinstance(item, dict) and item.get("id")
+    ]
+
+
+class _SyncStateCursorStore(CursorStore):
+    """Cursor store backed by the mirror's sync_state table."""
+
+    def __init__(self, db: sqlite3.Connection):
+        super().__init__()
+        self._db = db
+
+    def get(self, scope: str) -> Optional[int]:
+        row = self._db.execute(
+            "SELECT cursor FROM sync_state WHERE scope = ?", (scope,)
+        ).fetchone()
+        return row["cursor"] if row else None
+
+    def set(self, scope: str, cursor: int) -> None:
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state (scope, cursor) VALUES (?, ?)",
+                (scope, cursor),
+            )
+
+
+class TaskMirror:
+    """
+    Local replica of ClickUp tasks, custom field values and relations.
+
+    Tasks are kept in memory for fast reads and written through to SQLite so
+    the mirror survives restarts.
+
+    Usage:
+        mirror = TaskMirror("data/task_mirror.db", list_ids=["901413862325"])
+        mirror.register(dispatcher)
+        await mirror.bootstrap()
+        task = mirror.get_task("abc123")
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        client: Optional[ClickUp] = None,
+        list_ids: Optional[List[str]] = None,
+        team_id: Optional[str] = None,
+    ):
+        """
+        Initialize TaskMirror.
+
+        Args:
+            db_path: SQLite database path
+            client: ClickUp client. If None, uses the global client.
+            list_ids: Lists to mirror. If empty, the whole team is mirrored.
+            team_id: Team ID used when no list IDs are given
+        """
+        self._client = client
+        self.list_ids = list(list_ids or [])
+        self.team_id = team_id
+        self._db = open_database(db_path)
+        self._db.executescript(SCHEMA)
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._sync_engine: Optional[TaskSyncEngine] = None
+        self._listeners: List[Callable[[str, Optional[Dict[str, Any]]], None]] = []
+        self._load()
+
+    @property
+    def client(self) -> ClickUp:
+        """ClickUp client used for bootstrap and refreshes."""
+        if self._client is None:
+            self._client = get_clickup_client()
+        return self._client
+
+    def _load(self) -> None:
+        """Load mirrored tasks from SQLite into memory."""
+        for row in self._db.execute("SELECT id, data FROM tasks"):
+            self._tasks[row["id"]] = json.loads(row["data"])
+        logger.info(f"📦 Task mirror loaded {len(self._tasks)} task(s)")
+
+    @property
+    def sync_engine(self) -> TaskSyncEngine:
+        """Incremental sync engine feeding the mirror."""
+        if self._sync_engine is None:
+            engine = TaskSyncEngine(
+                self.client, cursor_store=_SyncStateCursorStore(self._db)
+            )
+            if self.list_ids:
+                for list_id in self.list_ids:
+                    engine.add_list(list_id)
+            elif self.team_id:
+                engine.add_team(self.team_id)
+            else:
+                raise ValueError("Either list_ids or team_id must be provided")
+            engine.subscribe(self._on_change)
+            self._sync_engine = engine
+        return self._sync_engine
+
+    def _on_change(self, change: TaskChange) -> None:
+        self.upsert_task(change.task)
+
+    def add_listener(
+        self, callback: Callable[[str, Optional[Dict[str, Any]]], None]
+    ) -> None:
+        """
+        Register a callback called after every mirror change.
+
+        Args:
+            callback: Called with (task_id, task); task is None when deleted
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, task_id: str, task: Optional[Dict[str, Any]]) -> None:
+        for callback in self._listeners:
+            try:
+                callback(task_id, task)
+            except Exception as e:
+                logger.error(f"❌ Task mirror listener failed: {e}", exc_info=True)
+
+    # Reads
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a mirrored task.
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            Task dictionary or None if the task is not mirrored
+        """
+        return self._tasks.get(task_id)
+
+    def iter_tasks(self, list_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over mirrored tasks.
+
+        Args:
+            list_id: Only yield tasks from this list (optional)
+
+        Yields:
+            Task dictionaries
+        """
+        for task in list(self._tasks.values()):
+            if list_id is None or task.get("list", {}).get("id") == list_id:
+                yield task
+
+    def get_custom_field_value(self, task_id: str, field_name: str) -> Optional[Any]:
+        """Get a custom field value of a mirrored task by field name."""
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        return get_custom_field_value(task, field_name)
+
+    def get_referencing_task_ids(self, related_task_id: str) -> List[str]:
+        """
+        Get IDs of tasks whose relationship fields point at the given task.
+
+        Args:
+            related_task_id: Related task ID
+
+        Returns:
+            List of task IDs
+        """
+        rows = self._db.execute(
+            "SELECT DISTINCT task_id FROM relations WHERE related_task_id = ?",
+            (related_task_id,),
+        )
+        return [row["task_id"] for row in rows]
+
+    # Writes
+
+    def upsert_task(self, task: Dict[str, Any]) -> bool:
+        """
+        Insert or replace a task together with its custom fields and relations.
+
+        A task older than the stored one (by date_updated) is ignored, so a
+        catch-up page fetched before a webhook refresh cannot overwrite it.
+
+        Args:
+            task: Task dictionary as returned by the ClickUp API
+
+        Returns:
+            True if the task was stored, False if the stored task is newer
+        """
+        task_id = task.get("id")
+        if not task_id:
+            return False
+
+        date_updated = _to_int(task.get("date_updated"))
+        current = self._tasks.get(task_id)
+        if current is not None and _to_int(current.get("date_updated")) > date_updated:
+            logger.debug(f"Task mirror kept newer copy of task {task_id}")
+            return False
+
+        status = task.get("status", {})
+        status_name = status.get("status") if isinstance(status, dict) else None
+        list_id = task.get("list", {}).get("id")
+
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO tasks (id, list_id, status, date_updated, data) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET list_id = excluded.list_id, "
+                "status = excluded.status, date_updated = excluded.date_updated, "
+                "data = excluded.data "
+                "WHERE excluded.date_updated >= tasks.date_updated",
+                (
+                    task_id,
+                    list_id,
+                    status_name,
+                    date_updated,
+                    json.dumps(task, ensure_ascii=False),
+                ),
+            )
+            if cursor.rowcount == 0:
+                logger.debug(f"Task mirror kept newer copy of task {task_id}")
+                return False
+            self._db.execute("DELETE FROM custom_fields WHERE task_id = ?", (task_id,))
+            self._db.execute("DELETE FROM relations WHERE task_id = ?", (task_id,))
+            for cf in task.get("custom_fields", []) or []:
+                if not isinstance(cf, dict) or not cf.get("id"):
+                    continue
+                value = cf.get("value")
+                self._db.execute(
+                    "INSERT OR REPLACE INTO custom_fields "
+                    "(task_id, field_id, name, type, value) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        task_id,
+                        cf["id"],
+                        cf.get("name"),
+                        cf.get("type"),
+                        json.dumps(value, ensure_ascii=False),
+                    ),
+                )
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO relations "
+                    "(task_id, field_id, related_task_id) VALUES (?, ?, ?)",
+                    [
+                        (task_id, cf["id"], related_id)
+                        for related_id in _extract_related_ids(value)
+                    ],
+                )
+
+        self._tasks[task_id] = task
+        self._notify(task_id, task)
+        return True
+
+    def delete_task(self, task_id: str) -> None:
+        """
+        Remove a task from the mirror.
+
+        Args:
+            task_id: Task ID
+        """
+        with self._db:
+            self._db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            self._db.execute("DELETE FROM custom_fields WHERE task_id = ?", (task_id,))
+            self._db.execute("DELETE FROM relations WHERE task_id = ?", (task_id,))
+        self._tasks.pop(task_id, None)
+        self._notify(task_id, None)
+
+    # Synchronization
+
+    async def bootstrap(self) -> None:
+        """
+        Load every task of the mirrored scopes.
+
+        Scopes that were already synchronized are only caught up.
+        """
+        for scope in self.sync_engine.scopes:
+            count = await self.sync_engine.sync_scope(scope)
+            logger.info(f"✅ Task mirror synced {count} task(s) for {scope}")
+
+    async def catch_up(self) -> int:
+        """
+        Fetch tasks updated since the last sync to heal missed webhooks.
+
+        Returns:
+            Number of refreshed tasks
+        """
+        total = await self.sync_engine.sync()
+        if total:
+            logger.info(f"🔄 Task mirror caught up {total} task(s)")
+        return total
+
+    async def refresh_task(self, task_id: str) -> None:
+        """
+        Re-fetch a single task from ClickUp and store it.
+
+        Args:
+            task_id: Task ID
+        """
+        try:
+            task = await self.client.tasks.get_task(task_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Task mirror could not refresh task {task_id}: {e}")
+            return
+
+        list_id = task.get("list", {}).get("id")
+        if self.list_ids and list_id not in self.list_ids:
+            self.delete_task(task_id)
+            return
+        self.upsert_task(task)
+
+    async def run(self, interval: int) -> None:
+        """
+        Bootstrap the mirror and run periodic catch-up forever.
+
+        Args:
+            interval: Seconds between catch-up passes
+        """
+        try:
+            await self.bootstrap()
+        except Exception as e:
+            logger.error(f"❌ Task mirror bootstrap failed: {e}", exc_info=True)
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.catch_up()
+            except Exception as e:
+                logger.error(f"❌ Task mirror catch-up failed: {e}", exc_info=True)
+
+    def register(self, dispatcher: WebhookDispatcher) -> None:
+        """
+        Register webhook handlers that keep the mirror current.
+
+        Args:
+            dispatcher: Webhook dispatcher
+        """
+
+        async def on_task_changed(event: WebhookEvent) -> None:
+            if event.task_id:
+                await self.refresh_task(event.task_id)
+
+        async def on_task_deleted(event: WebhookEvent) -> None:
+            if event.task_id:
+                self.delete_task(event.task_id)
+
+        for event_type in REFRESH_EVENTS:
+            dispatcher.register_handler(event_type, on_task_changed)
+        for event_type in DELETE_EVENTS:
+            dispatcher.register_handler(event_type, on_task_deleted)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+
+# Global mirror instance
+_task_mirror: Optional[TaskMirror] = None
+
+
+def get_task_mirror() -> Optional[TaskMirror]:
+    """
+    Get or create global TaskMirror instance.
+
+    Returns:
+        TaskMirror instance, or None if the mirror is disabled
+    """
+    global _task_mirror
+    settings = get_settings()
+    if not settings.TASK_MIRROR_ENABLED:
+        return None
+    if _task_mirror is None:
+        _task_mirror = TaskMirror(
+            settings.TASK_MIRROR_DB,
+            list_ids=settings.TASK_MIRROR_LIST_IDS,
+            team_id=settings.TEAM_ID,
+        )
+    return _task_mirror
+
+
+async def get_task(task_id: str) -> Dict[str, Any]:
+    """
+    Get a task from the mirror, falling back to the ClickUp API.
+
+    Args:
+        task_id: Task ID
+
+    Returns:
+        Task data
+    """
+    mirror = get_task_mirror()
+    if mirror is not None:
+        task = mirror.get_task(task_id)
+        if task is not None:
+            return task
+    return await get_clickup_client().tasks.get_task(task_id)
@@ -0,0 +1,541 @@
+"""
+Task Query - predicates and secondary indexes over the local task mirror.
+
+Usage:
+    query = get_task_query()
+    pending = (
+        StatusIs("pul tushishi kutilmoqda")
+        & FieldSet("Broker")
+        & FieldEmpty("Dogovor")
+    )
+    for task in query.select(pending):
+        ...
+
+    # Falls back to get_tasks(custom_fields=...) when no local index covers it
+    async for task in query.fetch(pending, list_id="901413862325"):
+        ...
+"""
+
+from collections import defaultdict
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from clickup_sdk import ClickUp
+
+from config.settings import get_settings
+from core.clickup_client import get_clickup_client
+from core.logging_config import get_logger
+from core.task_mirror import TaskMirror, get_task_mirror
+from utils.get_curstom_field_value import get_custom_field_value
+
+logger = get_logger(__name__)
+
+STATUS_INDEX = "status"
+ASSIGNEE_INDEX = "assignee"
+LIST_INDEX = "list"
+# Index key for custom fields without a value
+EMPTY = "__empty__"
+
+
+def _is_empty(value: Any) -> bool:
+    """Check if a custom field value is considered empty."""
+    if value is None:
+        return True
+    if isinstance(value, (list, dict, str)):
+        return len(value) == 0
+    return False
+
+
+def _value_keys(value: Any) -> List[str]:
+    """Index keys for a custom field value (one per related task for relations)."""
+    if _is_empty(value):
+        return [EMPTY]
+    if isinstance(value, list):
+        return [
+            str(item.get("id")) if isinstance(item, dict) else str(item)
+            for item in value
+        ]
+    if isinstance(value, dict):
+        return [str(value.get("id", value))]
+    return [str(value)]
+
+
+def _status_name(task: Dict[str, Any]) -> str:
+    status = task.get("status", {})
+    name = status.get("status", "") if isinstance(status, dict) else str(status)
+    return name.lower()
+
+
+class TaskIndex:
+    """
+    Secondary indexes (status, assignee, list, chosen custom fields) over tasks.
+    """
+
+    def __init__(self, indexed_fields: Optional[Iterable[str]] = None):
+        """
+        Initialize TaskIndex.
+
+        Args:
+            indexed_fields: Custom field names to index
+        """
+        self.indexed_fields: Set[str] = set(indexed_fields or [])
+        self.task_ids: Set[str] = set()
+        self.field_ids: Dict[str, str] = {}
+        self._indexes: Dict[str, Dict[str, Set[str]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        self._entries: Dict[str, List[Tuple[str, str]]] = {}
+
+    def _index_keys(self, task: Dict[str, Any]) -> List[Tuple[str, str]]:
+        keys = [(STATUS_INDEX, _status_name(task))]
+        keys.append((LIST_INDEX, str(task.get("list", {}).get("id", ""))))
+        for assignee in task.get("assignees", []) or []:
+            if isinstance(assignee, dict) and assignee.get("id") is not None:
+                keys.append((ASSIGNEE_INDEX, str(assignee["id"])))
+
+        present: Set[str] = set()
+        for cf in task.get("custom_fields", []) or []:
+            if not isinstance(cf, dict):
+                continue
+            name = cf.get("name")
+            if name and cf.get("id"):
+                self.field_ids[name] = cf["id"]
+            if name in self.indexed_fields and name not in present:
+                present.add(name)
+                for value_key in _value_keys(cf.get("value")):
+                    keys.append((f"field:{name}", value_key))
+        # Tasks without the field (e.g. lists that lack it) count as empty,
+        # like get_custom_field_value returning None
+        for name in self.indexed_fields - present:
+            keys.append((f"field:{name}", EMPTY))
+        return keys
+
+    def add(self, task: Dict[str, Any]) -> None:
+        """Index a task (replacing previous entries for it)."""
+        task_id = task.get("id")
+        if not task_id:
+            return
+        self.remove(task_id)
+        entries = self._index_keys(task)
+        for index_name, key in entries:
+            self._indexes[index_name][key].add(task_id)
+        self._entries[task_id] = entries
+        self.task_ids.add(task_id)
+
+    def remove(self, task_id: str) -> None:
+        """Drop all index entries of a task."""
+        for index_name, key in self._entries.pop(task_id, []):
+            bucket = self._indexes[index_name].get(key)
+            if bucket is not None:
+                bucket.discard(task_id)
+                if not bucket:
+                    del self._indexes[index_name][key]
+        self.task_ids.discard(task_id)
+
+    def on_change(self, task_id: str, task: Optional[Dict[str, Any]]) -> None:
+        """TaskMirror listener keeping the index current."""
+        if task is None:
+            self.remove(task_id)
+        else:
+            self.add(task)
+
+    def has_field(self, field_name: str) -> bool:
+        """Check whether a custom field is indexed."""
+        return field_name in self.indexed_fields
+
+    def lookup(self, index_name: str, key: str) -> Set[str]:
+        """Get IDs of tasks with the given index key."""
+        return self._indexes[index_name].get(key, set())
+
+    def lookup_filled(self, field_name: str) -> Set[str]:
+        """Get IDs of tasks whose indexed custom field has a value."""
+        return self.task_ids - self.lookup(f"field:{field_name}", EMPTY)
+
+
+class Predicate:
+    """Base class for task predicates. Combine with &, | and ~."""
+
+    def matches(self, task: Dict[str, Any]) -> bool:
+        """Check whether a task satisfies the predicate."""
+        raise NotImplementedError
+
+    def lookup(self, index: TaskIndex) -> Optional[Set[str]]:
+        """
+        Candidate task IDs from indexes.
+
+        Returns:
+            Superset of matching IDs, or None if the indexes can't answer
+        """
+        return None
+
+    def indexed(self, index: TaskIndex) -> bool:
+        """Check whether every custom field the predicate uses is indexed."""
+        return True
+
+    def remote_filters(self, field_ids: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        get_tasks arguments narrowing the server-side result.
+
+        Returns:
+            Dict with get_tasks kwargs (custom_fields as a list), or None
+        """
+        return None
+
+    def __and__(self, other: "Predicate") -> "And":
+        return And(self, other)
+
+    def __or__(self, other: "Predicate") -> "Or":
+        return Or(self, other)
+
+    def __invert__(self) -> "Predicate":
+        return Not(self)
+
+
+class StatusIs(Predicate):
+    """Task status is one of the given statuses."""
+
+    def __init__(self, *statuses: str):
+        self.statuses = [status.lower() for status in statuses]
+
+    def matches(self, task: Dict[str, Any]) -> bool:
+        return _status_name(task) in self.statuses
+
+    def lookup(self, index: TaskIndex) -> Optional[Set[str]]:
+        result: Set[str] = set()
+        for status in self.statuses:
+            result |= index.lookup(STATUS_INDEX, status)
+        return result
+
+    def remote_filters(self, field_ids: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        return {"statuses": list(self.statuses)}
+
+
+class AssigneeIs(Predicate):
+    """Task is assigned to the given user."""
+
+    def __init__(self, user_id: Any):
+        self.user_id = str(user_id)
+
+    def matches(self, task: Dict[str, Any]) -> bool:
+        return any(
+            isinstance(assignee, dict) and str(assignee.get("id")) == self.user_id
+            for assignee in task.get("assignees", []) or []
+        )
+
+    def lookup(self, index: TaskIndex) -> Optional[Set[str]]:
+        return set(index.lookup(ASSIGNEE_INDEX, self.user_id))
+
+    def remote_filters(self, field_ids: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        return {"assignees": [self.user_id]}
+
+
+class InList(Predicate):
+    """Task belongs to the given list."""
+
+    def __init__(self, list_id: str):
+        self.list_id = str(list_id)
+
+    def matches(self, task: Dict[str, Any]) -> bool:
+        return str(task.get("list", {}).get("id", "")) == self.list_id
+
+    def lookup(self, index: TaskIndex) -> Optional[Set[str]]:
+        return set(index.lookup(LIST_INDEX, self.list_id))
+
+    def remote_filters(self, field_ids: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        return {"list_id": self.list_id}
+
+
+class _FieldPredicate(Predicate):
+    """Base class for custom field predicates."""
+
+    def __init__(self, field_name: str, field_id: Optional[str] = None):
+        self.field_name = field_name
+        self.field_id = field_id
+
+    def indexed(self, index: TaskIndex) -> bool:
+        return index.has_field(self.field_name)
+
+    def _remote_field_id(self, field_ids: Dict[str, str]) -> Optional[str]:
+        return self.field_id or field_ids.get(self.field_name)
+
+    def _custom_field_filter(
+        self, field_ids: Dict[str, str], operator: str, value: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        field_id = self._remote_field_id(field_ids)
+        if not field_id:
+            return None
+        condition: Dict[str, Any] = {"field_id": field_id, "operator": operator}
+        if value is not None:
+            condition["value"] = value
+        return {"custom_fields": [condition]}
+
+
+class FieldEquals(_FieldPredicate):
+    """Custom field equals a value (or contains a related task ID)."""
+
+    def __init__(self, field_name: str, value: Any, field_id: Optional[str] = None):
+        super().__init__(field_name, field_id)
+        self.value = value
+
+    def matches(self, task: Dict[str, Any]) -> bool:
+        return str(self.value) in _value_keys(
+            get_custom_field_value(task, self.field_name)
+        )
+
+    def lookup(self, index: TaskIndex) -> Optional[Set[str]]:
+        if not index.has_field(self.field_name):
+            return None
+        return set(index.lookup(f"field:{self.field_name}", str(self.value)))
+
+    def remote_filters(self, field_ids: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        return self._custom_field_filter(field_ids, "=", self.value)
+
+
+class FieldSet(_FieldPredicate):
+    """Custom field has a value."""
+
+    def matches(self, task: Dict[str, Any]) -> bool:
+        return not _is_empty(get_custom_field_value(task, self.field_name))
+
+    def lookup(self, index: TaskIndex) -> Optional[Set[str]]:
+        if not index.has_field(self.field_name):
+            return None
+        return index.lookup_filled(self.field_name)
+
+    def remote_filters(self, field_ids: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        return self._custom_field_filter(field_ids, "IS NOT NULL")
+
+    def __invert__(self) -> Predicate:
+        return FieldEmpty(self.field_name, self.field_id)
+
+
+class FieldEmpty(_FieldPredicate):
+    """Custom field has no value."""
+
+    def matches(self, task: Dict[str, Any]) -> bool:
+        return _is_empty(get_custom_field_value(task, self.field_name))
+
+    def lookup(self, index: TaskIndex) -> Optional[Set[str]]:
+        if not index.has_field(self.field_name):
+            return None
+        return set(index.lookup(f"field:{self.field_name}", EMPTY))
+
+    def remote_filters(self, field_ids: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        return self._custom_field_filter(field_ids, "IS NULL")
+
+    def __invert__(self) -> Predicate:
+        return FieldSet(self.field_name, self.field_id)
+
+
+class And(Predicate):
+    """All predicates match."""
+
+    def __init__(self, *predicates: Predicate):
+        self.predicates: List[Predicate] = []
+        for predicate in predicates:
+            if isinstance(predicate, And):
+                self.predicates.extend(predicate.predicates)
+            else:
+                self.predicates.append(predicate)
+
+    def matches(self, task: Dict[str, Any]) -> bool:
+        return all(predicate.matches(task) for predicate in self.predicates)
+
+    def indexed(self, index: TaskIndex) -> bool:
+        return all(predicate.indexed(index) for predicate in self.predicates)
+
+    def lookup(self, index: TaskIndex) -> Optional[Set[str]]:
+        candidates = [predicate.lookup(index) for predicate in self.predicates]
+        known = sorted((c for c in candidates if c is not None), key=len)
+        if not known:
+            return None
+        result = set(known[0])
+        for candidate in known[1:]:
+            result &= candidate
+        return result
+
+    def remote_filters(self, field_ids: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        merged: Dict[str, Any] = {}
+        for predicate in self.predicates:
+            filters = predicate.remote_filters(field_ids)
+            if not filters:
+                continue
+            for key, value in filters.items():
+                if key in ("custom_fields", "statuses", "assignees") and key in merged:
+                    if key == "custom_fields":
+                        merged[key] = merged[key] + value
+                    else:
+                        # Intersection of two "one of" filters
+                        merged[key] = [v for v in merged[key] if v in value]
+                else:
+                    merged[key] = value
+        return merged or None
+
+
+class Or(Predicate):
+    """Any predicate matches."""
+
+    def __init__(self, *predicates: Predicate):
+        self.predicates = list(predicates)
+
+    def matches(self, task: Dict[str, Any]) -> bool:
+        return any(predicate.matches(task) for predicate in self.predicates)
+
+    def indexed(self, index: TaskIndex) -> bool:
+        return all(predicate.indexed(index) for predicate in self.predicates)
+
+    def lookup(self, index: TaskIndex) -> Optional[Set[str]]:
+        result: Set[str] = set()
+        for predicate in self.predicates:
+            candidate = predicate.lookup(index)
+            if candidate is None:
+                return None
+            result |= candidate
+        return result
+
+
+class Not(Predicate):
+    """Predicate does not match."""
+
+    def __init__(self, predicate: Predicate):
+        self.predicate = predicate
+
+    def matches(self, task: Dict[str, Any]) -> bool:
+        return not self.predicate.matches(task)
+
+    def indexed(self, index: TaskIndex) -> bool:
+        return self.predicate.indexed(index)
+
+
+class TaskQuery:
+    """
+    Query layer over the local task mirror with remote fallback.
+    """
+
+    def __init__(
+        self,
+        mirror: Optional[TaskMirror] = None,
+        indexed_fields: Optional[Iterable[str]] = None,
+        client: Optional[ClickUp] = None,
+    ):
+        """
+        Initialize TaskQuery.
+
+        Args:
+            mirror: Local task mirror. Without it every query goes remote.
+            indexed_fields: Custom field names to index
+            client: ClickUp client for remote queries. If None, uses the global client.
+        """
+        self.mirror = mirror
+        self._client = client
+        self.index = TaskIndex(indexed_fields)
+        if mirror is not None:
+            for task in mirror.iter_tasks():
+                self.index.add(task)
+            mirror.add_listener(self.index.on_change)
+
+    @property
+    def client(self) -> ClickUp:
+        if self._client is None:
+            self._client = get_clickup_client()
+        return self._client
+
+    def _covers(self, list_id: Optional[str]) -> bool:
+        """Check whether the mirror holds every task of the queried scope."""
+        if self.mirror is None:
+            return False
+        if not self.mirror.list_ids:
+            return True
+        return list_id is not None and list_id in self.mirror.list_ids
+
+    def select(self, predicate: Predicate) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over mirrored tasks matching the predicate.
+
+        Uses indexes to narrow candidates and scans the mirror otherwise.
+
+        Args:
+            predicate: Query predicate
+
+        Yields:
+            Matching task dictionaries
+        """
+        if self.mirror is None:
+            return
+
+        candidates = predicate.lookup(self.index)
+        if candidates is None:
+            tasks: Iterable[Optional[Dict[str, Any]]] = self.mirror.iter_tasks()
+        else:
+            tasks = (self.mirror.get_task(task_id) for task_id in list(candidates))
+
+        for task in tasks:
+            if task is not None and predicate.matches(task):
+                yield task
+
+    async def fetch(
+        self,
+        predicate: Predicate,
+        list_id: Optional[str] = None,
+        team_id: Optional[Any] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over tasks matching the predicate.
+
+        Answers from the local indexes when they cover the predicate,
+        otherwise pushes filters down into get_tasks and checks the rest locally.
+
+        Args:
+            predicate: Query predicate
+            list_id: List to query remotely
+            team_id: Team to query remotely (used when list_id is not given)
+
+        Yields:
+            Matching task dictionaries
+        """
+        if list_id is not None:
+            predicate = And(InList(list_id), predicate)
+
+        if self._covers(list_id) and predicate.indexed(self.index):
+            for task in self.select(predicate):
+                yield task
+            return
+
+        filters = predicate.remote_filters(self.index.field_ids) or {}
+        if "list_id" not in filters:
+            filters["team_id"] = team_id or get_settings().TEAM_ID
+        logger.debug(f"Pushing query down to get_tasks: {filters}")
+
+        async for task in self.client.tasks.iter_tasks(**filters):
+            if predicate.matches(task):
+                yield task
+
+
+# Global query instance
+_task_query: Optional[TaskQuery] = None
+
+
+def get_task_query() -> TaskQuery:
+    """
+    Get or create global TaskQuery instance over the task mirror.
+
+    Returns:
+        TaskQuery instance
+    """
+    global _task_query
+    if _task_query is None:
+        settings = get_settings()
+        _task_query = TaskQuery(
+            mirror=get_task_mirror(),
+            indexed_fields=settings.TASK_INDEX_FIELDS,
+        )
+    return _task_query
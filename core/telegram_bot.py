@@ -2,15 +2,51 @@
 Telegram bot utilities for sending messages and documents.
 """
 
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import PurePosixPath
+from typing import Optional, List, Dict, Any, Set, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+import aiohttp
 import requests
-from typing import Optional, List, Dict, Any, Union
 
 from config.settings import get_settings
 from core.logging_config import get_logger
+from core.message_registry import get_message_registry
+from core.telegram_file_cache import get_file_cache
 
 logger = get_logger(__name__)
 
 REQUEST_TIMEOUT = 10
+TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/{method}"
+# Idle per-chat buckets are dropped after this many seconds
+CHAT_BUCKET_IDLE_SECONDS = 60
+# Bot API error returned when an edit does not change the message
+MESSAGE_NOT_MODIFIED = "message is not modified"
+# Bot API 400 descriptions meaning a cached file_id can no longer be used
+INVALID_FILE_ID_ERRORS = (
+    "wrong file identifier",
+    "file reference expired",
+    "wrong remote file identifier",
+    "file_id_invalid",
+)
+# Bot API descriptions meaning Telegram could not download a document URL
+URL_FETCH_ERRORS = (
+    "failed to get http url content",
+    "wrong file identifier/http url specified",
+)
+
+# Streaming relay settings
+RELAY_CHUNK_SIZE = 64 * 1024
+RELAY_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=60)
+# Hosts that receive the ClickUp API token when relaying attachments
+CLICKUP_ATTACHMENT_HOSTS = ("clickup.com", "clickup-attachments.com")
 
 
 def create_inline_keyboard(buttons: List[List[Dict[str, str]]]) -> Dict[str, Any]:
@@ -28,6 +64,20 @@ def create_inline_keyboard(buttons: List[List[Dict[str, str]]]) -> Dict[str, Any
     return {"inline_keyboard": buttons}
 
 
+def _track_buttons(payload: Dict[str, Any], message: Optional[Dict[str, Any]]) -> None:
+    """Record the task buttons of a delivered message for callback checks."""
+    if message is None or not payload.get("reply_markup"):
+        return
+    try:
+        get_message_registry().track_buttons(
+            payload.get("chat_id"), message.get("message_id"), payload["reply_markup"]
+        )
+    except Exception as e:
+        logger.error(
+            f"❌ Failed to record buttons of message in chat {payload.get('chat_id')}: {e}"
+        )
+
+
 def send_message(
     chat_id: Union[int, str],
     text: str,
@@ -92,21 +142,80 @@ def send_message(
         return False
 
 
-def send_document_from_url(
+def _post_document(
+    chat_id: Union[int, str], payload: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Call sendDocument and return the decoded Telegram response.
+
+    Returns:
+        Telegram response dictionary, or None on transport errors
+    """
+    settings = get_settings()
+    telegram_api_url = f"https://api.telegram.org/bot{settings.BOT_TOKEN}/sendDocument"
+
+    try:
+        # URL yoki file_id yuborayotganimiz uchun json= kifoya (multipart shart emas)
+        resp = requests.post(telegram_api_url, json=payload, timeout=REQUEST_TIMEOUT)
+        # Telegram xatolarda ham JSON qaytaradi (masalan, eskirgan file_id uchun 400)
+        return resp.json()
+
+    except requests.exceptions.Timeout:
+        logger.error(f"⏱️ Timeout while sending document to chat {chat_id}")
+        return None
+    except requests.exceptions.RequestException as e:
+        logger.error(f"❌ Request error while sending document to chat {chat_id}: {e}")
+        return None
+    except Exception as e:
+        logger.error(
+            f"❌ Unexpected error while sending document to chat {chat_id}: {e}",
+            exc_info=True,
+        )
+        return None
+
+
+def _is_invalid_file_id(response_data: Dict[str, Any]) -> bool:
+    """
+    Check whether Telegram rejected a request because of its file_id.
+
+    Rate limits, blocked bots and server errors say nothing about the file_id,
+    so only a 400 naming an invalid or expired file identifier counts.
+    """
+    if response_data.get("error_code") != 400:
+        return False
+    description = str(response_data.get("description", "")).lower()
+    return any(error in description for error in INVALID_FILE_ID_ERRORS)
+
+
+def _is_url_fetch_error(response_data: Dict[str, Any]) -> bool:
+    """
+    Check whether Telegram failed a sendDocument because it could not fetch the URL.
+
+    Only then does uploading the file ourselves help; rate limits, blocked
+    chats or timeouts (where the document may already be delivered) do not.
+    """
+    description = str(response_data.get("description", "")).lower()
+    return any(error in description for error in URL_FETCH_ERRORS)
+
+
+def send_document_message(
     chat_id: Union[int, str],
     file_url: str,
     caption: Optional[str] = None,
     reply_markup: Optional[Dict[str, Any]] = None,
     parse_mode: str = "HTML",
     disable_content_type_detection: bool = False,
-) -> bool:
+    cache_key: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
     """
     Send a document (e.g. PDF) to Telegram chat using a direct URL.
 
     Telegram'ning sendDocument metodi `document` parametriga:
       - HTTP(S) URL
       - yoki allaqachon yuklangan faylning file_id
-    qabul qiladi. Biz bu funksiya orqali URL yuboramiz.
+    qabul qiladi. Birinchi muvaffaqiyatli yuborishdan keyin Telegram qaytargan
+    file_id keshlanadi va keyingi yuborishlarda URL o'rniga ishlatiladi.
+    Telegram eskirgan file_id'ni rad etsa, URL bilan qayta yuboriladi.
 
     Args:
         chat_id: Telegram chat ID
@@ -115,16 +224,14 @@ def send_document_from_url(
         reply_markup: Optional inline keyboard markup
         parse_mode: Caption parse mode (HTML or Markdown)
         disable_content_type_detection: Telegram'ga kontent turini aniqlamaslikni aytish
+        cache_key: file_id kesh kaliti (masalan, kontent hash). Default: file_url
 
     Returns:
-        True if document was sent successfully, False otherwise
+        Sent Telegram message object, or None if sending failed
     """
     if not file_url:
         logger.warning(f"Attempted to send empty file_url to chat {chat_id}")
-        return False
-
-    settings = get_settings()
-    telegram_api_url = f"https://api.telegram.org/bot{settings.BOT_TOKEN}/sendDocument"
+        return None
 
     payload: Dict[str, Any] = {
         "chat_id": chat_id,
@@ -141,35 +248,1034 @@ def send_document_from_url(
     if disable_content_type_detection:
         payload["disable_content_type_detection"] = True
 
-    try:
-        # URL yoki file_id yuborayotganimiz uchun json= kifoya (multipart shart emas)
-        resp = requests.post(telegram_api_url, json=payload, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
+    file_cache = get_file_cache()
+    cache_key = cache_key or file_url
+    cacheable = file_url.startswith(("http://", "https://"))
+    cached_file_id = file_cache.get(cache_key) if cacheable else None
+    if cached_file_id:
+        payload["document"] = cached_file_id
 
-        response_data = resp.json()
+    response_data = _post_document(chat_id, payload)
+    if response_data is None:
+        return None
 
-        if response_data.get("ok"):
-            logger.debug(
-                f"✅ Document sent successfully to chat {chat_id} from URL: {file_url}"
+    if cached_file_id and _is_invalid_file_id(response_data):
+        logger.warning(
+            f"⚠️ Cached file_id rejected for {file_url} "
+            f"({response_data.get('description')}), retrying with URL"
+        )
+        file_cache.delete(cache_key)
+        cached_file_id = None
+        payload["document"] = file_url
+        response_data = _post_document(chat_id, payload)
+        if response_data is None:
+            return None
+
+    if response_data.get("ok"):
+        logger.debug(
+            f"✅ Document sent successfully to chat {chat_id} from URL: {file_url}"
+        )
+        message = response_data.get("result", {})
+        file_id = message.get("document", {}).get("file_id")
+        if cacheable and file_id and file_id != cached_file_id:
+            file_cache.set(cache_key, file_id)
+        _track_buttons(payload, message)
+        return message
+
+    error_description = response_data.get("description", "Unknown error")
+    logger.error(
+        f"❌ Telegram API error while sending document to chat {chat_id}: "
+        f"{error_description}"
+    )
+    return None
+
+
+def send_document_from_url(
+    chat_id: Union[int, str],
+    file_url: str,
+    caption: Optional[str] = None,
+    reply_markup: Optional[Dict[str, Any]] = None,
+    parse_mode: str = "HTML",
+    disable_content_type_detection: bool = False,
+    cache_key: Optional[str] = None,
+) -> bool:
+    """
+    Send a document (e.g. PDF) to Telegram chat using a direct URL.
+
+    See send_document_message for details.
+
+    Returns:
+        True if document was sent successfully, False otherwise
+    """
+    message = send_document_message(
+        chat_id,
+        file_url,
+        caption=caption,
+        reply_markup=reply_markup,
+        parse_mode=parse_mode,
+        disable_content_type_detection=disable_content_type_detection,
+        cache_key=cache_key,
+    )
+    return message is not None
+
+
+class Priority(IntEnum):
+    """Outbound message priority classes (lower value is sent first)."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class TokenBucket:
+    """Token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize TokenBucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available (0 if available now)."""
+        self._refill(now)
+        wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        return max(wait, self.blocked_until - now)
+
+    def consume(self, now: float) -> None:
+        """Take one token."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds: float) -> None:
+        """Block the bucket, e.g. after a 429 response with retry_after."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+@dataclass(order=True)
+class _OutboundItem:
+    priority: int
+    seq: int
+    method: str = field(compare=False)
+    payload: Dict[str, Any] = field(compare=False)
+    future: "asyncio.Future[Optional[Dict[str, Any]]]" = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+    attempts: int = field(compare=False, default=0)
+    # Telegram error response (or {"description": ...}) of a failed delivery
+    error: Optional[Dict[str, Any]] = field(compare=False, default=None)
+
+    @property
+    def chat_id(self) -> str:
+        return str(self.payload.get("chat_id"))
+
+
+@dataclass
+class QueueMetrics:
+    """Outbound queue counters."""
+
+    queue_depth: int = 0
+    in_flight: int = 0
+    sent: int = 0
+    failed: int = 0
+    retried: int = 0
+    rate_limited: int = 0
+    avg_latency: float = 0.0
+    max_latency: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+class TelegramOutboundQueue:
+    """
+    Async Telegram delivery queue with global and per-chat rate limiting.
+
+    Messages are sent in priority order at up to global_rate messages per
+    second overall and per_chat_rate messages per second per chat. 429
+    responses block the chat for retry_after seconds and the message is
+    re-queued instead of dropped.
+
+    Usage:
+        queue = get_outbound_queue()
+        result = await queue.submit("sendMessage", {"chat_id": 1, "text": "Hi"})
+    """
+
+    def __init__(
+        self,
+        token: str,
+        global_rate: float = 30,
+        per_chat_rate: float = 1,
+        max_retries: int = 5,
+    ):
+        """
+        Initialize TelegramOutboundQueue.
+
+        Args:
+            token: Telegram bot token
+            global_rate: Messages per second across all chats
+            per_chat_rate: Messages per second per chat
+            max_retries: Retries per message for 429, 5xx and network errors
+        """
+        self.token = token
+        self.per_chat_rate = per_chat_rate
+        self.max_retries = max_retries
+        self._global_bucket = TokenBucket(global_rate, global_rate)
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._heap: List[_OutboundItem] = []
+        # Items of rate-limited chats, per chat, and when each chat may send again
+        self._deferred: Dict[str, List[_OutboundItem]] = {}
+        self._deferred_count = 0
+        self._parked: List[Tuple[float, str]] = []
+        self._parked_chats: Set[str] = set()
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._send_tasks: Set[asyncio.Task] = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._metrics = QueueMetrics()
+
+    @property
+    def metrics(self) -> QueueMetrics:
+        """Current queue metrics."""
+        self._metrics.queue_depth = len(self._heap) + self._deferred_count
+        return self._metrics
+
+    def _ensure_worker(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
             )
-            return True
+        return self._session
+
+    async def submit(
+        self,
+        method: str,
+        payload: Dict[str, Any],
+        priority: Priority = Priority.NORMAL,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Queue a Bot API call and wait until it is delivered.
+
+        Args:
+            method: Bot API method (e.g. "sendMessage")
+            payload: JSON payload; must contain chat_id
+            priority: Priority class
+
+        Returns:
+            Telegram "result" object, or None if delivery failed
+        """
+        result, _ = await self.submit_detailed(method, payload, priority)
+        return result
+
+    async def submit_detailed(
+        self,
+        method: str,
+        payload: Dict[str, Any],
+        priority: Priority = Priority.NORMAL,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Queue a Bot API call and wait until it is delivered or has failed.
+
+        Args:
+            method: Bot API method (e.g. "sendDocument")
+            payload: JSON payload; must contain chat_id
+            priority: Priority class
+
+        Returns:
+            (result, error): the Telegram "result" object and None, or None and
+            the Telegram error response ({"description": ...} for transport
+            errors)
+        """
+        self._ensure_worker()
+        item = _OutboundItem(
+            priority=int(priority),
+            seq=next(self._seq),
+            method=method,
+            payload=payload,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._push(item)
+        self._wakeup.set()
+        result = await item.future
+        _track_buttons(payload, result)
+        return result, None if result is not None else item.error
+
+    async def acquire(self, chat_id: Union[int, str]) -> None:
+        """
+        Wait for a global and a per-chat token for a call made outside the queue.
+
+        Used by requests the queue cannot carry (streamed multipart uploads),
+        so they still count against the rate limits and wait out retry_after.
+
+        Args:
+            chat_id: Telegram chat ID
+        """
+        chat_bucket = self._chat_bucket(str(chat_id))
+        while True:
+            now = time.monotonic()
+            delay = max(self._global_bucket.delay(now), chat_bucket.delay(now))
+            if delay <= 0:
+                self._global_bucket.consume(now)
+                chat_bucket.consume(now)
+                return
+            await asyncio.sleep(delay)
+
+    def block_chat(self, chat_id: Union[int, str], seconds: float) -> None:
+        """
+        Hold back a chat after a 429 received outside the queue.
+
+        Args:
+            chat_id: Telegram chat ID
+            seconds: retry_after of the 429 response
+        """
+        self._metrics.rate_limited += 1
+        self._chat_bucket(str(chat_id)).block(seconds)
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.per_chat_rate, 1)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _prune_chat_buckets(self, now: float) -> None:
+        idle = [
+            chat_id
+            for chat_id, bucket in self._chat_buckets.items()
+            if now - bucket.updated_at > CHAT_BUCKET_IDLE_SECONDS
+            and bucket.blocked_until < now
+        ]
+        for chat_id in idle:
+            del self._chat_buckets[chat_id]
+
+    def _push(self, item: _OutboundItem) -> None:
+        """Queue an item, behind the deferred items of its chat if it has any."""
+        deferred = self._deferred.get(item.chat_id)
+        if deferred is not None:
+            heapq.heappush(deferred, item)
+            self._deferred_count += 1
         else:
-            error_description = response_data.get("description", "Unknown error")
+            heapq.heappush(self._heap, item)
+
+    def _park(self, chat_id: str, ready_at: float) -> None:
+        """Release the chat's next deferred item at ready_at."""
+        if chat_id not in self._parked_chats:
+            self._parked_chats.add(chat_id)
+            heapq.heappush(self._parked, (ready_at, chat_id))
+
+    def _defer(self, item: _OutboundItem, ready_at: float) -> None:
+        """Move an item of a rate-limited chat out of the main heap."""
+        heapq.heappush(self._deferred.setdefault(item.chat_id, []), item)
+        self._deferred_count += 1
+        self._park(item.chat_id, ready_at)
+
+    def _release_parked(self, now: float) -> None:
+        """Move the next item of every chat that may send again to the main heap."""
+        while self._parked and self._parked[0][0] <= now:
+            _, chat_id = heapq.heappop(self._parked)
+            self._parked_chats.discard(chat_id)
+            deferred = self._deferred.get(chat_id)
+            if not deferred:
+                self._deferred.pop(chat_id, None)
+                continue
+            heapq.heappush(self._heap, heapq.heappop(deferred))
+            self._deferred_count -= 1
+            if not deferred:
+                del self._deferred[chat_id]
+
+    def _next_ready(self, now: float) -> Tuple[Optional[_OutboundItem], float]:
+        """
+        Pop the best item whose chat may send now, else the shortest wait.
+
+        Items of rate-limited chats are parked in per-chat deferred queues,
+        so a blocked chat with a deep backlog costs O(log n) per wakeup
+        instead of a pass over the whole heap.
+        """
+        self._release_parked(now)
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            delay = self._chat_bucket(item.chat_id).delay(now)
+            if delay <= 0:
+                return item, 0.0
+            self._defer(item, now + delay)
+        wait = self._parked[0][0] - now if self._parked else float("inf")
+        return None, wait
+
+    async def _run(self) -> None:
+        sends = 0
+        while True:
+            if not self._heap and not self._parked:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            global_delay = self._global_bucket.delay(now)
+            if global_delay > 0:
+                await asyncio.sleep(global_delay)
+                continue
+
+            item, wait = self._next_ready(now)
+            if item is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            chat_bucket = self._chat_bucket(item.chat_id)
+            self._global_bucket.consume(now)
+            chat_bucket.consume(now)
+            if item.chat_id in self._deferred:
+                # The chat's next item waits for its next token
+                self._park(item.chat_id, now + chat_bucket.delay(now))
+            self._metrics.in_flight += 1
+            send_task = asyncio.create_task(self._send(item))
+            self._send_tasks.add(send_task)
+            send_task.add_done_callback(self._send_tasks.discard)
+
+            sends += 1
+            if sends % 1000 == 0:
+                self._prune_chat_buckets(now)
+
+    def _requeue(self, item: _OutboundItem) -> None:
+        item.attempts += 1
+        self._metrics.retried += 1
+        self._push(item)
+        self._wakeup.set()
+
+    def _finish(
+        self,
+        item: _OutboundItem,
+        result: Optional[Dict[str, Any]],
+        error: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if result is None and item.error is None:
+            item.error = error or {"description": "Unknown error"}
+        latency = time.monotonic() - item.enqueued_at
+        metrics = self._metrics
+        if result is None:
+            metrics.failed += 1
+        else:
+            metrics.sent += 1
+            metrics.avg_latency += (latency - metrics.avg_latency) / metrics.sent
+            metrics.max_latency = max(metrics.max_latency, latency)
+        if not item.future.done():
+            item.future.set_result(result)
+
+    async def _send(self, item: _OutboundItem) -> None:
+        try:
+            await self._deliver(item)
+        except asyncio.CancelledError:
+            self._finish(item, None, {"description": "delivery cancelled"})
+            raise
+        except Exception as e:
+            # Never leave a submitter waiting on an unresolved future
             logger.error(
-                f"❌ Telegram API error while sending document to chat {chat_id}: "
-                f"{error_description}"
+                f"❌ Unexpected error sending {item.method} to chat {item.chat_id}: {e}",
+                exc_info=True,
             )
-            return False
+            self._finish(item, None, {"description": f"unexpected error: {e}"})
 
-    except requests.exceptions.Timeout:
-        logger.error(f"⏱️ Timeout while sending document to chat {chat_id}")
-        return False
-    except requests.exceptions.RequestException as e:
-        logger.error(f"❌ Request error while sending document to chat {chat_id}: {e}")
+    async def _deliver(self, item: _OutboundItem) -> None:
+        url = TELEGRAM_API_URL.format(token=self.token, method=item.method)
+        chat_id = item.chat_id
+        try:
+            session = await self._get_session()
+            async with session.post(url, json=item.payload) as resp:
+                response_data = await resp.json(content_type=None)
+                status = resp.status
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            # ValueError: non-JSON body, e.g. an HTML 502 from a proxy
+            logger.warning(f"⚠️ Telegram request error for chat {chat_id}: {e}")
+            status, response_data = None, {"description": f"request error: {e}"}
+        finally:
+            self._metrics.in_flight -= 1
+
+        if response_data.get("ok"):
+            logger.debug(f"✅ {item.method} delivered to chat {chat_id}")
+            self._finish(item, response_data.get("result"))
+            return
+
+        retryable = status is None or status == 429 or status >= 500
+        if retryable and item.attempts < self.max_retries:
+            if status == 429:
+                retry_after = response_data.get("parameters", {}).get("retry_after", 1)
+                self._metrics.rate_limited += 1
+                self._chat_bucket(chat_id).block(retry_after)
+                logger.warning(
+                    f"⏳ Telegram rate limit for chat {chat_id}, retry after {retry_after}s"
+                )
+            else:
+                self._chat_bucket(chat_id).block(2 ** item.attempts)
+            self._requeue(item)
+            return
+
+        error_description = response_data.get("description", "Unknown error")
+        if MESSAGE_NOT_MODIFIED in error_description:
+            # Edit with identical content - the message is already up to date
+            logger.debug(f"✅ {item.method}: message unchanged in chat {chat_id}")
+            self._finish(item, {"message_id": item.payload.get("message_id")})
+            return
+
+        logger.error(
+            f"❌ Telegram API error for chat {chat_id} ({item.method}): {error_description}"
+        )
+        self._finish(item, None, response_data)
+
+    def _pending_items(self) -> List[_OutboundItem]:
+        items = list(self._heap)
+        for deferred in self._deferred.values():
+            items.extend(deferred)
+        return items
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """
+        Deliver queued messages, then stop the worker and close the HTTP session.
+
+        Args:
+            timeout: Seconds to wait for queued and in-flight messages; the
+                rest is given up (their submitters get None)
+        """
+        deadline = time.monotonic() + timeout
+        while self._heap or self._deferred or self._send_tasks:
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.05)
+        if self._worker is not None:
+            self._worker.cancel()
+        for task in list(self._send_tasks):
+            task.cancel()
+        abandoned = self._pending_items()
+        if abandoned:
+            logger.warning(f"⚠️ Dropping {len(abandoned)} undelivered Telegram message(s)")
+        for item in abandoned:
+            self._finish(item, None, {"description": "outbound queue closed"})
+        self._heap.clear()
+        self._deferred.clear()
+        self._deferred_count = 0
+        self._parked.clear()
+        self._parked_chats.clear()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+# Global outbound queue instance
+_outbound_queue: Optional[TelegramOutboundQueue] = None
+
+
+def get_outbound_queue() -> TelegramOutboundQueue:
+    """
+    Get or create global TelegramOutboundQueue instance.
+
+    Returns:
+        TelegramOutboundQueue instance
+    """
+    global _outbound_queue
+    if _outbound_queue is None:
+        settings = get_settings()
+        _outbound_queue = TelegramOutboundQueue(
+            settings.BOT_TOKEN,
+            global_rate=settings.TELEGRAM_GLOBAL_RATE_LIMIT,
+            per_chat_rate=settings.TELEGRAM_PER_CHAT_RATE_LIMIT,
+            max_retries=settings.TELEGRAM_MAX_RETRIES,
+        )
+    return _outbound_queue
+
+
+async def send_message_async(
+    chat_id: Union[int, str],
+    text: str,
+    reply_markup: Optional[Dict[str, Any]] = None,
+    parse_mode: str = "HTML",
+    priority: Priority = Priority.NORMAL,
+) -> Optional[Dict[str, Any]]:
+    """
+    Send message to Telegram chat through the rate-limited outbound queue.
+
+    Args:
+        chat_id: Telegram chat ID
+        text: Message text
+        reply_markup: Optional inline keyboard markup
+        parse_mode: Parse mode (HTML or Markdown)
+        priority: Priority class
+
+    Returns:
+        Sent Telegram message object, or None if delivery failed
+    """
+    if not text:
+        logger.warning(f"Attempted to send empty message to chat {chat_id}")
+        return None
+
+    payload: Dict[str, Any] = {
+        "chat_id": chat_id,
+        "text": text,
+        "parse_mode": parse_mode,
+    }
+
+    if reply_markup:
+        payload["reply_markup"] = reply_markup
+
+    return await get_outbound_queue().submit("sendMessage", payload, priority)
+
+
+async def edit_message_text_async(
+    chat_id: Union[int, str],
+    message_id: int,
+    text: str,
+    reply_markup: Optional[Dict[str, Any]] = None,
+    parse_mode: str = "HTML",
+    priority: Priority = Priority.NORMAL,
+) -> Optional[Dict[str, Any]]:
+    """
+    Replace the text (and keyboard) of a sent message through the outbound queue.
+
+    Args:
+        chat_id: Telegram chat ID
+        message_id: Message to edit
+        text: New message text
+        reply_markup: Optional new inline keyboard markup
+        parse_mode: Parse mode (HTML or Markdown)
+        priority: Priority class
+
+    Returns:
+        Edited Telegram message object, or None if the edit failed
+    """
+    payload: Dict[str, Any] = {
+        "chat_id": chat_id,
+        "message_id": message_id,
+        "text": text,
+        "parse_mode": parse_mode,
+    }
+    if reply_markup:
+        payload["reply_markup"] = reply_markup
+
+    return await get_outbound_queue().submit("editMessageText", payload, priority)
+
+
+async def edit_message_caption_async(
+    chat_id: Union[int, str],
+    message_id: int,
+    caption: str,
+    reply_markup: Optional[Dict[str, Any]] = None,
+    parse_mode: str = "HTML",
+    priority: Priority = Priority.NORMAL,
+) -> Optional[Dict[str, Any]]:
+    """
+    Replace the caption (and keyboard) of a sent document through the outbound queue.
+
+    Args:
+        chat_id: Telegram chat ID
+        message_id: Message to edit
+        caption: New caption text
+        reply_markup: Optional new inline keyboard markup
+        parse_mode: Parse mode (HTML or Markdown)
+        priority: Priority class
+
+    Returns:
+        Edited Telegram message object, or None if the edit failed
+    """
+    payload: Dict[str, Any] = {
+        "chat_id": chat_id,
+        "message_id": message_id,
+        "caption": caption,
+        "parse_mode": parse_mode,
+    }
+    if reply_markup:
+        payload["reply_markup"] = reply_markup
+
+    return await get_outbound_queue().submit("editMessageCaption", payload, priority)
+
+
+async def edit_message_reply_markup_async(
+    chat_id: Union[int, str],
+    message_id: int,
+    reply_markup: Optional[Dict[str, Any]] = None,
+    priority: Priority = Priority.NORMAL,
+) -> Optional[Dict[str, Any]]:
+    """
+    Replace (or remove, if None) the inline keyboard of a sent message.
+
+    Args:
+        chat_id: Telegram chat ID
+        message_id: Message to edit
+        reply_markup: New inline keyboard markup
+        priority: Priority class
+
+    Returns:
+        Edited Telegram message object, or None if the edit failed
+    """
+    payload: Dict[str, Any] = {"chat_id": chat_id, "message_id": message_id}
+    if reply_markup:
+        payload["reply_markup"] = reply_markup
+
+    return await get_outbound_queue().submit("editMessageReplyMarkup", payload, priority)
+
+
+async def _send_document_detailed(
+    chat_id: Union[int, str],
+    file_url: str,
+    caption: Optional[str],
+    reply_markup: Optional[Dict[str, Any]],
+    parse_mode: str,
+    disable_content_type_detection: bool,
+    cache_key: Optional[str],
+    priority: Priority,
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Send a document by URL or cached file_id through the outbound queue.
+
+    Returns:
+        (message, error) as returned by TelegramOutboundQueue.submit_detailed
+    """
+    if not file_url:
+        logger.warning(f"Attempted to send empty file_url to chat {chat_id}")
+        return None, {"description": "empty file_url"}
+
+    payload: Dict[str, Any] = {"chat_id": chat_id, "parse_mode": parse_mode}
+    if caption:
+        payload["caption"] = caption
+    if reply_markup:
+        payload["reply_markup"] = reply_markup
+    if disable_content_type_detection:
+        payload["disable_content_type_detection"] = True
+
+    queue = get_outbound_queue()
+    file_cache = get_file_cache()
+    cache_key = cache_key or file_url
+    cacheable = file_url.startswith(("http://", "https://"))
+    cached_file_id = file_cache.get(cache_key) if cacheable else None
+    if cached_file_id:
+        message, error = await queue.submit_detailed(
+            "sendDocument", {**payload, "document": cached_file_id}, priority
+        )
+        if message is not None or not _is_invalid_file_id(error or {}):
+            return message, error
+        logger.warning(
+            f"⚠️ Cached file_id rejected for {file_url} "
+            f"({error.get('description')}), retrying with URL"
+        )
+        file_cache.delete(cache_key)
+
+    message, error = await queue.submit_detailed(
+        "sendDocument", {**payload, "document": file_url}, priority
+    )
+    if message is not None:
+        file_id = message.get("document", {}).get("file_id")
+        if cacheable and file_id:
+            file_cache.set(cache_key, file_id)
+    return message, error
+
+
+async def send_document_async(
+    chat_id: Union[int, str],
+    file_url: str,
+    caption: Optional[str] = None,
+    reply_markup: Optional[Dict[str, Any]] = None,
+    parse_mode: str = "HTML",
+    disable_content_type_detection: bool = False,
+    cache_key: Optional[str] = None,
+    priority: Priority = Priority.NORMAL,
+) -> Optional[Dict[str, Any]]:
+    """
+    Send a document by URL through the rate-limited outbound queue.
+
+    Async counterpart of send_document_message: the file_id Telegram returns
+    is cached and used instead of the URL next time; a cached file_id that
+    Telegram rejects as invalid or expired is dropped and the URL sent.
+
+    Args:
+        chat_id: Telegram chat ID
+        file_url: HTTP(S) URL or file_id
+        caption: Optional caption text
+        reply_markup: Optional inline keyboard markup
+        parse_mode: Caption parse mode (HTML or Markdown)
+        disable_content_type_detection: Disable Telegram's content type detection
+        cache_key: file_id cache key (e.g. a content hash). Default: file_url
+        priority: Priority class
+
+    Returns:
+        Sent Telegram message object, or None if delivery failed
+    """
+    message, _ = await _send_document_detailed(
+        chat_id,
+        file_url,
+        caption,
+        reply_markup,
+        parse_mode,
+        disable_content_type_detection,
+        cache_key,
+        priority,
+    )
+    return message
+
+
+async def send_document_or_relay_async(
+    chat_id: Union[int, str],
+    file_url: str,
+    caption: Optional[str] = None,
+    reply_markup: Optional[Dict[str, Any]] = None,
+    parse_mode: str = "HTML",
+    cache_key: Optional[str] = None,
+    priority: Priority = Priority.NORMAL,
+) -> Optional[Dict[str, Any]]:
+    """
+    Send a document by URL, uploading it from here if Telegram cannot fetch it.
+
+    The relay runs only when Telegram reports that it could not get the URL
+    content; any other failure is returned as is, so the chat never gets a
+    duplicate upload.
+
+    Args:
+        chat_id: Telegram chat ID
+        file_url: HTTP(S) URL
+        caption: Optional caption text
+        reply_markup: Optional inline keyboard markup
+        parse_mode: Caption parse mode (HTML or Markdown)
+        cache_key: file_id cache key. Default: file_url
+        priority: Priority class
+
+    Returns:
+        Sent Telegram message object, or None if delivery failed
+    """
+    message, error = await _send_document_detailed(
+        chat_id, file_url, caption, reply_markup, parse_mode, False, cache_key, priority
+    )
+    if message is not None or not _is_url_fetch_error(error or {}):
+        return message
+
+    logger.info(
+        f"📤 Telegram could not fetch {file_url} ({error.get('description')}), relaying upload"
+    )
+    return await relay_document_from_url(
+        chat_id,
+        file_url,
+        caption=caption,
+        reply_markup=reply_markup,
+        parse_mode=parse_mode,
+        cache_key=cache_key,
+    )
+
+
+async def set_webhook_async(
+    url: str,
+    secret_token: Optional[str] = None,
+    allowed_updates: Optional[List[str]] = None,
+) -> bool:
+    """
+    Register the bot's webhook URL with Telegram.
+
+    Args:
+        url: Public HTTPS URL of the Telegram webhook endpoint
+        secret_token: Value Telegram sends in X-Telegram-Bot-Api-Secret-Token
+        allowed_updates: Update types to receive. Default: callback_query only
+
+    Returns:
+        True if the webhook was set, False otherwise
+    """
+    settings = get_settings()
+    telegram_api_url = TELEGRAM_API_URL.format(
+        token=settings.BOT_TOKEN, method="setWebhook"
+    )
+    payload: Dict[str, Any] = {
+        "url": url,
+        "allowed_updates": allowed_updates or ["callback_query"],
+    }
+    if secret_token:
+        payload["secret_token"] = secret_token
+
+    try:
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        ) as session:
+            async with session.post(telegram_api_url, json=payload) as resp:
+                response_data = await resp.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        logger.error(f"❌ Request error while setting Telegram webhook: {e}")
         return False
-    except Exception as e:
+
+    if not response_data.get("ok"):
         logger.error(
-            f"❌ Unexpected error while sending document to chat {chat_id}: {e}",
-            exc_info=True,
+            f"❌ Telegram API error while setting webhook: "
+            f"{response_data.get('description', 'Unknown error')}"
         )
         return False
+
+    logger.info(f"✅ Telegram webhook set to {url}")
+    return True
+
+
+_relay_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_relay_semaphore() -> asyncio.Semaphore:
+    global _relay_semaphore
+    if _relay_semaphore is None:
+        _relay_semaphore = asyncio.Semaphore(get_settings().TELEGRAM_RELAY_CONCURRENCY)
+    return _relay_semaphore
+
+
+def _relay_filename(file_url: str, source: aiohttp.ClientResponse) -> str:
+    """Pick upload filename from Content-Disposition or the URL path."""
+    disposition = source.content_disposition
+    if disposition is not None and disposition.filename:
+        return disposition.filename
+    name = PurePosixPath(unquote(urlparse(file_url).path)).name
+    return name or "document"
+
+
+async def _iter_chunks(source: aiohttp.ClientResponse):
+    """Yield the response body in fixed-size chunks."""
+    async for chunk in source.content.iter_chunked(RELAY_CHUNK_SIZE):
+        yield chunk
+
+
+def _relay_headers(file_url: str) -> Dict[str, str]:
+    """Authorization headers for ClickUp-hosted attachment URLs."""
+    host = urlparse(file_url).hostname or ""
+    if any(host == h or host.endswith("." + h) for h in CLICKUP_ATTACHMENT_HOSTS):
+        return {"Authorization": get_settings().CLICKUP_API_TOKEN}
+    return {}
+
+
+async def _relay_upload(
+    file_url: str, payload: Dict[str, Any], filename: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Download file_url and stream it into one sendDocument upload.
+
+    Returns:
+        Telegram response dictionary, or None if the download or request failed
+    """
+    chat_id = payload.get("chat_id")
+    telegram_api_url = TELEGRAM_API_URL.format(
+        token=get_settings().BOT_TOKEN, method="sendDocument"
+    )
+    try:
+        async with aiohttp.ClientSession(timeout=RELAY_TIMEOUT) as session:
+            async with session.get(file_url, headers=_relay_headers(file_url)) as source:
+                if source.status != 200:
+                    logger.error(
+                        f"❌ Could not download {file_url} for relay: HTTP {source.status}"
+                    )
+                    return None
+
+                form = aiohttp.FormData()
+                for key, value in payload.items():
+                    if isinstance(value, dict):
+                        value = json.dumps(value)
+                    form.add_field(key, str(value))
+                form.add_field(
+                    "document",
+                    _iter_chunks(source),
+                    filename=filename or _relay_filename(file_url, source),
+                    content_type=source.content_type,
+                )
+
+                async with session.post(telegram_api_url, data=form) as resp:
+                    return await resp.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        logger.error(f"❌ Relay error while sending document to chat {chat_id}: {e}")
+        return None
+
+
+async def relay_document_from_url(
+    chat_id: Union[int, str],
+    file_url: str,
+    caption: Optional[str] = None,
+    reply_markup: Optional[Dict[str, Any]] = None,
+    parse_mode: str = "HTML",
+    filename: Optional[str] = None,
+    cache_key: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Stream a file (e.g. a ClickUp attachment) into a Telegram sendDocument upload.
+
+    Use when Telegram cannot fetch the URL itself (authenticated ClickUp
+    attachments, private hosts). The file is read and uploaded in chunks, so
+    memory use does not depend on file size. Concurrent relays are limited by
+    TELEGRAM_RELAY_CONCURRENCY, and each upload takes the outbound queue's
+    global and per-chat tokens and waits out 429 retry_after. A cached
+    file_id is reused when available and only dropped when Telegram rejects it.
+
+    Args:
+        chat_id: Telegram chat ID
+        file_url: Source file URL
+        caption: Optional caption text
+        reply_markup: Optional inline keyboard markup
+        parse_mode: Caption parse mode (HTML or Markdown)
+        filename: Upload filename. Default: from response headers or URL
+        cache_key: file_id cache key. Default: file_url
+
+    Returns:
+        Sent Telegram message object, or None if the relay failed
+    """
+    payload: Dict[str, Any] = {"chat_id": chat_id, "parse_mode": parse_mode}
+    if caption:
+        payload["caption"] = caption
+    if reply_markup:
+        payload["reply_markup"] = reply_markup
+
+    queue = get_outbound_queue()
+    file_cache = get_file_cache()
+    cache_key = cache_key or file_url
+    cached_file_id = file_cache.get(cache_key)
+    if cached_file_id:
+        message, error = await queue.submit_detailed(
+            "sendDocument", {**payload, "document": cached_file_id}
+        )
+        if message is not None or not _is_invalid_file_id(error or {}):
+            # Rate limits, blocked chats or a closed queue: uploading won't help
+            return message
+        file_cache.delete(cache_key)
+
+    async with _get_relay_semaphore():
+        for attempt in range(queue.max_retries + 1):
+            # Uploads bypass the queue, but share its global and per-chat limits
+            await queue.acquire(chat_id)
+            response_data = await _relay_upload(file_url, payload, filename)
+            if response_data is None:
+                return None
+            retry_after = response_data.get("parameters", {}).get("retry_after")
+            if response_data.get("error_code") != 429 or attempt == queue.max_retries:
+                break
+            logger.warning(
+                f"⏳ Telegram rate limit for chat {chat_id}, relay retry after {retry_after}s"
+            )
+            queue.block_chat(chat_id, retry_after or 1)
+
+    if not response_data.get("ok"):
+        logger.error(
+            f"❌ Telegram API error while relaying document to chat {chat_id}: "
+            f"{response_data.get('description', 'Unknown error')}"
+        )
+        return None
+
+    message = response_data.get("result", {})
+    file_id = message.get("document", {}).get("file_id")
+    if file_id:
+        file_cache.set(cache_key, file_id)
+    _track_buttons(payload, message)
+    logger.debug(f"✅ Document relayed to chat {chat_id} from URL: {file_url}")
+    return message
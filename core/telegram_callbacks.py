@@ -0,0 +1,202 @@
+"""
+Telegram callback query receiver.
+
+Receives Telegram webhook updates for inline button presses, routes them to
+registered action handlers and answers the callback in the webhook response
+itself, so the user's button stops spinning without an extra API call.
+"""
+
+import hmac
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from urllib.parse import parse_qsl
+
+from fastapi import FastAPI, HTTPException, Request
+
+from core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Header Telegram sends with the secret_token given to setWebhook
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+UNKNOWN_ACTION_TEXT = "⚠️ Noma'lum amal"
+ERROR_TEXT = "❌ Xatolik yuz berdi, qayta urinib ko'ring"
+
+
+@dataclass
+class CallbackQuery:
+    """Parsed Telegram callback query."""
+
+    id: str
+    action: str
+    task_id: str
+    params: Dict[str, str] = field(default_factory=dict)
+    chat_id: Optional[Union[int, str]] = None
+    message_id: Optional[int] = None
+    user: Dict[str, Any] = field(default_factory=dict)
+
+
+CallbackHandler = Callable[[CallbackQuery], Awaitable[Optional[str]]]
+
+
+def parse_callback_data(data: str) -> Optional[tuple]:
+    """
+    Parse callback_data of the form "<action>=<task_id>&key=value...".
+
+    Args:
+        data: callback_data string
+
+    Returns:
+        (action, task_id, params) tuple, or None if data is malformed
+    """
+    pairs = parse_qsl(data or "", keep_blank_values=True)
+    if not pairs:
+        return None
+    action, task_id = pairs[0]
+    if not action or not task_id:
+        return None
+    return action, task_id, dict(pairs[1:])
+
+
+class CallbackRouter:
+    """
+    Routes callback queries to handlers by action.
+
+    Usage:
+        router = get_callback_router()
+
+        @router.on("lot_in")
+        async def handle_lot_in(query: CallbackQuery) -> Optional[str]:
+            ...
+            return "✅ Qabul qilindi"
+
+        router.mount(server.get_app(), "/telegram-webhook", secret)
+    """
+
+    def __init__(self):
+        """Initialize CallbackRouter."""
+        self._handlers: Dict[str, CallbackHandler] = {}
+
+    def on(self, action: str) -> Callable[[CallbackHandler], CallbackHandler]:
+        """
+        Register handler for a callback action.
+
+        The handler should return quickly (queue slow work) and may return a
+        short text shown to the user.
+
+        Args:
+            action: Action name (the first key of callback_data)
+
+        Returns:
+            Decorator
+        """
+
+        def decorator(handler: CallbackHandler) -> CallbackHandler:
+            self._handlers[action] = handler
+            return handler
+
+        return decorator
+
+    @property
+    def actions(self) -> list:
+        """Registered action names."""
+        return list(self._handlers)
+
+    async def process_update(self, update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Handle one Telegram update.
+
+        Args:
+            update: Telegram Update object
+
+        Returns:
+            answerCallbackQuery method call to send as webhook response, or
+            None if the update is not a callback query
+        """
+        callback_query = update.get("callback_query")
+        if not callback_query:
+            return None
+
+        answer: Dict[str, Any] = {
+            "method": "answerCallbackQuery",
+            "callback_query_id": callback_query["id"],
+        }
+
+        parsed = parse_callback_data(callback_query.get("data", ""))
+        handler = self._handlers.get(parsed[0]) if parsed else None
+        if handler is None:
+            logger.warning(f"⚠️ Unknown callback data: {callback_query.get('data')}")
+            answer["text"] = UNKNOWN_ACTION_TEXT
+            return answer
+
+        action, task_id, params = parsed
+        message = callback_query.get("message") or {}
+        query = CallbackQuery(
+            id=callback_query["id"],
+            action=action,
+            task_id=task_id,
+            params=params,
+            chat_id=message.get("chat", {}).get("id"),
+            message_id=message.get("message_id"),
+            user=callback_query.get("from", {}),
+        )
+        logger.info(
+            f"🔘 Callback {action} for task {task_id} from user {query.user.get('id')}"
+        )
+
+        try:
+            text = await handler(query)
+        except Exception as e:
+            logger.error(f"❌ Callback handler {action} failed: {e}", exc_info=True)
+            text = ERROR_TEXT
+
+        if text:
+            answer["text"] = text
+        return answer
+
+    def mount(self, app: FastAPI, path: str, secret: Optional[str] = None) -> None:
+        """
+        Add the Telegram webhook endpoint to a FastAPI app.
+
+        Callback handlers write to ClickUp, so the endpoint only accepts
+        requests carrying the secret_token given to setWebhook.
+
+        Args:
+            app: FastAPI app (e.g. WebhookServer.get_app())
+            path: Endpoint path
+            secret: Expected secret_token header value
+
+        Raises:
+            ValueError: If no secret is given
+        """
+        if not secret:
+            raise ValueError("Telegram webhook secret is required to mount callbacks")
+
+        @app.post(path)
+        async def telegram_webhook(request: Request):
+            """Telegram webhook endpoint"""
+            header = request.headers.get(SECRET_TOKEN_HEADER) or ""
+            if not hmac.compare_digest(header.encode(), secret.encode()):
+                logger.warning("Telegram webhook secret verification failed")
+                raise HTTPException(status_code=401, detail="Invalid secret")
+
+            update = await request.json()
+            return await self.process_update(update) or {}
+
+
+# Global router instance
+_callback_router: Optional[CallbackRouter] = None
+
+
+def get_callback_router() -> CallbackRouter:
+    """
+    Get or create global CallbackRouter instance.
+
+    Returns:
+        CallbackRouter instance
+    """
+    global _callback_router
+    if _callback_router is None:
+        _callback_router = CallbackRouter()
+    return _callback_router
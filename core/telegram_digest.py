@@ -0,0 +1,243 @@
+"""
+Per-chat digest batching for Telegram notifications.
+
+Notifications added within a time window (or up to a count) are merged into
+one message per chat, split at Telegram's message length and button limits.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from config.settings import get_settings
+from core.logging_config import get_logger
+from core.telegram_bot import Priority, send_message_async
+
+logger = get_logger(__name__)
+
+# Telegram limits
+MAX_MESSAGE_LENGTH = 4096
+MAX_KEYBOARD_BUTTONS = 100
+
+DIGEST_SEPARATOR = "\n➖➖➖➖➖➖\n\n"
+
+
+@dataclass
+class _DigestItem:
+    text: str
+    reply_markup: Optional[Dict[str, Any]]
+    future: "asyncio.Future[Optional[Dict[str, Any]]]"
+
+
+@dataclass
+class _DigestChunk:
+    items: List[_DigestItem] = field(default_factory=list)
+    length: int = 0
+    buttons: int = 0
+
+
+def _keyboard_rows(item: _DigestItem) -> List[List[Dict[str, Any]]]:
+    if not item.reply_markup:
+        return []
+    return item.reply_markup.get("inline_keyboard", [])
+
+
+def _count_buttons(item: _DigestItem) -> int:
+    return sum(len(row) for row in _keyboard_rows(item))
+
+
+class DigestBuffer:
+    """
+    Buffers notifications per chat and sends them as digests.
+
+    Usage:
+        digest = get_digest_buffer()
+        digest.add(chat_id, message, reply_markup=keyboard)
+    """
+
+    def __init__(self, window: float, max_items: int):
+        """
+        Initialize DigestBuffer.
+
+        Args:
+            window: Seconds to collect notifications after the first one
+            max_items: Flush immediately when this many notifications are buffered
+        """
+        self.window = window
+        self.max_items = max_items
+        self._buffers: Dict[str, List[_DigestItem]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._chat_ids: Dict[str, Union[int, str]] = {}
+        self._flush_tasks: set = set()
+
+    def add(
+        self,
+        chat_id: Union[int, str],
+        text: str,
+        reply_markup: Optional[Dict[str, Any]] = None,
+    ) -> "asyncio.Future[Optional[Dict[str, Any]]]":
+        """
+        Buffer a notification for a chat.
+
+        Args:
+            chat_id: Telegram chat ID
+            text: Message text (HTML)
+            reply_markup: Optional inline keyboard markup
+
+        Returns:
+            Future resolved with the sent digest message (None on failure)
+        """
+        loop = asyncio.get_running_loop()
+        key = str(chat_id)
+        item = _DigestItem(text, reply_markup, loop.create_future())
+
+        self._chat_ids[key] = chat_id
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append(item)
+
+        if len(buffer) >= self.max_items:
+            self._schedule_flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(
+                self.window, self._schedule_flush, key
+            )
+        return item.future
+
+    def _schedule_flush(self, key: str) -> None:
+        task = asyncio.create_task(self.flush(key))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self, key: str) -> None:
+        """
+        Send buffered notifications of a chat.
+
+        Args:
+            key: Chat ID as string
+        """
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._buffers.pop(key, [])
+        if not items:
+            return
+
+        chat_id = self._chat_ids.pop(key)
+        chunks = self._split(items)
+        logger.info(
+            f"📬 Sending digest of {len(items)} notification(s) "
+            f"in {len(chunks)} message(s) to chat {chat_id}"
+        )
+        try:
+            for chunk in chunks:
+                text, reply_markup = self._render(chunk.items)
+                message = await send_message_async(
+                    chat_id, text, reply_markup=reply_markup, priority=Priority.LOW
+                )
+                for item in chunk.items:
+                    if not item.future.done():
+                        item.future.set_result(message)
+        except Exception as e:
+            logger.error(f"❌ Failed to send digest to chat {chat_id}: {e}", exc_info=True)
+        finally:
+            # Failed, cancelled or unsent chunks: settle their notifications as
+            # undelivered so ledger claims are released
+            for item in items:
+                if not item.future.done():
+                    item.future.set_result(None)
+
+    async def flush_all(self) -> None:
+        """Send every buffered digest now and wait for running flushes."""
+        await asyncio.gather(
+            *(self.flush(key) for key in list(self._buffers)),
+            *list(self._flush_tasks),
+            return_exceptions=True,
+        )
+
+    @staticmethod
+    def _split(items: List[_DigestItem]) -> List[_DigestChunk]:
+        """Group items into chunks that fit Telegram's limits."""
+        chunks: List[_DigestChunk] = []
+        current = _DigestChunk()
+        # Room for the numbering prefix and the digest header
+        overhead = 64
+        for item in items:
+            length = len(item.text) + len(DIGEST_SEPARATOR) + overhead
+            buttons = _count_buttons(item)
+            if current.items and (
+                current.length + length > MAX_MESSAGE_LENGTH
+                or current.buttons + buttons > MAX_KEYBOARD_BUTTONS
+            ):
+                chunks.append(current)
+                current = _DigestChunk()
+            current.items.append(item)
+            current.length += length
+            current.buttons += buttons
+        if current.items:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def _render(
+        items: List[_DigestItem], title: Optional[str] = None
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Merge items into one message text and keyboard."""
+        if len(items) == 1 and title is None:
+            return items[0].text, items[0].reply_markup
+
+        header = title or f"📬 <b>{len(items)} ta yangi xabar</b>"
+        parts = [f"{header}\n"]
+        rows: List[List[Dict[str, Any]]] = []
+        for number, item in enumerate(items, start=1):
+            parts.append(f"<b>{number}.</b> {item.text}")
+            # Number the buttons so each one points at its notification
+            for row in _keyboard_rows(item):
+                rows.append(
+                    [{**button, "text": f"{number}. {button['text']}"} for button in row]
+                )
+
+        reply_markup = {"inline_keyboard": rows} if rows else None
+        return DIGEST_SEPARATOR.join(parts), reply_markup
+
+
+def build_digest_messages(
+    items: Sequence[Any],
+    title: Optional[str] = None,
+) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    Merge notifications into as few digest messages as Telegram's limits allow.
+
+    Args:
+        items: Objects with `text` and `reply_markup` (e.g. Notification)
+        title: Header of every digest message (defaults to the item count)
+
+    Returns:
+        (text, reply_markup) of every digest message, in order
+    """
+    return [
+        DigestBuffer._render(chunk.items, title)
+        for chunk in DigestBuffer._split(list(items))
+    ]
+
+
+# Global digest buffer instance
+_digest_buffer: Optional[DigestBuffer] = None
+
+
+def get_digest_buffer() -> Optional[DigestBuffer]:
+    """
+    Get or create global DigestBuffer instance.
+
+    Returns:
+        DigestBuffer instance, or None if digest mode is disabled
+    """
+    global _digest_buffer
+    settings = get_settings()
+    if not settings.TELEGRAM_DIGEST_ENABLED:
+        return None
+    if _digest_buffer is None:
+        _digest_buffer = DigestBuffer(
+            window=settings.TELEGRAM_DIGEST_WINDOW,
+            max_items=settings.TELEGRAM_DIGEST_MAX_ITEMS,
+        )
+    return _digest_buffer
@@ -0,0 +1,95 @@
+"""
+Persistent cache of Telegram file_ids for documents sent by URL.
+
+Once Telegram has downloaded a file it returns a file_id that can be reused
+for later sends, so the same file is not fetched again for every recipient.
+"""
+
+import time
+from typing import Optional
+
+from config.settings import get_settings
+from core.logging_config import get_logger
+from core.storage import open_database
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_ids (
+    cache_key TEXT PRIMARY KEY,
+    file_id TEXT NOT NULL,
+    updated_at INTEGER NOT NULL
+);
+"""
+
+
+class TelegramFileCache:
+    """Maps a URL (or content hash) to the Telegram file_id of the uploaded file."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize TelegramFileCache.
+
+        Args:
+            db_path: SQLite database path
+        """
+        self._db = open_database(db_path)
+        self._db.executescript(SCHEMA)
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """
+        Get cached file_id.
+
+        Args:
+            cache_key: File URL or content hash
+
+        Returns:
+            file_id or None if not cached
+        """
+        row = self._db.execute(
+            "SELECT file_id FROM file_ids WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        return row["file_id"] if row else None
+
+    def set(self, cache_key: str, file_id: str) -> None:
+        """
+        Store file_id for a URL or content hash.
+
+        Args:
+            cache_key: File URL or content hash
+            file_id: Telegram file_id
+        """
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO file_ids (cache_key, file_id, updated_at) "
+                "VALUES (?, ?, ?)",
+                (cache_key, file_id, int(time.time())),
+            )
+        logger.debug(f"Cached Telegram file_id for {cache_key}")
+
+    def delete(self, cache_key: str) -> None:
+        """
+        Forget a cached file_id (e.g. after Telegram rejected it).
+
+        Args:
+            cache_key: File URL or content hash
+        """
+        with self._db:
+            self._db.execute("DELETE FROM file_ids WHERE cache_key = ?", (cache_key,))
+
+
+# Global cache instance
+_file_cache: Optional[TelegramFileCache] = None
+
+
+def get_file_cache() -> TelegramFileCache:
+    """
+    Get or create global TelegramFileCache instance.
+
+    Returns:
+        TelegramFileCache instance
+    """
+    global _file_cache
+    if _file_cache is None:
+        _file_cache = TelegramFileCache(get_settings().TELEGRAM_FILE_CACHE_DB)
+    return _file_cache
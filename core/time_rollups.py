@@ -0,0 +1,501 @@
+"""
+Time Rollups - running totals of tracked time kept current by webhooks.
+
+Every time entry is stored once in SQLite; per-user, per-task, per-list and
+per-day totals are kept in memory and adjusted as entries change, so rollup
+queries do not touch the ClickUp API. Time tracking webhooks mark the
+affected (task, day) windows dirty and a periodic reconciliation pass
+re-fetches only those windows.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+from clickup_sdk import ClickUp, WebhookDispatcher, WebhookEvent
+
+from config.settings import get_settings
+from core.clickup_client import get_clickup_client
+from core.logging_config import get_logger
+from core.storage import open_database
+from core.task_mirror import get_task
+
+logger = get_logger(__name__)
+
+TIME_TRACKED_EVENT = "taskTimeTrackedUpdated"
+TIME_ESTIMATE_EVENT = "taskTimeEstimateUpdated"
+
+DIMENSIONS = ("user", "task", "list", "day")
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS time_entries (
+    id TEXT PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    list_id TEXT NOT NULL DEFAULT '',
+    start INTEGER NOT NULL,
+    duration INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_time_entries_task ON time_entries(task_id, start);
+CREATE TABLE IF NOT EXISTS time_estimates (
+    task_id TEXT PRIMARY KEY,
+    list_id TEXT NOT NULL DEFAULT '',
+    estimate INTEGER NOT NULL
+);
+"""
+
+
+def _to_int(value: Any) -> int:
+    """Convert ClickUp millisecond values (often strings) to int."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def day_of(timestamp_ms: int) -> str:
+    """
+    Get the rollup day (UTC date) of a millisecond timestamp.
+
+    Args:
+        timestamp_ms: Unix timestamp in milliseconds
+
+    Returns:
+        Date as YYYY-MM-DD
+    """
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).date().isoformat()
+
+
+def _day_start(day: str) -> int:
+    date = datetime.fromisoformat(day).replace(tzinfo=timezone.utc)
+    return int(date.timestamp() * 1000)
+
+
+class TimeRollups:
+    """
+    Incremental time tracking totals.
+
+    An entry counts fully towards the day it started on.
+
+    Usage:
+        rollups = TimeRollups("data/time_rollups.db", team_id="123")
+        rollups.register(dispatcher)
+        hours = rollups.totals("user", start_day="2024-01-01")
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        client: Optional[ClickUp] = None,
+        team_id: Optional[str] = None,
+    ):
+        """
+        Initialize TimeRollups.
+
+        Args:
+            db_path: SQLite database path
+            client: ClickUp client. Default: global client
+            team_id: Team ID used by reconciliation
+        """
+        self._client = client
+        self.team_id = team_id
+        self._db = open_database(db_path)
+        self._db.executescript(SCHEMA)
+        # dimension -> key -> day -> milliseconds
+        self._rollups: Dict[str, Dict[str, Dict[str, int]]] = {
+            dimension: defaultdict(lambda: defaultdict(int)) for dimension in DIMENSIONS
+        }
+        self._estimates: Dict[str, int] = {}
+        self._task_lists: Dict[str, str] = {}
+        # task_id -> day -> user IDs to re-fetch
+        self._dirty: Dict[str, Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        self._load()
+
+    @property
+    def client(self) -> ClickUp:
+        """ClickUp client used for lookups and reconciliation."""
+        if self._client is None:
+            self._client = get_clickup_client()
+        return self._client
+
+    def _load(self) -> None:
+        rows = self._db.execute(
+            "SELECT task_id, user_id, list_id, start, duration FROM time_entries"
+        ).fetchall()
+        for row in rows:
+            self._apply(
+                row["task_id"], row["user_id"], row["list_id"], row["start"], row["duration"], 1
+            )
+            self._task_lists.setdefault(row["task_id"], row["list_id"])
+        for row in self._db.execute("SELECT task_id, list_id, estimate FROM time_estimates"):
+            self._estimates[row["task_id"]] = row["estimate"]
+            self._task_lists.setdefault(row["task_id"], row["list_id"])
+        logger.info(f"⏱️ Time rollups loaded ({len(rows)} time entries)")
+
+    def _apply(
+        self,
+        task_id: str,
+        user_id: str,
+        list_id: str,
+        start: int,
+        duration: int,
+        sign: int,
+    ) -> None:
+        """Add (sign=1) or remove (sign=-1) an entry from the in-memory totals."""
+        day = day_of(start)
+        amount = sign * duration
+        keys = {"user": user_id, "task": task_id, "list": list_id, "day": day}
+        for dimension, key in keys.items():
+            per_day = self._rollups[dimension][key]
+            per_day[day] += amount
+            if not per_day[day]:
+                del per_day[day]
+            if not per_day:
+                del self._rollups[dimension][key]
+
+    def total(
+        self,
+        dimension: str,
+        key: str,
+        start_day: Optional[str] = None,
+        end_day: Optional[str] = None,
+    ) -> int:
+        """
+        Get tracked time of one user, task, list or day.
+
+        Args:
+            dimension: "user", "task", "list" or "day"
+            key: User ID, task ID, list ID or YYYY-MM-DD
+            start_day: First day to include (YYYY-MM-DD)
+            end_day: Last day to include (YYYY-MM-DD)
+
+        Returns:
+            Tracked time in milliseconds
+        """
+        per_day = self._rollups[dimension].get(str(key), {})
+        return sum(
+            duration
+            for day, duration in per_day.items()
+            if (start_day is None or day >= start_day) and (end_day is None or day <= end_day)
+        )
+
+    def totals(
+        self,
+        dimension: str,
+        start_day: Optional[str] = None,
+        end_day: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Get tracked time of every user, task, list or day.
+
+        Args:
+            dimension: "user", "task", "list" or "day"
+            start_day: First day to include (YYYY-MM-DD)
+            end_day: Last day to include (YYYY-MM-DD)
+
+        Returns:
+            Mapping of key to tracked time in milliseconds
+        """
+        result = {
+            key: self.total(dimension, key, start_day, end_day)
+            for key in self._rollups[dimension]
+        }
+        return {key: duration for key, duration in result.items() if duration}
+
+    def estimate(self, task_id: str) -> int:
+        """
+        Get time estimate of a task.
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            Estimate in milliseconds (0 if none)
+        """
+        return self._estimates.get(str(task_id), 0)
+
+    def list_estimates(self) -> Dict[str, int]:
+        """
+        Get summed time estimates per list.
+
+        Returns:
+            Mapping of list ID to estimate in milliseconds
+        """
+        result: Dict[str, int] = defaultdict(int)
+        for task_id, estimate in self._estimates.items():
+            result[self._task_lists.get(task_id, "")] += estimate
+        return dict(result)
+
+    def upsert_entry(
+        self,
+        entry_id: str,
+        task_id: str,
+        user_id: str,
+        list_id: str,
+        start: int,
+        duration: int,
+    ) -> None:
+        """
+        Insert or replace a time entry and adjust the totals.
+
+        Args:
+            entry_id: Time entry (interval) ID
+            task_id: Task ID
+            user_id: User who tracked the time
+            list_id: List of the task
+            start: Start timestamp in milliseconds
+            duration: Duration in milliseconds
+        """
+        self.delete_entry(entry_id)
+        with self._db:
+            self._db.execute(
+                "INSERT INTO time_entries (id, task_id, user_id, list_id, start, duration) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (entry_id, task_id, user_id, list_id, start, duration),
+            )
+        self._apply(task_id, user_id, list_id, start, duration, 1)
+
+    def delete_entry(self, entry_id: str) -> None:
+        """
+        Delete a time entry and adjust the totals.
+
+        Args:
+            entry_id: Time entry (interval) ID
+        """
+        row = self._db.execute(
+            "SELECT task_id, user_id, list_id, start, duration FROM time_entries WHERE id = ?",
+            (entry_id,),
+        ).fetchone()
+        if row is None:
+            return
+        with self._db:
+            self._db.execute("DELETE FROM time_entries WHERE id = ?", (entry_id,))
+        self._apply(
+            row["task_id"], row["user_id"], row["list_id"], row["start"], row["duration"], -1
+        )
+
+    def set_estimate(self, task_id: str, list_id: str, estimate: int) -> None:
+        """
+        Store the time estimate of a task.
+
+        Args:
+            task_id: Task ID
+            list_id: List of the task
+            estimate: Estimate in milliseconds (0 removes it)
+        """
+        with self._db:
+            if estimate:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO time_estimates (task_id, list_id, estimate) "
+                    "VALUES (?, ?, ?)",
+                    (task_id, list_id, estimate),
+                )
+                self._estimates[task_id] = estimate
+            else:
+                self._db.execute("DELETE FROM time_estimates WHERE task_id = ?", (task_id,))
+                self._estimates.pop(task_id, None)
+
+    async def _list_id(self, task_id: str) -> str:
+        """Resolve (and remember) the list of a task."""
+        if task_id not in self._task_lists:
+            try:
+                task = await get_task(task_id)
+                self._task_lists[task_id] = str(task.get("list", {}).get("id", ""))
+            except Exception as e:
+                logger.warning(f"⚠️ Could not resolve list of task {task_id}: {e}")
+                return ""
+        return self._task_lists[task_id]
+
+    def mark_dirty(self, task_id: str, day: str, user_id: str) -> None:
+        """
+        Schedule a (task, day) window for reconciliation.
+
+        Args:
+            task_id: Task ID
+            day: Day (YYYY-MM-DD)
+            user_id: User whose entries are re-fetched
+        """
+        self._dirty[task_id][day].add(str(user_id))
+
+    async def handle_time_tracked(self, event: WebhookEvent) -> None:
+        """
+        Apply a taskTimeTrackedUpdated event.
+
+        Args:
+            event: Webhook event
+        """
+        if not event.task_id:
+            return
+        list_id = await self._list_id(event.task_id)
+        for item in event.history_items or []:
+            user_id = str(item.get("user", {}).get("id", ""))
+            before = item.get("before") if isinstance(item.get("before"), dict) else None
+            after = item.get("after") if isinstance(item.get("after"), dict) else None
+
+            for interval in (before, after):
+                if interval and interval.get("start"):
+                    self.mark_dirty(event.task_id, day_of(_to_int(interval["start"])), user_id)
+
+            if after and after.get("id") and after.get("end"):
+                self.upsert_entry(
+                    str(after["id"]),
+                    event.task_id,
+                    user_id,
+                    list_id,
+                    _to_int(after.get("start")),
+                    _to_int(after.get("time")),
+                )
+            elif before and before.get("id") and after is None:
+                self.delete_entry(str(before["id"]))
+
+        logger.debug(f"⏱️ Time tracking updated for task {event.task_id}")
+
+    async def handle_time_estimate(self, event: WebhookEvent) -> None:
+        """
+        Apply a taskTimeEstimateUpdated event.
+
+        Args:
+            event: Webhook event
+        """
+        if not event.task_id:
+            return
+        for item in event.history_items or []:
+            after = item.get("after")
+            if isinstance(after, dict):
+                after = after.get("time_estimate")
+            self.set_estimate(event.task_id, await self._list_id(event.task_id), _to_int(after))
+
+    async def reconcile(self) -> int:
+        """
+        Re-fetch the time entries of dirty (task, day) windows from ClickUp.
+
+        Returns:
+            Number of reconciled tasks
+        """
+        dirty, self._dirty = self._dirty, defaultdict(lambda: defaultdict(set))
+        if not dirty:
+            return 0
+
+        team_id = self.team_id or get_settings().TEAM_ID
+        results = await asyncio.gather(
+            *(
+                self._reconcile_task(team_id, task_id, days)
+                for task_id, days in dirty.items()
+            ),
+            return_exceptions=True,
+        )
+        for (task_id, days), result in zip(dirty.items(), results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Time rollup reconciliation failed for task {task_id}: {result}")
+                # Retry on the next pass
+                for day, users in days.items():
+                    self._dirty[task_id][day] |= users
+
+        logger.info(f"🔁 Reconciled time entries of {len(dirty)} task(s)")
+        return len(dirty)
+
+    async def _reconcile_task(
+        self, team_id: str, task_id: str, days: Dict[str, Set[str]]
+    ) -> None:
+        """Replace the stored entries of a task's dirty days with fresh data."""
+        users = sorted({user for day_users in days.values() for user in day_users if user})
+        for day in days:
+            start = _day_start(day)
+            end = start + DAY_MS
+            # Time entries default to the token owner; ask for every affected user
+            response = await self.client.time_entries.get_time_entries(
+                team_id,
+                start_date=start,
+                end_date=end - 1,
+                assignee=",".join(users) if users else None,
+                task_id=task_id,
+                include_location_names=True,
+            )
+            fresh = [
+                entry
+                for entry in response.get("data", [])
+                if start <= _to_int(entry.get("start")) < end and _to_int(entry.get("duration")) > 0
+            ]
+
+            # Only entries of the fetched users can be stale. Without a user the
+            # response holds just the token owner's entries, so nothing is
+            # deleted rather than every other user's entries of the day.
+            stale: Set[str] = set()
+            if users:
+                stale = {
+                    row["id"]
+                    for row in self._db.execute(
+                        "SELECT id FROM time_entries WHERE task_id = ? AND start >= ? "
+                        f"AND start < ? AND user_id IN ({','.join('?' * len(users))})",
+                        [task_id, start, end, *users],
+                    )
+                }
+
+            for entry in fresh:
+                entry_id = str(entry["id"])
+                stale.discard(entry_id)
+                list_id = str(
+                    (entry.get("task_location") or {}).get("list_id")
+                    or await self._list_id(task_id)
+                )
+                self.upsert_entry(
+                    entry_id,
+                    task_id,
+                    str(entry.get("user", {}).get("id", "")),
+                    list_id,
+                    _to_int(entry.get("start")),
+                    _to_int(entry.get("duration")),
+                )
+            for entry_id in stale:
+                self.delete_entry(entry_id)
+
+    async def run(self, interval: int) -> None:
+        """
+        Run reconciliation passes forever.
+
+        Args:
+            interval: Seconds between passes
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"❌ Time rollup reconciliation failed: {e}", exc_info=True)
+
+    def register(self, dispatcher: WebhookDispatcher) -> None:
+        """
+        Register webhook handlers that keep the rollups current.
+
+        Args:
+            dispatcher: Webhook dispatcher
+        """
+        dispatcher.register_handler(TIME_TRACKED_EVENT, self.handle_time_tracked)
+        dispatcher.register_handler(TIME_ESTIMATE_EVENT, self.handle_time_estimate)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+
+# Global rollups instance
+_time_rollups: Optional[TimeRollups] = None
+
+
+def get_time_rollups() -> Optional[TimeRollups]:
+    """
+    Get or create global TimeRollups instance.
+
+    Returns:
+        TimeRollups instance, or None if time rollups are disabled
+    """
+    global _time_rollups
+    settings = get_settings()
+    if not settings.TIME_ROLLUPS_ENABLED:
+        return None
+    if _time_rollups is None:
+        _time_rollups = TimeRollups(settings.TIME_ROLLUPS_DB, team_id=settings.TEAM_ID)
+    return _time_rollups
@@ -1,164 +1,313 @@
 """
 Webhook Manager - Handles ClickUp webhook creation and management.
+
+All calls go through the shared async ClickUp client (connection pool, rate
+limiter and retries), so webhook lifecycle work never blocks the event loop.
 """
-import logging
-import requests
-from typing import List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from clickup_sdk import ClickUp
+from clickup_sdk.webhook import WebhookDispatcher, WebhookScope
+from clickup_sdk.webhook.scopes import TEAM_SCOPE
 
 from config.settings import get_settings
+from core.clickup_client import get_clickup_client
 from core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Events of the team-wide webhook when no dispatcher plan is given
+DEFAULT_EVENTS = [
+    "taskCreated",
+    "taskUpdated",
+    "taskStatusUpdated",
+    "taskAssigneeUpdated",
+    "taskDeleted",
+]
+
 
 class WebhookManager:
     """Manages ClickUp webhook lifecycle."""
-    
-    def __init__(self, api_token: Optional[str] = None, team_id: Optional[str] = None):
+
+    def __init__(self, client: Optional[ClickUp] = None, team_id: Optional[str] = None):
         """
         Initialize WebhookManager.
-        
+
         Args:
-            api_token: ClickUp API token. If None, uses settings.
+            client: ClickUp client. If None, uses the global client.
             team_id: ClickUp team ID. If None, uses settings.
         """
-        settings = get_settings()
-        self.api_token = api_token or settings.CLICKUP_API_TOKEN
-        self.team_id = team_id or settings.TEAM_ID
-        self.base_url = "https://api.clickup.com/api/v2"
-        self.headers = {
-            "Authorization": self.api_token,
-            "Content-Type": "application/json",
-        }
-    
-    def delete_webhook(self, webhook_id: str) -> dict:
+        self._client = client
+        self.team_id = team_id or get_settings().TEAM_ID
+
+    @property
+    def client(self) -> ClickUp:
+        if self._client is None:
+            self._client = get_clickup_client()
+        return self._client
+
+    async def delete_webhook(self, webhook_id: str) -> dict:
         """
         Delete a webhook by ID.
-        
+
         Args:
             webhook_id: Webhook ID to delete
-            
+
         Returns:
             API response dictionary
         """
         try:
-            resp = requests.delete(
-                f"{self.base_url}/webhook/{webhook_id}",
-                headers=self.headers,
-                timeout=10
-            )
-            resp.raise_for_status()
-            result = resp.json()
+            result = await self.client.webhooks.delete_webhook(webhook_id)
             logger.info(f"✅ Webhook deleted: {webhook_id}")
             return result
-        except requests.exceptions.RequestException as e:
+        except Exception as e:
             logger.error(f"❌ Error deleting webhook {webhook_id}: {e}")
             raise
-    
-    def get_webhooks(self) -> dict:
+
+    async def get_webhooks(self) -> dict:
         """
         Get all webhooks for the team.
-        
+
         Returns:
             API response dictionary with webhooks list
         """
         try:
-            resp = requests.get(
-                f"{self.base_url}/team/{self.team_id}/webhook",
-                headers=self.headers,
-                timeout=10
-            )
-            resp.raise_for_status()
-            result = resp.json()
+            result = await self.client.webhooks.get_webhooks(int(self.team_id))
             logger.debug(f"Retrieved {len(result.get('webhooks', []))} webhooks")
             return result
-        except requests.exceptions.RequestException as e:
+        except Exception as e:
             logger.error(f"❌ Error getting webhooks: {e}")
             raise
-    
-    def create_webhook(
-        self, 
-        endpoint: Optional[str] = None, 
-        events: Optional[List[str]] = None, 
-        status: str = "active"
+
+    async def create_webhook(
+        self,
+        endpoint: Optional[str] = None,
+        events: Optional[List[str]] = None,
+        scope: Optional[WebhookScope] = None
     ) -> dict:
         """
         Create a new webhook.
-        
+
         Args:
             endpoint: Webhook endpoint URL. If None, uses settings.
             events: List of events to subscribe to. If None, uses default events.
-            status: Webhook status (active/inactive)
-            
+            scope: Space, folder or list the webhook is limited to (team-wide if None)
+
         Returns:
             API response dictionary
         """
-        settings = get_settings()
-        
         if endpoint is None:
-            endpoint = settings.WEBHOOK_ENDPOINT
-        
+            endpoint = get_settings().WEBHOOK_ENDPOINT
         if events is None:
-            events = [
-                "taskCreated",
-                "taskUpdated",
-                "taskStatusUpdated",
-                "taskAssigneeUpdated",
-                "taskDeleted"
-            ]
-        
-        webhook_payload = {
-            "endpoint": endpoint,
-            "events": events,
-            "status": status,
-        }
-        
+            events = list(DEFAULT_EVENTS)
+
         try:
-            resp = requests.post(
-                f"{self.base_url}/team/{self.team_id}/webhook",
-                headers=self.headers,
-                json=webhook_payload,
-                timeout=10
+            result = await self.client.webhooks.create_webhook(
+                int(self.team_id),
+                endpoint,
+                None,
+                events,
+                **(scope.to_params() if scope is not None else {}),
             )
-            resp.raise_for_status()
-            result = resp.json()
-            logger.info(f"✅ Webhook created: {result.get('id', 'unknown')}")
-            logger.debug(f"Webhook endpoint: {endpoint}, Events: {events}")
+            logger.info(f"✅ Webhook created: {_webhook_id(result) or 'unknown'}")
+            logger.debug(f"Webhook endpoint: {endpoint}, Events: {events}, Scope: {scope or 'team'}")
             return result
-        except requests.exceptions.RequestException as e:
+        except Exception as e:
             logger.error(f"❌ Error creating webhook: {e}")
             raise
-    
-    def initialize_webhook(self) -> None:
+
+    async def update_webhook(
+        self,
+        webhook_id: str,
+        endpoint: Optional[str] = None,
+        events: Optional[List[str]] = None,
+        status: Optional[str] = "active"
+    ) -> dict:
         """
-        Initialize webhook by deleting existing webhooks and creating a new one.
-        This ensures only one active webhook exists.
+        Update a webhook in place (endpoint, events and status).
+
+        Args:
+            webhook_id: Webhook ID to update
+            endpoint: Webhook endpoint URL (unchanged if None)
+            events: List of events to subscribe to (unchanged if None)
+            status: Webhook status (active/inactive, unchanged if None)
+
+        Returns:
+            API response dictionary
         """
         try:
-            logger.info("🔄 Initializing webhook...")
-            
-            # Get existing webhooks
-            webhooks_data = self.get_webhooks()
-            existing_webhooks = webhooks_data.get("webhooks", [])
-            
-            # Delete all existing webhooks
-            if existing_webhooks:
-                logger.info(f"🗑️ Deleting {len(existing_webhooks)} existing webhook(s)...")
-                for webhook in existing_webhooks:
-                    try:
-                        self.delete_webhook(webhook["id"])
-                    except Exception as e:
-                        logger.warning(f"⚠️ Could not delete webhook {webhook['id']}: {e}")
-            
-            # Create new webhook
-            logger.info("➕ Creating new webhook...")
-            self.create_webhook()
-            
-            # Verify webhook creation
-            final_webhooks = self.get_webhooks()
-            logger.info(f"✅ Webhook initialization complete. Active webhooks: {len(final_webhooks.get('webhooks', []))}")
-            
+            result = await self.client.webhooks.update_webhook(
+                webhook_id, endpoint=endpoint, events=events, status=status
+            )
+            logger.info(f"✅ Webhook updated: {webhook_id}")
+            return result
         except Exception as e:
-            logger.error(f"❌ Error initializing webhook: {e}", exc_info=True)
+            logger.error(f"❌ Error updating webhook {webhook_id}: {e}")
             raise
 
+    def desired_webhooks(
+        self, dispatcher: Optional[WebhookDispatcher] = None
+    ) -> Dict[WebhookScope, List[str]]:
+        """
+        Get the webhooks the app needs.
+
+        Args:
+            dispatcher: Dispatcher whose handlers define the subscriptions.
+                If None, a single team-wide webhook with the default events.
+
+        Returns:
+            Scope -> events to subscribe to
+        """
+        if dispatcher is None:
+            return {TEAM_SCOPE: list(DEFAULT_EVENTS)}
+        return dispatcher.plan_webhooks()
+
+    async def reconcile_webhooks(
+        self,
+        dispatcher: Optional[WebhookDispatcher] = None,
+        endpoint: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Bring the team webhooks in line with the desired state.
+
+        Existing webhooks are matched to the desired ones by scope. Matches
+        with the right endpoint and events that are active are kept as they
+        are, other matches are updated in place, missing webhooks are created
+        and unmatched ones deleted. The API calls run concurrently, so this
+        can run alongside server startup.
+
+        Args:
+            dispatcher: Dispatcher whose handlers define the subscriptions.
+                Kept webhooks are registered with it for scope routing.
+            endpoint: Webhook endpoint URL. If None, uses settings.
+
+        Returns:
+            Number of kept, updated, created and deleted webhooks
+        """
+        endpoint = endpoint or get_settings().WEBHOOK_ENDPOINT
+        desired = self.desired_webhooks(dispatcher)
+        webhooks_data = await self.get_webhooks()
+        existing = webhooks_data.get("webhooks", [])
+
+        # Pair each desired scope with an existing webhook, preferring our endpoint
+        unmatched = sorted(existing, key=lambda webhook: webhook.get("endpoint") != endpoint)
+        matches: Dict[WebhookScope, Optional[dict]] = {}
+        for scope in desired:
+            matches[scope] = next(
+                (webhook for webhook in unmatched if WebhookScope.from_webhook(webhook) == scope),
+                None,
+            )
+            if matches[scope] is not None:
+                unmatched.remove(matches[scope])
+
+        summary = {"kept": 0, "updated": 0, "created": 0, "deleted": 0}
+
+        async def apply(scope: WebhookScope, events: List[str], webhook: Optional[dict]) -> None:
+            if webhook is None:
+                result = await self.create_webhook(endpoint=endpoint, events=events, scope=scope)
+                webhook_id = _webhook_id(result)
+                action = "created"
+            else:
+                webhook_id = webhook["id"]
+                if _webhook_up_to_date(webhook, endpoint, events):
+                    action = "kept"
+                else:
+                    await self.update_webhook(webhook_id, endpoint, events)
+                    action = "updated"
+            summary[action] += 1
+            if dispatcher is not None and webhook_id:
+                dispatcher.set_webhook_scope(webhook_id, scope)
+            logger.info(f"  {scope} ({action}): {', '.join(events)}")
+
+        async def delete(webhook: dict) -> None:
+            await self.delete_webhook(webhook["id"])
+            summary["deleted"] += 1
+
+        logger.info("🔄 Reconciling webhooks...")
+        results = await asyncio.gather(
+            *(apply(scope, events, matches[scope]) for scope, events in desired.items()),
+            *(delete(webhook) for webhook in unmatched),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ Webhook reconciliation step failed: {result}")
+
+        logger.info(
+            f"✅ Webhooks reconciled: {summary['kept']} kept, {summary['updated']} updated, "
+            f"{summary['created']} created, {summary['deleted']} deleted"
+        )
+        return summary
+
+    async def check_health(self, reactivate: bool = True) -> List[Dict[str, Any]]:
+        """
+        Check webhook health and reactivate webhooks ClickUp stopped.
+
+        ClickUp counts failed deliveries per webhook (health.fail_count) and
+        suspends webhooks that keep failing.
+
+        Args:
+            reactivate: Set suspended or failing webhooks back to active
+
+        Returns:
+            Unhealthy webhooks (status other than active, or failed deliveries)
+        """
+        webhooks_data = await self.get_webhooks()
+        unhealthy = []
+        for webhook in webhooks_data.get("webhooks", []):
+            health = webhook.get("health") or {}
+            status = health.get("status", "active")
+            fail_count = health.get("fail_count", 0)
+            if status == "active" and not fail_count:
+                continue
+            unhealthy.append(webhook)
+            logger.warning(
+                f"⚠️ Webhook {webhook['id']} ({WebhookScope.from_webhook(webhook)}) "
+                f"is {status} with {fail_count} failed deliveries"
+            )
+            if reactivate and status != "active":
+                try:
+                    await self.update_webhook(webhook["id"], status="active")
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not reactivate webhook {webhook['id']}: {e}")
+        return unhealthy
+
+    async def run_health_checks(self, interval: float) -> None:
+        """
+        Check webhook health every `interval` seconds, forever.
+
+        Args:
+            interval: Seconds between checks
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.error(f"❌ Webhook health check failed: {e}")
+
+
+def _webhook_id(result: Dict[str, Any]) -> Optional[str]:
+    """Get the webhook ID from a create webhook response."""
+    return result.get("id") or (result.get("webhook") or {}).get("id")
+
+
+def _webhook_up_to_date(webhook: dict, endpoint: str, events: List[str]) -> bool:
+    """
+    Check whether an existing webhook already matches the desired one.
+
+    Args:
+        webhook: Webhook returned by the ClickUp API
+        endpoint: Desired endpoint URL
+        events: Desired events
+
+    Returns:
+        True if endpoint, events and status need no update
+    """
+    status = (webhook.get("health") or {}).get("status", webhook.get("status", "active"))
+    return (
+        webhook.get("endpoint") == endpoint
+        and set(webhook.get("events") or []) == set(events)
+        and status == "active"
+    )